@@ -0,0 +1,174 @@
+"""Alineación automática de las líneas de texto con los segmentos no silenciosos."""
+import numpy as np
+
+from profiling import traced
+
+# Duración supuesta cuando todavía no se conoce la del audio
+DEFAULT_DURATION = 210
+
+# Pesos del coste de alineación (ver align_lines)
+MERGE_GAP_WEIGHT = 0.1
+SPLIT_PENALTY = 0.3
+SKIP_PENALTY = 3.0
+# Suavizado (segundos) del cociente entre duración real y esperada
+_DURATION_EPS = 0.1
+# Máximo de segmentos por línea y de líneas por segmento
+MAX_GROUP = 64
+# Semiancho (en segmentos) de la banda de búsqueda alrededor del reparto proporcional
+BAND_WIDTH = 128
+# Marca de celda no alcanzable en la matriz de decisiones
+_UNREACHABLE = -128
+
+
+def _duration_cost(actual, expected):
+    return np.square(np.log((actual + _DURATION_EPS) / (expected + _DURATION_EPS)))
+
+
+def align_lines(segments, lines, total_duration=DEFAULT_DURATION):
+    """Asigna a cada línea un intervalo (inicio, fin) a partir de los segmentos.
+
+    Programación dinámica sobre las fronteras de los segmentos: cada línea
+    ocupa uno o varios segmentos consecutivos (fusión), varias líneas pueden
+    repartirse un mismo segmento (división) y un segmento puede quedar sin
+    texto (por ejemplo, una introducción instrumental). El coste compara la
+    duración de cada bloque con la esperada según la longitud del texto, y
+    penaliza los silencios internos de las fusiones, las divisiones y los
+    segmentos omitidos. Cada fila de la matriz se calcula con operaciones
+    vectorizadas sobre todos los tamaños de grupo y todos los segmentos de
+    una banda alrededor del reparto proporcional a la longitud del texto.
+
+    Devuelve dos arrays, inicios y fines, con un valor por línea.
+    """
+    count = len(lines)
+    seg = np.asarray(segments, dtype=np.float64).reshape(-1, 2)
+    n_seg = len(seg)
+    if count == 0:
+        return np.empty(0), np.empty(0)
+    if n_seg == 0:
+        interval = total_duration / (count + 1)
+        starts = interval * np.arange(1, count + 1)
+        return starts, starts + interval
+
+    seg_start, seg_end = seg[:, 0], seg[:, 1]
+    seg_dur = seg_end - seg_start
+    speech = np.concatenate(([0.0], np.cumsum(seg_dur)))
+    gaps = np.concatenate(([0.0], np.maximum(0.0, seg_start[1:] - seg_end[:-1])))
+    gaps_cum = np.cumsum(gaps)
+    gap_ref = float(np.median(gaps[1:])) if n_seg > 1 else 1.0
+    gap_ref = max(gap_ref, _DURATION_EPS)
+
+    chars = np.array([max(1, len(line)) for line in lines], dtype=np.float64)
+    chars_cum = np.concatenate(([0.0], np.cumsum(chars)))
+    rate = speech[-1] / chars_cum[-1]  # segundos por carácter
+
+    max_merge = int(min(MAX_GROUP, max(4, 2 * np.ceil(n_seg / count)), n_seg))
+    max_split = int(min(MAX_GROUP, max(4, 2 * np.ceil(count / n_seg)), count))
+
+    # Banda alrededor de la diagonal esperada (reparto proporcional al texto):
+    # para la línea i solo se consideran los segmentos k dentro de la banda
+    position = chars_cum / chars_cum[-1] * speech[-1]
+    expected_k = np.searchsorted(speech, position).astype(np.int64)
+    width = BAND_WIDTH + max_merge + max_split
+    band_lo = np.clip(expected_k - width, 0, n_seg)
+    band_hi = np.clip(expected_k + width, 0, n_seg)
+    band_lo[0], band_hi[-1] = 0, n_seg
+
+    # Anillo con los costes de las últimas max_split filas; de cada fila se
+    # recuerda su banda para volver a llenar de infinitos solo esa parte
+    ring = max_split + 1
+    costs = np.full((ring, n_seg + 1), np.inf)
+    costs[0] = SKIP_PENALTY * np.arange(n_seg + 1)
+    ring_band = [(0, 0)] * ring
+    ring_band[0] = (0, n_seg + 1)
+    # Decisiones solo dentro de la banda: la columna j de la fila i es el segmento band_lo[i] + j
+    choice = np.full((count + 1, int((band_hi - band_lo).max()) + 1), _UNREACHABLE, dtype=np.int8)
+    merge_sizes = np.arange(1, max_merge + 1)[:, None]
+    split_sizes = np.arange(2, max_split + 1)
+
+    for i in range(1, count + 1):
+        lo, hi = int(band_lo[i]), int(band_hi[i]) + 1
+        ks = np.arange(lo, hi)
+        row = np.full(hi - lo, np.inf)
+        row_choice = np.full(hi - lo, _UNREACHABLE, dtype=np.int8)
+        # Fusión: la línea i ocupa los segmentos (k - m, k]
+        first = ks[None, :] - merge_sizes
+        valid = first >= 0
+        first = np.maximum(first, 0)
+        last = np.maximum(ks - 1, 0)[None, :]
+        cand = (costs[(i - 1) % ring][first]
+                + _duration_cost(speech[ks][None, :] - speech[first], chars[i - 1] * rate)
+                + MERGE_GAP_WEIGHT * (gaps_cum[last] - gaps_cum[first]) / gap_ref)
+        cand[~valid] = np.inf
+        best = np.argmin(cand, axis=0)
+        row = cand[best, np.arange(len(ks))]
+        row_choice = (best + 1).astype(np.int8)
+        # División: las líneas (i - n, i] comparten el segmento k
+        sizes = split_sizes[split_sizes <= i]
+        if len(sizes) and hi > max(lo, 1):
+            kk = np.arange(max(lo, 1), hi)
+            expected = (chars_cum[i] - chars_cum[i - sizes]) * rate
+            cand = (costs[((i - sizes) % ring)[:, None], (kk - 1)[None, :]]
+                    + _duration_cost(seg_dur[kk - 1][None, :], expected[:, None])
+                    + SPLIT_PENALTY * (sizes - 1)[:, None])
+            best = np.argmin(cand, axis=0)
+            value = cand[best, np.arange(len(kk))]
+            offset = kk[0] - lo
+            better = value < row[offset:]
+            row[offset:][better] = value[better]
+            row_choice[offset:][better] = -sizes[best[better]]
+        # Omisión: row[k] = min(row[k], row[k - 1] + SKIP_PENALTY), acumulado
+        # (se compara con el mejor coste de k - 1 más la penalización para que
+        # el redondeo de la acumulación no marque omisiones que no lo son)
+        best_before = np.minimum.accumulate(row - SKIP_PENALTY * ks) + SKIP_PENALTY * ks
+        via_skip = np.concatenate(([np.inf], best_before[:-1] + SKIP_PENALTY))
+        use_skip = via_skip < row
+        row[use_skip] = via_skip[use_skip]
+        row_choice[use_skip] = 0
+        row_choice[~np.isfinite(row)] = _UNREACHABLE
+        full = costs[i % ring]
+        a, b = ring_band[i % ring]
+        full[a:b] = np.inf
+        full[lo:hi] = row
+        ring_band[i % ring] = (lo, hi)
+        choice[i, :hi - lo] = row_choice
+
+    if not np.isfinite(costs[count % ring][n_seg]):
+        # Proporción demasiado desigual entre líneas y segmentos para MAX_GROUP
+        return _proportional(seg_start, seg_dur, speech, chars_cum)
+
+    starts = np.empty(count)
+    ends = np.empty(count)
+    i, k = count, n_seg
+    while i > 0:
+        step = int(choice[i, k - band_lo[i]])
+        if step == 0:
+            k -= 1
+        elif step > 0:
+            starts[i - 1] = seg_start[k - step]
+            ends[i - 1] = seg_end[k - 1]
+            i -= 1
+            k -= step
+        else:
+            n = -step
+            bounds = seg_start[k - 1] + seg_dur[k - 1] * (
+                (chars_cum[i - n:i + 1] - chars_cum[i - n]) / (chars_cum[i] - chars_cum[i - n]))
+            starts[i - n:i] = bounds[:-1]
+            ends[i - n:i] = bounds[1:]
+            i -= n
+            k -= 1
+    return starts, ends
+
+
+def _proportional(seg_start, seg_dur, speech, chars_cum):
+    """Reparte las líneas sobre el tiempo con voz en proporción a su longitud."""
+    position = chars_cum / chars_cum[-1] * speech[-1]
+    k = np.clip(np.searchsorted(speech, position, side="right") - 1, 0, len(seg_start) - 1)
+    times = seg_start[k] + np.minimum(position - speech[k], seg_dur[k])
+    return times[:-1], times[1:]
+
+
+@traced("align")
+def suggest_times(segments, lines, total_duration=DEFAULT_DURATION):
+    """Devuelve el inicio sugerido de cada línea según align_lines."""
+    starts, _ = align_lines(segments, lines, total_duration)
+    return starts.tolist()
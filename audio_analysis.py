@@ -0,0 +1,414 @@
+"""Análisis de audio independiente de la interfaz: decodificación, caché y silencios.
+
+La decodificación usa soundfile y el remuestreo soxr; pydub (con ffmpeg)
+solo entra para formatos que libsndfile no lee. Se importan dentro de las
+funciones que los usan para que la ventana aparezca antes, y
+preload_in_background() carga soundfile y soxr en un hilo una vez mostrada.
+Los tramos de energía reproducen librosa.effects.split sin importar librosa.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from profiling import profiler, traced
+
+# Frecuencia de muestreo por defecto de librosa.load
+DEFAULT_SR = 22050
+# Parámetros de trama de librosa.effects.split
+FRAME_LENGTH = 2048
+HOP_LENGTH = 512
+# Muestras leídas por bloque en el análisis por streaming
+STREAM_BLOCK_SIZE = 1 << 18
+# Duración mínima (segundos) para repartir la decodificación en varios procesos
+PARALLEL_MIN_SECONDS = 20 * 60
+# Potencia mínima (equivale a amin=1e-5 en amplitud de librosa)
+_AMIN_POWER = 1e-10
+# Ataques: subida mínima de energía (dB) frente a las tramas anteriores, tramas
+# de comparación, nivel mínimo por debajo del pico (dB) y separación mínima (s)
+ONSET_RISE_DB = 6.0
+ONSET_LAG = 2
+ONSET_FLOOR_DB = 50.0
+ONSET_WAIT = 0.1
+
+
+def _preload():
+    import soundfile  # noqa: F401
+    import soxr  # noqa: F401
+
+
+def preload_in_background():
+    """Importa las bibliotecas de audio en un hilo para que el primer análisis no espere."""
+    threading.Thread(target=_preload, name="audio-preload", daemon=True).start()
+
+
+def _pydub_info(file_path):
+    """Cabecera leída con ffprobe (vía pydub) para formatos que libsndfile no admite."""
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"No existe el archivo: {file_path}")
+    from pydub.utils import mediainfo
+
+    return mediainfo(file_path)
+
+
+def audio_duration(file_path):
+    """Devuelve la duración en segundos leyendo solo la cabecera del archivo."""
+    import soundfile as sf
+
+    try:
+        return sf.info(file_path).duration
+    except RuntimeError:
+        return float(_pydub_info(file_path)["duration"])
+
+
+def audio_samplerate(file_path):
+    """Devuelve la frecuencia de muestreo original del archivo."""
+    import soundfile as sf
+
+    try:
+        return sf.info(file_path).samplerate
+    except RuntimeError:
+        return int(_pydub_info(file_path)["sample_rate"])
+
+
+def _decode_with_pydub(file_path, sr=DEFAULT_SR):
+    """Decodifica en memoria con pydub/ffmpeg; alternativa opcional a libsndfile."""
+    import soxr
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(file_path)
+    y = np.array(audio.get_array_of_samples(), dtype=np.float32)
+    y /= float(1 << (8 * audio.sample_width - 1))
+    if audio.channels > 1:
+        y = y.reshape(-1, audio.channels).mean(axis=1, dtype=np.float32)
+    if sr is not None and sr != audio.frame_rate:
+        y = soxr.resample(y, audio.frame_rate, sr, quality="HQ")
+    return y, sr or audio.frame_rate
+
+
+@traced("decode")
+def decode_audio(file_path, sr=DEFAULT_SR, progress=None):
+    """Decodifica el archivo a una señal mono float32 en memoria, sin archivos intermedios.
+
+    MP3, FLAC, OGG y WAV se leen directamente con libsndfile por bloques; el
+    resto de formatos recurre a pydub si está instalado.
+    """
+    if sr is None:
+        sr = audio_samplerate(file_path)
+    blocks = list(iter_mono_blocks(file_path, sr, progress=progress))
+    y = np.concatenate(blocks) if blocks else np.empty(0, dtype=np.float32)
+    return y, sr
+
+
+class AudioCache:
+    """Caché LRU de señales mono decodificadas, limitada por memoria.
+
+    Las entradas se indexan por ruta, fecha de modificación y frecuencia de
+    muestreo, de modo que un archivo modificado en disco se vuelve a decodificar.
+    """
+
+    def __init__(self, max_bytes=512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        # Las tareas en segundo plano comparten la caché
+        self._lock = threading.Lock()
+
+    def _key(self, file_path, sr):
+        path = os.path.abspath(file_path)
+        return (path, os.stat(path).st_mtime_ns, sr)
+
+    def get(self, file_path, sr=DEFAULT_SR, progress=None):
+        """Devuelve (y, sr) para el archivo, decodificándolo solo si no está en caché."""
+        entry = self.peek(file_path, sr)
+        if entry is not None:
+            profiler.count("audio_cache.hit")
+            return entry
+        profiler.count("audio_cache.miss")
+        entry = decode_audio(file_path, sr, progress)
+        self._store(self._key(file_path, sr), entry)
+        return entry
+
+    def _store(self, key, entry):
+        y = entry[0]
+        with self._lock:
+            # Descartar versiones anteriores del mismo archivo
+            for old_key in [k for k in self._entries if k[0] == key[0] and k[2] == key[2]]:
+                self._bytes -= self._entries.pop(old_key)[0].nbytes
+            if y.nbytes > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self._bytes += y.nbytes
+            while self._bytes > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def peek(self, file_path, sr=DEFAULT_SR):
+        """Devuelve (y, sr) si el archivo ya está en caché, o None sin decodificar."""
+        key = self._key(file_path, sr)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+# Caché compartida por la aplicación
+audio_cache = AudioCache()
+
+
+class EnergyEnvelope:
+    """Potencia media por trama de una pista, calculada una sola vez.
+
+    segments() reproduce librosa.effects.split sobre este array con cualquier
+    umbral: una comparación vectorizada y la extracción de los cambios de
+    estado, sin volver a decodificar ni a recorrer la señal.
+    """
+
+    def __init__(self, power, sr, hop_length=HOP_LENGTH, total_samples=None, frame_length=FRAME_LENGTH):
+        self.power = power  # float32, una entrada por trama
+        self.sr = sr
+        self.hop_length = hop_length
+        self.frame_length = frame_length
+        self.total_samples = len(power) * hop_length if total_samples is None else total_samples
+        self.peak = max(_AMIN_POWER, float(power.max())) if len(power) else _AMIN_POWER
+
+    @property
+    def duration(self):
+        return self.total_samples / self.sr
+
+    @traced("segments")
+    def segments(self, top_db=20, min_gap=0.0):
+        """Segmentos no silenciosos (inicio, fin) en segundos.
+
+        top_db es el umbral en dB por debajo de la trama más fuerte; los
+        silencios más cortos que min_gap segundos se funden con sus vecinos.
+        """
+        threshold = self.peak * 10.0 ** (-top_db / 10.0)
+        mask = np.maximum(self.power, _AMIN_POWER) > threshold
+        edges = np.flatnonzero(np.diff(mask, prepend=False, append=False))
+        bounds = np.minimum(edges * self.hop_length, self.total_samples) / self.sr
+        starts, ends = bounds[0::2], bounds[1::2]
+        if min_gap > 0 and len(starts) > 1:
+            keep = starts[1:] - ends[:-1] >= min_gap
+            starts = starts[np.concatenate(([True], keep))]
+            ends = ends[np.concatenate((keep, [True]))]
+        return list(zip(starts.tolist(), ends.tolist()))
+
+    @traced("onsets")
+    def onsets(self, rise_db=ONSET_RISE_DB, floor_db=ONSET_FLOOR_DB, wait=ONSET_WAIT, lag=ONSET_LAG):
+        """Tiempos de ataque (comienzos de voz o notas) en segundos, ordenados.
+
+        Un ataque es un máximo local de la subida de energía en dB frente al
+        máximo de las lag tramas anteriores que supera rise_db, en una trama
+        que no está a más de floor_db por debajo del pico, con al menos wait
+        segundos entre ataques. Todo son operaciones sobre el array de la
+        envolvente.
+        """
+        if len(self.power) <= lag:
+            return np.empty(0)
+        db = 10.0 * np.log10(np.maximum(self.power, _AMIN_POWER)).astype(np.float64)
+        previous = np.lib.stride_tricks.sliding_window_view(db, lag)[:-1].max(axis=1)
+        rise = np.zeros_like(db)
+        rise[lag:] = db[lag:] - previous
+        rise[db < 10.0 * np.log10(self.peak) - floor_db] = 0.0
+        # Máximo local dentro de ±wait: se compara con el máximo móvil centrado
+        radius = max(1, int(round(wait * self.sr / self.hop_length)))
+        padded = np.pad(rise, radius, constant_values=-np.inf)
+        local_max = np.lib.stride_tricks.sliding_window_view(padded, 2 * radius + 1).max(axis=1)
+        peaks = np.flatnonzero((rise >= rise_db) & (rise == local_max))
+        if len(peaks) > 1:
+            # En mesetas iguales solo cuenta la primera trama
+            peaks = peaks[np.concatenate(([True], np.diff(peaks) > radius))]
+        # La trama centrada que más sube ya tiene el ataque cerca de su borde
+        # derecho: se corrige media trama menos medio salto
+        offset = (self.frame_length - self.hop_length) / 2
+        return (peaks * self.hop_length + offset) / self.sr
+
+
+def nearest_onset(onsets, time, window):
+    """Ataque más cercano a time dentro de ±window segundos, o None.
+
+    onsets es el array ordenado de EnergyEnvelope.onsets; la búsqueda es
+    binaria, así que cuesta microsegundos aunque haya miles de ataques.
+    """
+    i = int(np.searchsorted(onsets, time))
+    best = None
+    for j in (i - 1, i):
+        if 0 <= j < len(onsets) and abs(onsets[j] - time) <= window:
+            if best is None or abs(onsets[j] - time) < abs(best - time):
+                best = float(onsets[j])
+    return best
+
+
+class EnvelopeCache:
+    """Caché LRU de envolventes de energía; cada una ocupa unos pocos KB por minuto."""
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, file_path, sr, frame_length, hop_length):
+        path = os.path.abspath(file_path)
+        return (path, os.stat(path).st_mtime_ns, sr, frame_length, hop_length)
+
+    def get(self, key):
+        with self._lock:
+            envelope = self._entries.get(key)
+            if envelope is not None:
+                self._entries.move_to_end(key)
+            return envelope
+
+    def put(self, key, envelope):
+        with self._lock:
+            self._entries[key] = envelope
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Envolventes compartidas por la aplicación
+envelope_cache = EnvelopeCache()
+
+
+@traced("envelope")
+def energy_envelope(file_path, sr=DEFAULT_SR, frame_length=FRAME_LENGTH,
+                    hop_length=HOP_LENGTH, cache=audio_cache, progress=None, workers=1, tap=None):
+    """Devuelve la EnergyEnvelope del archivo, calculándola solo la primera vez.
+
+    Si la señal cabe en la caché de audio se decodifica entera (la forma de
+    onda la reutiliza); si no, se lee por bloques con memoria acotada, que es
+    la detección por streaming de las grabaciones largas. tap, si se indica,
+    recibe cada uno de esos bloques (p. ej. PeakBuilder.add) para no volver a
+    decodificar el archivo. Con workers > 1, más de PARALLEL_MIN_SECONDS y la
+    señal fuera de la caché, la decodificación se reparte por tramos entre
+    procesos (ver parallel_analysis) y la señal no se guarda en la caché.
+    progress, si se indica, recibe la fracción completada.
+    """
+    if sr is None:
+        sr = audio_samplerate(file_path)
+    key = envelope_cache.key(file_path, sr, frame_length, hop_length)
+    envelope = envelope_cache.get(key)
+    if envelope is not None:
+        profiler.count("envelope_cache.hit")
+        return envelope
+    profiler.count("envelope_cache.miss")
+    duration = audio_duration(file_path)
+    entry = cache.peek(file_path, sr)
+    parallel = workers > 1 and entry is None and duration >= PARALLEL_MIN_SECONDS
+    if entry is None and not parallel and duration * sr * 4 <= cache.max_bytes:
+        entry = cache.get(file_path, sr, progress=progress)
+    if entry is not None:
+        blocks = [entry[0]]
+    else:
+        if parallel:
+            from parallel_analysis import iter_parallel_blocks
+
+            blocks = iter_parallel_blocks(file_path, sr, workers, progress=progress)
+        else:
+            blocks = iter_mono_blocks(file_path, sr, progress=progress)
+        if tap is not None:
+            blocks = _tee_blocks(blocks, tap)
+    with profiler.span("frame_power", workers=workers if parallel else 1):
+        frames = _iter_frame_power(blocks, frame_length, hop_length)
+        chunks = []
+        while True:
+            try:
+                chunks.append(next(frames))
+            except StopIteration as stop:
+                total = stop.value
+                break
+        power = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.float32)
+    envelope = EnergyEnvelope(power.astype(np.float32, copy=False), sr, hop_length, total, frame_length)
+    envelope_cache.put(key, envelope)
+    return envelope
+
+
+def analyze_silences(file_path, top_db=20, cache=audio_cache, progress=None, min_gap=0.0,
+                     frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH, workers=1):
+    """Devuelve los segmentos no silenciosos como pares (inicio, fin) en segundos.
+
+    La envolvente de energía se calcula una vez por archivo (ver
+    energy_envelope); cambiar top_db o min_gap después solo vuelve a umbralizarla.
+    """
+    envelope = energy_envelope(file_path, frame_length=frame_length, hop_length=hop_length,
+                               cache=cache, progress=progress, workers=workers)
+    return envelope.segments(top_db, min_gap)
+
+
+def _frame_power(x, frame_length, hop_length):
+    """Potencia media de cada trama completa de x (señal ya rellenada)."""
+    if len(x) < frame_length:
+        return np.empty(0, dtype=np.float32)
+    frames = np.lib.stride_tricks.sliding_window_view(np.square(x), frame_length)[::hop_length]
+    return frames.mean(axis=-1)
+
+
+def iter_mono_blocks(file_path, sr=DEFAULT_SR, block_size=STREAM_BLOCK_SIZE, progress=None):
+    """Lee el archivo por bloques, mezclado a mono y remuestreado a sr."""
+    import soundfile as sf
+    import soxr
+
+    try:
+        info = sf.info(file_path)
+    except RuntimeError:
+        # Sin soporte en libsndfile: se decodifica entero en memoria con pydub
+        y, _ = _decode_with_pydub(file_path, sr)
+        for first in range(0, len(y), block_size):
+            if progress is not None:
+                progress(min(1.0, (first + block_size) / len(y)))
+            yield y[first:first + block_size]
+        return
+    resampler = None
+    if sr is not None and sr != info.samplerate:
+        resampler = soxr.ResampleStream(info.samplerate, sr, 1, dtype="float32", quality="HQ")
+    read = 0
+    for block in sf.blocks(file_path, blocksize=block_size, dtype="float32", always_2d=True):
+        mono = block.mean(axis=1, dtype=np.float32) if block.shape[1] > 1 else block[:, 0]
+        read += len(block)
+        if resampler is not None:
+            mono = resampler.resample_chunk(mono, last=read >= info.frames)
+        if progress is not None and info.frames:
+            progress(read / info.frames)
+        yield mono
+    if resampler is not None and read < info.frames:
+        yield resampler.resample_chunk(np.empty(0, dtype=np.float32), last=True)
+
+
+def _tee_blocks(blocks, tap):
+    for block in blocks:
+        tap(block)
+        yield block
+
+
+def _iter_frame_power(blocks, frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH):
+    """Genera la potencia por trama de forma incremental, como librosa.feature.rms con center=True.
+
+    Devuelve (por StopIteration) el número total de muestras leídas.
+    """
+    pad = frame_length // 2
+    buf = np.zeros(pad, dtype=np.float32)
+    total = 0
+    for block in blocks:
+        total += len(block)
+        buf = np.concatenate((buf, block))
+        power = _frame_power(buf, frame_length, hop_length)
+        if len(power):
+            buf = buf[len(power) * hop_length:]
+            yield power
+    buf = np.concatenate((buf, np.zeros(pad, dtype=np.float32)))
+    power = _frame_power(buf, frame_length, hop_length)
+    if len(power):
+        yield power
+    return total
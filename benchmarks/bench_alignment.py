@@ -0,0 +1,97 @@
+"""Precisión y velocidad de la alineación de líneas con segmentos.
+
+Uso:
+    python benchmarks/bench_alignment.py [--durations 180 900] [--lines 1000 5000]
+                                         [--max-error 0.25]
+
+Precisión: genera pistas de ráfagas de tono con respiraciones y líneas
+encadenadas (el número de segmentos casi nunca coincide con el de líneas),
+las analiza con analyze_silences y compara los inicios sugeridos con los
+reales, para la asignación anterior (línea i = segmento i) y para
+align_lines. Termina con código 1 si el error medio de align_lines supera
+--max-error segundos.
+
+Velocidad: alinea conjuntos sintéticos de segmentos de varios tamaños.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def first_segment_times(segments, count, total_duration):
+    """Asignación anterior a align_lines: el inicio del segmento i para la línea i."""
+    times = [start for start, _ in segments[:count]]
+    if count > len(segments):
+        last_time = segments[-1][1] if segments else 0
+        remaining = count - len(segments)
+        interval = (total_duration - last_time) / (remaining + 1)
+        times.extend(last_time + interval * (i + 1) for i in range(remaining))
+    return times
+
+
+def accuracy(durations, workdir, max_error):
+    import numpy as np
+    from alignment import align_lines
+    from audio_analysis import analyze_silences
+    from synth import lyric_fixture, tone_burst_cues, write_intervals
+
+    print(f"{'duración':>9} {'líneas':>7} {'segm.':>6} {'anterior (s)':>13} "
+          f"{'align_lines (s)':>16} {'p95 (s)':>8}")
+    errors = []
+    for seed, duration in enumerate(durations):
+        cues = tone_burst_cues(duration, seed)
+        lines, voiced = lyric_fixture(cues, seed)
+        path = os.path.join(workdir, f"align_{seed}_{int(duration)}s.wav")
+        write_intervals(path, voiced, duration, seed=seed)
+        segments = analyze_silences(path)
+        truth = np.array([start for start, _ in cues])
+        old = np.abs(np.array(first_segment_times(segments, len(lines), duration)) - truth)
+        new = np.abs(align_lines(segments, lines, duration)[0] - truth)
+        errors.append(new.mean())
+        print(f"{duration:>8.0f}s {len(lines):>7} {len(segments):>6} {old.mean():>13.3f} "
+              f"{new.mean():>16.3f} {np.percentile(new, 95):>8.3f}")
+    return max(errors) <= max_error
+
+
+def speed(sizes):
+    import numpy as np
+    from alignment import align_lines
+
+    rng = np.random.default_rng(0)
+    print(f"{'líneas':>8} {'tiempo (s)':>11}")
+    for n in sizes:
+        chars = rng.integers(5, 60, n)
+        speech = chars / 15.0 * rng.uniform(0.85, 1.15, n)
+        starts = np.cumsum(np.concatenate(([1.0], (speech + rng.uniform(0.3, 1.5, n))[:-1])))
+        segments = np.column_stack((starts, starts + speech))
+        # Respiraciones y uniones para que no coincidan líneas y segmentos
+        segments = np.delete(segments, rng.choice(n, n // 10, replace=False), axis=0)
+        lines = ["x" * int(c) for c in chars]
+        start = time.perf_counter()
+        align_lines(segments, lines, float(segments[-1, 1]))
+        print(f"{n:>8} {time.perf_counter() - start:>11.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--durations", type=float, nargs="+", default=[180, 900])
+    parser.add_argument("--lines", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--max-error", type=float, default=0.25)
+    parser.add_argument("--workdir")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="srtgen-bench-")
+    ok = accuracy(args.durations, workdir, args.max_error)
+    speed(args.lines)
+    if not ok:
+        print(f"ERROR: el error medio supera {args.max_error:.3f} s")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Error de las marcas con PlaybackClock frente a QMediaPlayer.position() sobre pistas de clics.
+
+Uso:
+    python benchmarks/bench_clock.py [--duration 300] [--max-p95 0.015]
+
+Simula en tiempo virtual varios backends de reproducción (informes cada
+10 ms, cada 100 ms, irregulares, con deriva del reloj de audio y con
+latencia de salida) sobre una pista de clics sintética de tiempos
+conocidos. El bucle de la interfaz consulta la posición cada 50 ms como la
+aplicación, y en el instante en que se oye cada clic se hace una marca:
+se compara el tiempo leído directamente del reproductor con el del reloj.
+Termina con código 1 si en algún escenario el percentil 95 del error del
+reloj supera --max-p95 o no mejora al del reproductor.
+"""
+import argparse
+import heapq
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Escenario: (intervalo entre informes (s), variación del intervalo (s),
+# retraso máximo de cada informe (s), ritmo real del audio, latencia de salida (s))
+SCENARIOS = {
+    "fino": (0.010, 0.0, 0.0, 1.0, 0.0),
+    "grueso": (0.100, 0.0, 0.0, 1.0, 0.0),
+    "irregular": (0.060, 0.050, 0.015, 1.0, 0.0),
+    "deriva": (0.100, 0.020, 0.005, 1.002, 0.0),
+    "latencia": (0.040, 0.010, 0.005, 1.0, 0.080),
+}
+# Intervalo del temporizador de la interfaz
+UI_INTERVAL = 0.05
+
+
+def click_times(duration, seed=0, spacing=(0.3, 1.2)):
+    """Instantes de los clics de la pista sintética."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    gaps = rng.uniform(*spacing, int(duration / spacing[0]) + 1)
+    times = np.cumsum(gaps) + 1.0
+    return times[times < duration]
+
+
+def simulate(scenario, clicks, duration, seed=0):
+    """Devuelve los errores (reproductor, reloj) de una marca en cada clic."""
+    import numpy as np
+    from playback_clock import PlaybackClock
+
+    interval, jitter, stale, rate, latency = scenario
+    rng = np.random.default_rng(seed)
+    virtual = [0.0]
+    clock = PlaybackClock(latency=latency, timer=lambda: virtual[0])
+    # Posición que el reproductor entrega: se queda fija entre informes
+    player = {"position": 0.0}
+
+    def true_position(t):
+        return t * rate
+
+    # Cola de eventos (instante, orden, tipo, dato); el reloj arranca en 0
+    events = []
+    t = 0.0
+    while t < duration:
+        t += max(0.001, interval + rng.uniform(-jitter, jitter))
+        delay = rng.uniform(0.0, stale)
+        # El valor se mide en t pero llega delay segundos después, redondeado al ms
+        heapq.heappush(events, (t + delay, 0, "report", round(true_position(t), 3)))
+    for k in range(int(duration / UI_INTERVAL)):
+        heapq.heappush(events, ((k + 1) * UI_INTERVAL, 1, "poll", None))
+    for click in clicks:
+        # Se oye cuando la posición enviada menos la latencia alcanza el clic
+        heapq.heappush(events, ((click + latency) / rate, 2, "mark", click))
+
+    clock.start(0.0)
+    raw_errors, clock_errors = [], []
+    while events:
+        virtual[0], _, kind, value = heapq.heappop(events)
+        if kind == "report":
+            player["position"] = value
+            clock.report(value)
+        elif kind == "poll":
+            clock.report(player["position"])
+            clock.now()
+        else:
+            raw_errors.append(player["position"] - value)
+            clock_errors.append(clock.now() - value)
+    return np.array(raw_errors), np.array(clock_errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=300.0)
+    parser.add_argument("--max-p95", type=float, default=0.015)
+    args = parser.parse_args()
+
+    import numpy as np
+
+    clicks = click_times(args.duration)
+    problems = []
+    print(f"{'escenario':>10} {'fuente':>13} {'medio (ms)':>11} {'p95 (ms)':>9} {'máx (ms)':>9}")
+    for name, scenario in SCENARIOS.items():
+        raw, clocked = simulate(scenario, clicks, args.duration)
+        p95 = {}
+        for label, errors in (("reproductor", raw), ("reloj", clocked)):
+            p95[label] = np.percentile(np.abs(errors), 95)
+            print(f"{name:>10} {label:>13} {errors.mean() * 1000:>+11.1f} {p95[label] * 1000:>9.1f} "
+                  f"{np.abs(errors).max() * 1000:>9.1f}")
+        if p95["reloj"] > args.max_p95:
+            problems.append(f"{name}: p95 del reloj {p95['reloj'] * 1000:.1f} ms")
+        if p95["reloj"] > p95["reproductor"] and p95["reproductor"] > 0.001:
+            problems.append(f"{name}: el reloj no mejora la posición del reproductor")
+
+    for problem in problems:
+        print(f"ERROR: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Carga masiva de transcripciones: QTableWidget celda a celda frente al modelo CueTableModel.
+
+Uso:
+    python benchmarks/bench_cue_store.py [--lines 1000 10000 50000]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    import numpy as np
+    from PyQt6.QtWidgets import QApplication, QTableView, QTableWidget, QTableWidgetItem
+    from cue_model import CueTableModel
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"{'líneas':>8} {'QTableWidget (s)':>17} {'modelo (s)':>11}")
+    for n in args.lines:
+        lyrics = [f"Línea de la transcripción número {i}" for i in range(n)]
+        times = 2.5 * np.arange(1, n + 1)
+
+        table = QTableWidget(0, 2)
+        table.show()
+        start = time.perf_counter()
+        table.setRowCount(n)
+        for i, line in enumerate(lyrics):
+            table.setItem(i, 0, QTableWidgetItem(line))
+            table.setItem(i, 1, QTableWidgetItem(f"{times[i]:.3f}"))
+        app.processEvents()
+        widget_time = time.perf_counter() - start
+        table.close()
+
+        model = CueTableModel()
+        view = QTableView()
+        view.setModel(model)
+        view.show()
+        start = time.perf_counter()
+        model.load(lyrics, times)
+        app.processEvents()
+        model_time = time.perf_counter() - start
+        view.close()
+        print(f"{n:>8} {widget_time:>17.3f} {model_time:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
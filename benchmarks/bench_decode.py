@@ -0,0 +1,103 @@
+"""Compara la carga de MP3 con WAV temporal (pydub) frente a la decodificación directa.
+
+Uso:
+    python benchmarks/bench_decode.py [--files 8] [--duration 300] [--workdir DIR]
+
+Para cada modo se informa del tiempo total de carga del lote y de la E/S:
+bytes leídos y escritos por el proceso (/proc/self/io) más el tamaño de los
+WAV intermedios, que escribe ffmpeg en un subproceso. El modo "transcode"
+necesita pydub y ffmpeg; si faltan se omite.
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def _proc_io():
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(": ") for line in f.read().splitlines())
+        return int(fields["rchar"]), int(fields["wchar"])
+    except OSError:
+        return 0, 0
+
+
+def run_child(mode, paths):
+    import librosa
+    from audio_analysis import decode_audio
+
+    read0, written0 = _proc_io()
+    temp_bytes = 0
+    start = time.perf_counter()
+    for path in paths:
+        if mode == "transcode":
+            from pydub import AudioSegment
+
+            temp_wav = os.path.splitext(path)[0] + "_temp.wav"
+            AudioSegment.from_mp3(path).export(temp_wav, format="wav")
+            temp_bytes += os.path.getsize(temp_wav)
+            librosa.load(temp_wav, mono=True)
+            os.remove(temp_wav)
+        else:
+            decode_audio(path)
+    elapsed = time.perf_counter() - start
+    read1, written1 = _proc_io()
+    print(json.dumps({
+        "seconds": elapsed,
+        "read_bytes": read1 - read0,
+        "written_bytes": written1 - written0 + temp_bytes,
+        "temp_bytes": temp_bytes,
+    }))
+
+
+def measure(mode, paths):
+    out = subprocess.run([sys.executable, __file__, "--child", mode, *paths],
+                         capture_output=True, text=True)
+    if out.returncode:
+        return None
+    return json.loads(out.stdout.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=300)
+    parser.add_argument("--sr", type=int, default=44100)
+    parser.add_argument("--workdir")
+    parser.add_argument("--child", nargs="+", metavar="ARG", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], args.child[1:])
+        return
+
+    from synth import write_tone_bursts
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="srtgen-bench-")
+    for i in range(args.files):
+        path = os.path.join(workdir, f"batch_{i:02d}.mp3")
+        if not os.path.exists(path):
+            write_tone_bursts(path, args.duration, sr=args.sr, seed=i, channels=2)
+    paths = sorted(glob.glob(os.path.join(workdir, "batch_*.mp3")))[:args.files]
+    mp3_mb = sum(os.path.getsize(p) for p in paths) / 1e6
+    print(f"{len(paths)} MP3 de {args.duration:.0f} s ({mp3_mb:.1f} MB en total)")
+    print(f"{'modo':>10} {'tiempo (s)':>11} {'leído (MB)':>11} {'escrito (MB)':>13} {'WAV temp. (MB)':>15}")
+    for mode in ("transcode", "direct"):
+        r = measure(mode, paths)
+        if r is None:
+            print(f"{mode:>10}  (omitido: requiere pydub y ffmpeg)")
+            continue
+        print(f"{mode:>10} {r['seconds']:>11.2f} {r['read_bytes'] / 1e6:>11.1f} "
+              f"{r['written_bytes'] / 1e6:>13.1f} {r['temp_bytes'] / 1e6:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
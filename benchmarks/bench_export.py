@@ -0,0 +1,129 @@
+"""Velocidad de exportación por formato y comprobación de ida y vuelta.
+
+Uso:
+    python benchmarks/bench_export.py [--cues 10000 100000]
+
+Mide cada formato de exporters.FORMATS frente a la escritura anterior de un
+write() por subtítulo, y vuelve a leer lo exportado: SRT y WebVTT con
+read_subtitles (tiempos al milisegundo, textos y estilo) y ASS y LRC con
+expresiones regulares sencillas. Termina con código 1 si alguna
+comprobación falla.
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+STYLE = {"font": "DejaVu Sans", "size": 18, "color": "#ffcc00"}
+
+
+def legacy_write_srt(output_file, starts, ends, texts):
+    """Escritura anterior: un write() por subtítulo con conversión en Python."""
+    def timestamp(seconds):
+        total_ms = int(seconds * 1000)
+        hours, rem = divmod(total_ms, 3600000)
+        minutes, rem = divmod(rem, 60000)
+        secs, ms = divmod(rem, 1000)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d},{ms:03d}"
+
+    with open(output_file, "w", encoding="utf-8") as file:
+        for i, (start, end, line) in enumerate(zip(starts, ends, texts), 1):
+            file.write(f"{i}\n{timestamp(start)} --> {timestamp(end)}\n{line}\n\n")
+
+
+def fixture(count, seed=0):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    starts = np.round(np.cumsum(rng.uniform(0.5, 4.0, count)), 3)
+    texts = [f"Línea {i} con acentos y ñ" + ("\nsegunda línea" if i % 7 == 0 else "")
+             for i in range(count)]
+    return texts, starts
+
+
+def check_round_trip(paths, starts, ends, lines):
+    """Devuelve los problemas encontrados al releer cada archivo exportado."""
+    import numpy as np
+    from subtitle_io import read_subtitles
+
+    problems = []
+    for path in paths:
+        ext = os.path.splitext(path)[1]
+        if ext in (".srt", ".vtt"):
+            imported = read_subtitles(path)
+            if imported.errors:
+                problems.append(f"{ext}: {len(imported.errors)} errores al releer")
+            if imported.texts != lines:
+                problems.append(f"{ext}: los textos no coinciden")
+            elif (np.abs(imported.starts - starts).max() > 0.0005
+                  or np.abs(imported.ends - ends).max() > 0.0005):
+                problems.append(f"{ext}: los tiempos no coinciden")
+            if ext == ".vtt" and imported.style != STYLE:
+                problems.append(f"{ext}: el estilo no coincide ({imported.style})")
+        else:
+            with open(path, encoding="utf-8") as file:
+                content = file.read()
+            if ext == ".ass":
+                times = re.findall(r"^Dialogue: 0,(\d+):(\d\d):(\d\d)\.(\d\d),", content, re.M)
+                font = re.search(r"^Style: Default,([^,]*),(\d+),&H00([0-9A-F]{6}),", content, re.M)
+                if font is None or font.groups() != (STYLE["font"], str(STYLE["size"]), "00CCFF"):
+                    problems.append(f"{ext}: el estilo no coincide")
+                parsed = np.array([int(h) * 3600 + int(m) * 60 + int(s) + int(cs) / 100
+                                   for h, m, s, cs in times])
+            else:
+                times = re.findall(r"^\[(\d+):(\d\d)\.(\d\d)\](.+)$", content, re.M)
+                parsed = np.array([int(m) * 60 + int(s) + int(cs) / 100 for m, s, cs, _ in times])
+            if len(parsed) != len(starts):
+                problems.append(f"{ext}: {len(parsed)} subtítulos en lugar de {len(starts)}")
+            elif np.abs(parsed - starts).max() > 0.0051:
+                problems.append(f"{ext}: los tiempos no coinciden")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cues", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--workdir")
+    args = parser.parse_args()
+
+    from exporters import FORMATS, export_subtitles, write_subtitles
+    from subtitle_io import cue_intervals
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="srtgen-bench-")
+    print(f"{'subtítulos':>11} {'formato':>8} {'tiempo (s)':>11} {'MB/s':>8}")
+    problems = []
+    for count in args.cues:
+        texts, raw_starts = fixture(count)
+        duration = float(raw_starts[-1]) + 10
+        starts, ends, lines = cue_intervals(texts, raw_starts, None, duration)
+
+        path = os.path.join(workdir, f"legacy_{count}.srt")
+        start = time.perf_counter()
+        legacy_write_srt(path, starts, ends, lines)
+        elapsed = time.perf_counter() - start
+        print(f"{count:>11} {'anterior':>8} {elapsed:>11.3f} {os.path.getsize(path) / elapsed / 1e6:>8.1f}")
+        for fmt, (extension, _, _) in FORMATS.items():
+            path = os.path.join(workdir, f"cues_{count}{extension}")
+            start = time.perf_counter()
+            write_subtitles(path, fmt, starts, ends, lines, STYLE)
+            elapsed = time.perf_counter() - start
+            print(f"{count:>11} {fmt:>8} {elapsed:>11.3f} {os.path.getsize(path) / elapsed / 1e6:>8.1f}")
+
+        start = time.perf_counter()
+        paths = export_subtitles(os.path.join(workdir, f"all_{count}"), list(FORMATS),
+                                 texts, raw_starts, None, duration, STYLE)
+        print(f"{count:>11} {'todos':>8} {time.perf_counter() - start:>11.3f}")
+        problems += [f"{count}: {problem}" for problem in check_round_trip(paths, starts, ends, lines)]
+
+    for problem in problems:
+        print(f"ERROR: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
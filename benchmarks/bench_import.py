@@ -0,0 +1,85 @@
+"""Importación de archivos SRT y WebVTT grandes hasta el modelo de la tabla.
+
+Uso:
+    python benchmarks/bench_import.py [--cues 10000 100000] [--max-seconds 1.0]
+
+Genera archivos con la cabecera de estilo de write_srt (SRT) o WEBVTT,
+los importa con read_subtitles y los carga en un CueTableModel. Termina
+con código 1 si la importación más grande supera --max-seconds.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def _timestamp(seconds, separator):
+    ms = int(round(seconds * 1000))
+    hours, rem = divmod(ms, 3600000)
+    minutes, rem = divmod(rem, 60000)
+    secs, ms = divmod(rem, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{ms:03d}"
+
+
+def write_fixture(path, count, vtt):
+    """Escribe count subtítulos de 2 s separados por 0,5 s."""
+    separator = "." if vtt else ","
+    parts = ["WEBVTT\n\n" if vtt else "## Subtitle Style\n# Font: Arial\n# Size: 12\n# Color: #ffffff\n\n"]
+    for i in range(count):
+        start = i * 2.5
+        parts.append(f"{i + 1}\n{_timestamp(start, separator)} --> {_timestamp(start + 2, separator)}\n"
+                     f"Línea de subtítulo número {i + 1}\n\n")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("".join(parts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cues", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--max-seconds", type=float, default=1.0)
+    parser.add_argument("--workdir")
+    args = parser.parse_args()
+
+    from PyQt6.QtWidgets import QApplication, QTableView
+    from cue_model import CueTableModel
+    from subtitle_io import read_subtitles
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    workdir = args.workdir or tempfile.mkdtemp(prefix="srtgen-bench-")
+    print(f"{'subtítulos':>11} {'formato':>8} {'lectura (s)':>12} {'tabla (s)':>10} {'total (s)':>10}")
+    slowest = 0.0
+    for count in args.cues:
+        for ext in ("srt", "vtt"):
+            path = os.path.join(workdir, f"cues_{count}.{ext}")
+            if not os.path.exists(path):
+                write_fixture(path, count, ext == "vtt")
+            model = CueTableModel()
+            view = QTableView()
+            view.setModel(model)
+            view.show()
+            start = time.perf_counter()
+            imported = read_subtitles(path)
+            parsed = time.perf_counter() - start
+            model.load(imported.texts, imported.starts, imported.ends)
+            app.processEvents()
+            total = time.perf_counter() - start
+            view.close()
+            if len(imported.texts) != count or imported.errors:
+                print(f"ERROR: {path}: {len(imported.texts)} subtítulos, {len(imported.errors)} errores")
+                return 1
+            if count == max(args.cues):
+                slowest = max(slowest, total)
+            print(f"{count:>11} {ext:>8} {parsed:>12.3f} {total - parsed:>10.3f} {total:>10.3f}")
+    if slowest > args.max_seconds:
+        print(f"ERROR: la importación tarda {slowest:.3f} s (límite {args.max_seconds:.3f} s)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Precisión de los ataques detectados y de las marcas ajustadas a ellos.
+
+Uso:
+    python benchmarks/bench_onsets.py [--duration 600] [--max-error 0.03]
+
+Sobre una pista sintética de ráfagas de tono mide cuánto tarda
+EnergyEnvelope.onsets, el error de cada ataque frente al inicio real de su
+ráfaga y el coste de nearest_onset por pulsación. Después simula marcas
+tardías (reacción de 150-300 ms) y compara el error sin corregir, restando
+el tiempo de reacción y ajustando además al ataque más cercano. Termina con
+código 1 si algún ataque falta o se desvía más de --max-error, o si las
+marcas ajustadas no mejoran a las originales.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Ventana y tiempo de reacción usados en la simulación de marcas
+SNAP_WINDOW = 0.15
+REACTION = 0.2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=600.0)
+    parser.add_argument("--max-error", type=float, default=0.03)
+    parser.add_argument("--workdir")
+    args = parser.parse_args()
+
+    import numpy as np
+    from audio_analysis import energy_envelope, nearest_onset
+    from synth import write_tone_bursts
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="srtgen-bench-")
+    path = os.path.join(workdir, f"bursts_{int(args.duration)}.wav")
+    cues = write_tone_bursts(path, args.duration)
+    reference = np.array([start for start, _ in cues])
+    envelope = energy_envelope(path)
+
+    start = time.perf_counter()
+    onsets = envelope.onsets()
+    detect = time.perf_counter() - start
+    nearest = np.array([nearest_onset(onsets, t, 0.5) for t in reference], dtype=np.float64)
+    errors = nearest - reference
+    print(f"ataques: {len(onsets)} detectados, {len(reference)} reales, {detect * 1000:.1f} ms")
+    print(f"error de los ataques: medio {np.nanmean(errors) * 1000:+.1f} ms, "
+          f"máximo {np.nanmax(np.abs(errors)) * 1000:.1f} ms")
+
+    rng = np.random.default_rng(1)
+    marks = reference + rng.uniform(0.15, 0.3, len(reference))
+    start = time.perf_counter()
+    snapped = []
+    for mark in marks:
+        corrected = max(0.0, mark - REACTION)
+        onset = nearest_onset(onsets, corrected, SNAP_WINDOW)
+        snapped.append(corrected if onset is None else onset)
+    per_mark = (time.perf_counter() - start) / len(marks)
+    print(f"ajuste por marca: {per_mark * 1e6:.1f} µs")
+    results = {
+        "sin corregir": marks - reference,
+        "con reacción": marks - REACTION - reference,
+        "con reacción y ataque": np.array(snapped) - reference,
+    }
+    for label, error in results.items():
+        print(f"{label:>22}: error medio absoluto {np.abs(error).mean() * 1000:6.1f} ms")
+
+    problems = []
+    if np.isnan(errors).any():
+        problems.append(f"{int(np.isnan(errors).sum())} ráfagas sin ataque cercano")
+    elif np.abs(errors).max() > args.max_error:
+        problems.append(f"un ataque se desvía {np.abs(errors).max() * 1000:.1f} ms")
+    if np.abs(results["con reacción y ataque"]).mean() >= np.abs(results["sin corregir"]).mean():
+        problems.append("ajustar las marcas no reduce el error")
+    for problem in problems:
+        print(f"ERROR: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Escalado del análisis de una grabación larga sin caché con 1, 2, 4, 8 y 16 procesos.
+
+Uso:
+    python benchmarks/bench_parallel.py [--duration 3600] [--format mp3] [--workers 1 2 4 8 16]
+
+Para cada número de procesos mide energy_envelope desde el archivo con una
+caché de audio vacía (el caso de las grabaciones que no caben en ella): en
+serie se lee por bloques y con varios procesos cada uno decodifica y
+remuestrea sus propios tramos. Por defecto la pista es un MP3 estéreo a
+44100 Hz, donde decodificar y remuestrear a 22050 Hz es casi todo el coste.
+Comprueba que la envolvente coincide con la serie (salvo el redondeo del
+remuestreo en las fronteras) y que los segmentos son los mismos.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=3600)
+    parser.add_argument("--format", choices=["mp3", "ogg", "flac", "wav"], default="mp3")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--workdir")
+    args = parser.parse_args()
+
+    import numpy as np
+    from audio_analysis import AudioCache, energy_envelope, envelope_cache
+    from synth import write_tone_bursts
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="srtgen-bench-")
+    path = os.path.join(workdir, f"bursts_{int(args.duration)}s.{args.format}")
+    if not os.path.exists(path):
+        write_tone_bursts(path, args.duration, sr=44100, channels=2)
+    print(f"{args.duration:.0f} s de audio ({args.format}), {os.cpu_count()} CPU disponibles")
+
+    print(f"{'procesos':>9} {'tiempo (s)':>11} {'aceleración':>12} {'dif. máx.':>10} {'segmentos':>10}")
+    base = serial = None
+    mismatches = 0
+    for workers in [1] + [w for w in args.workers if w > 1]:
+        envelope_cache.clear()
+        start = time.perf_counter()
+        envelope = energy_envelope(path, workers=workers, cache=AudioCache(max_bytes=0))
+        elapsed = time.perf_counter() - start
+        if serial is None:
+            base, serial = elapsed, envelope
+        # Diferencia relativa a la trama más fuerte
+        diff = (float(np.abs(envelope.power - serial.power).max()) / serial.peak
+                if len(envelope.power) == len(serial.power) else float("inf"))
+        same = envelope.segments() == serial.segments()
+        mismatches += not same or diff > 1e-5
+        print(f"{workers:>9} {elapsed:>11.2f} {base / elapsed:>11.2f}x {diff:>10.1e} "
+              f"{'iguales' if same else 'DISTINTOS':>10}")
+    if mismatches:
+        print("ERROR: la envolvente en paralelo difiere de la calculada en serie")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
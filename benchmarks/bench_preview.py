@@ -0,0 +1,70 @@
+"""Coste por tick de la vista previa: recorrido lineal de la tabla frente al índice con bisect.
+
+Uso:
+    python benchmarks/bench_preview.py [--cues 100 10000 100000] [--ticks 200]
+
+El recorrido lineal reproduce el update_preview anterior sobre un
+QTableWidget real (plataforma Qt "offscreen").
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def linear_scan(table, current_time):
+    current_line = ""
+    max_time = -1
+    for row in range(table.rowCount()):
+        try:
+            time_item = table.item(row, 1)
+            if time_item:
+                t = float(time_item.text())
+                if t > max_time and t <= current_time:
+                    max_time = t
+                    current_line = table.item(row, 0).text()
+        except (ValueError, AttributeError):
+            continue
+    return current_line
+
+
+def per_tick(fn, times):
+    start = time.perf_counter()
+    for t in times:
+        fn(t)
+    return (time.perf_counter() - start) / len(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cues", type=int, nargs="+", default=[100, 10000, 100000])
+    parser.add_argument("--ticks", type=int, default=200)
+    args = parser.parse_args()
+
+    from PyQt6.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+    from cues import CueIndex
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"{'cues':>8} {'lineal (µs/tick)':>17} {'bisect (µs/tick)':>17}")
+    for n in args.cues:
+        table = QTableWidget(n, 2)
+        for row in range(n):
+            table.setItem(row, 0, QTableWidgetItem(f"Línea {row}"))
+            table.setItem(row, 1, QTableWidgetItem(f"{row * 2.5:.3f}"))
+        index = CueIndex()
+        index.rebuild((row, row * 2.5) for row in range(n))
+        # Ticks de 50 ms repartidos a lo largo de toda la pista
+        span = n * 2.5
+        times = [span * i / args.ticks for i in range(args.ticks)]
+        linear = per_tick(lambda t: linear_scan(table, t), times[:max(1, args.ticks * 100 // n)])
+        indexed = per_tick(lambda t: table.item(index.active_row(t) or 0, 0).text(), times)
+        print(f"{n:>8} {linear * 1e6:>17.1f} {indexed * 1e6:>17.2f}")
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Operaciones de tiempos en bloque sobre CueTableModel y memoria de su historia.
+
+Uso:
+    python benchmarks/bench_retime.py [--cues 10000 100000] [--max-seconds 0.1]
+
+Aplica desplazamiento, escala, sincronización por dos puntos, desplazamiento
+desde una fila, separación mínima y ediciones de una fila con la tabla
+visible, y compara la memoria de la historia con la de guardar una copia de
+la tabla por paso. Después deshace y rehace todo y comprueba que los tiempos
+vuelven a ser exactamente los mismos. Termina con código 1 si alguna
+comprobación falla o una operación tarda más de --max-seconds.
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def same(a, b):
+    import numpy as np
+
+    return np.array_equal(a, b, equal_nan=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cues", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--max-seconds", type=float, default=0.1)
+    args = parser.parse_args()
+
+    import numpy as np
+    from PyQt6.QtWidgets import QApplication, QTableView
+    import retiming
+    from cue_model import CueTableModel
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    problems = []
+    print(f"{'subtítulos':>11} {'operación':>24} {'tiempo (s)':>11} {'delta (KB)':>11}")
+    for count in args.cues:
+        rng = np.random.default_rng(count)
+        texts = [f"Línea {i}" for i in range(count)]
+        starts = np.round(np.cumsum(rng.uniform(0.5, 4.0, count)), 3)
+        ends = np.where(rng.random(count) < 0.5, np.nan, starts + 0.4)
+        model = CueTableModel()
+        view = QTableView()
+        view.setModel(model)
+        view.show()
+        model.load(texts, starts, ends)
+        app.processEvents()
+        snapshots = [(model.store.starts.copy(), model.store.ends.copy())]
+        store = model.store
+
+        steps = [
+            ("desplazar todo", lambda: (retiming.shift(store.starts, 1.25), retiming.shift(store.ends, 1.25))),
+            ("escalar 25/23.976", lambda: (retiming.scale(store.starts, 25 / 23.976),
+                                           retiming.scale(store.ends, 25 / 23.976))),
+            ("dos puntos", lambda: (retiming.sync_two_points(store.starts, (10.0, 11.0), (5000.0, 4990.0)),
+                                    retiming.sync_two_points(store.ends, (10.0, 11.0), (5000.0, 4990.0)))),
+            ("desde la fila", lambda: (np.concatenate([store.starts[:count // 2],
+                                                       retiming.shift(store.starts[count // 2:], -0.5)]),
+                                       np.concatenate([store.ends[:count // 2],
+                                                       retiming.shift(store.ends[count // 2:], -0.5)]))),
+            ("separación mínima", lambda: (store.starts, retiming.enforce_min_gap(store.starts, store.ends, 0.1))),
+        ]
+        for label, compute in steps:
+            start = time.perf_counter()
+            new_starts, new_ends = compute()
+            model.apply_times(label, new_starts, new_ends)
+            app.processEvents()
+            elapsed = time.perf_counter() - start
+            delta = model.history._undo[-1]
+            print(f"{count:>11} {label:>24} {elapsed:>11.4f} {model.history._size(delta) / 1024:>11.1f}")
+            if elapsed > args.max_seconds:
+                problems.append(f"{count}: {label} tardó {elapsed:.3f} s")
+            snapshots.append((store.starts.copy(), store.ends.copy()))
+
+        start = time.perf_counter()
+        for row in range(0, count, max(1, count // 1000)):
+            model.set_start(row, float(store.starts[row]) + 0.1)
+        app.processEvents()
+        edits = len(range(0, count, max(1, count // 1000)))
+        print(f"{count:>11} {f'{edits} ediciones de fila':>24} {time.perf_counter() - start:>11.4f}")
+        snapshots.append((store.starts.copy(), store.ends.copy()))
+
+        table_bytes = store.starts.nbytes + store.ends.nbytes + sum(sys.getsizeof(t) for t in texts)
+        history_bytes = model.history._bytes
+        steps_count = len(model.history._undo)
+        print(f"{count:>11} historia: {history_bytes / 1e6:.1f} MB en {steps_count} pasos; "
+              f"con copias de la tabla: {table_bytes * steps_count / 1e6:.1f} MB")
+
+        # Deshacer hasta el principio y rehacer hasta el final
+        for _ in range(edits):
+            model.undo()
+        for k in range(len(steps), 0, -1):
+            if not (same(store.starts, snapshots[k][0]) and same(store.ends, snapshots[k][1])):
+                problems.append(f"{count}: deshacer no restaura el paso {k}")
+            model.undo()
+        if not (same(store.starts, snapshots[0][0]) and same(store.ends, snapshots[0][1])):
+            problems.append(f"{count}: deshacer no restaura los tiempos iniciales")
+        for _ in range(len(steps) + edits):
+            model.redo()
+        if not (same(store.starts, snapshots[-1][0]) and same(store.ends, snapshots[-1][1])):
+            problems.append(f"{count}: rehacer no recupera los tiempos finales")
+        timed = store.starts[~np.isnan(store.starts)]
+        if store.index.starts != np.sort(timed).tolist():
+            problems.append(f"{count}: el índice de inicios no está sincronizado")
+        view.close()
+
+    for problem in problems:
+        print(f"ERROR: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
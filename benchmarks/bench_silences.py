@@ -0,0 +1,98 @@
+"""Compara memoria pico y tiempo del análisis de silencios por streaming frente al de archivo completo.
+
+Uso:
+    python benchmarks/bench_silences.py [--durations 600 3600 10800] [--workdir DIR]
+
+El modo por streaming es el camino de la aplicación para grabaciones que
+no caben en la caché de audio: analyze_silences con una caché de 0 bytes,
+que lee el archivo por bloques para calcular la envolvente de energía.
+Cada medición se ejecuta en un proceso aparte para que la memoria pico
+(ru_maxrss) corresponda solo a ese modo. Termina con código 1 si los
+modos no dan los mismos segmentos.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def _peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_child(mode, path, top_db):
+    import librosa
+    import numpy as np
+    from audio_analysis import AudioCache, analyze_silences
+
+    base_rss = _peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "whole":
+        y, sr = librosa.load(path, mono=True)
+        segments = [(s / sr, e / sr) for s, e in librosa.effects.split(y, top_db=top_db)]
+    else:
+        segments = analyze_silences(path, top_db=top_db, cache=AudioCache(max_bytes=0))
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "seconds": elapsed,
+        "base_rss_mb": base_rss,
+        "peak_rss_mb": _peak_rss_mb(),
+        "segments": np.asarray(segments, dtype=float).tolist(),
+    }))
+
+
+def measure(mode, path, top_db):
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", mode, path, "--top-db", str(top_db)],
+        check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--durations", type=float, nargs="+", default=[600, 3600, 10800])
+    parser.add_argument("--sr", type=int, default=44100)
+    parser.add_argument("--top-db", type=float, default=20)
+    parser.add_argument("--workdir")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], args.child[1], args.top_db)
+        return 0
+
+    from synth import write_tone_bursts
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="srtgen-bench-")
+    ok = True
+    print(f"{'duración':>10} {'modo':>7} {'tiempo (s)':>11} {'RSS pico (MB)':>14} "
+          f"{'sobre base':>11} {'segmentos':>10}")
+    for duration in args.durations:
+        path = os.path.join(workdir, f"bursts_{int(duration)}s.wav")
+        if not os.path.exists(path):
+            write_tone_bursts(path, duration, sr=args.sr)
+        results = {mode: measure(mode, path, args.top_db) for mode in ("whole", "stream")}
+        for mode, r in results.items():
+            print(f"{duration:>9.0f}s {mode:>7} {r['seconds']:>11.2f} "
+                  f"{r['peak_rss_mb']:>14.1f} {r['peak_rss_mb'] - r['base_rss_mb']:>11.1f} "
+                  f"{len(r['segments']):>10}")
+        whole, stream = results["whole"]["segments"], results["stream"]["segments"]
+        if len(whole) != len(stream):
+            print(f"  ¡Distinto número de segmentos! ({len(whole)} frente a {len(stream)})")
+            ok = False
+        elif whole:
+            diff = max(abs(a - b) for w, s in zip(whole, stream) for a, b in zip(w, s))
+            print(f"  diferencia máxima entre modos: {diff * 1000:.3f} ms")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Tiempo hasta el primer pintado de la ventana y coste de importación al arrancar.
+
+Uso:
+    python benchmarks/bench_startup.py [--runs 5] [--max-seconds 1.5]
+
+Arranca la aplicación en un proceso nuevo con "python -X importtime", espera
+al primer evento de pintado de la ventana y sale. Termina con código 1 si la
+mediana supera --max-seconds o si alguna biblioteca de audio pesada se
+importó antes de mostrar la ventana.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos que no deben cargarse antes del primer pintado
+HEAVY_MODULES = ("librosa", "scipy", "numba", "sklearn", "soundfile", "pydub", "PyQt6.QtMultimedia")
+
+CHILD = r"""
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, ROOT)
+from PyQt6.QtCore import QEvent, QObject
+from PyQt6.QtWidgets import QApplication
+import srtgen
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and not hasattr(self, "elapsed"):
+            self.elapsed = time.perf_counter() - start
+            app.quit()
+        return False
+
+app = QApplication(sys.argv)
+window = srtgen.AudioSync()
+watcher = FirstPaint()
+window.installEventFilter(watcher)
+window.show()
+app.exec()
+print(json.dumps({
+    "first_paint_s": watcher.elapsed,
+    "heavy": sorted(m for m in HEAVY if m in sys.modules),
+}))
+"""
+
+
+def run_once():
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    code = f"ROOT = {ROOT!r}\nHEAVY = {HEAVY_MODULES!r}\n" + CHILD
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                         capture_output=True, text=True, env=env, check=True)
+    result = json.loads(out.stdout.splitlines()[-1])
+    result["imports"] = _parse_importtime(out.stderr)
+    return result
+
+
+def _parse_importtime(stderr):
+    """Devuelve {módulo de primer nivel: microsegundos acumulados}."""
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if not name.startswith(" ") and "." not in name.strip():
+            totals[name.strip()] = totals.get(name.strip(), 0) + int(cumulative)
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=1.5)
+    parser.add_argument("--top", type=int, default=8, help="importaciones más costosas a mostrar")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    median = statistics.median(r["first_paint_s"] for r in runs)
+    print(f"primer pintado (mediana de {args.runs}): {median * 1000:.0f} ms")
+    print("importaciones más costosas (última ejecución):")
+    imports = sorted(runs[-1]["imports"].items(), key=lambda item: -item[1])
+    for name, micros in imports[:args.top]:
+        print(f"  {name:<24} {micros / 1000:>8.1f} ms")
+
+    failed = False
+    heavy = sorted(set(m for r in runs for m in r["heavy"]))
+    if heavy:
+        print(f"ERROR: importados antes del primer pintado: {', '.join(heavy)}")
+        failed = True
+    if median > args.max_seconds:
+        print(f"ERROR: {median:.2f} s supera el límite de {args.max_seconds:.2f} s")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
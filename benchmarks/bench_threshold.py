@@ -0,0 +1,64 @@
+"""Tiempo de volver a segmentar con otro umbral: librosa.effects.split frente a la envolvente guardada.
+
+Uso:
+    python benchmarks/bench_threshold.py [--durations 180 3600] [--thresholds 10 20 30 40]
+
+Para cada umbral compara el análisis completo (decodificar y llamar a
+librosa.effects.split) con EnergyEnvelope.segments sobre la envolvente
+calculada una vez, y comprueba que los segmentos coinciden.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--durations", type=float, nargs="+", default=[180, 3600])
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[10, 20, 30, 40])
+    parser.add_argument("--workdir")
+    args = parser.parse_args()
+
+    import librosa
+    import numpy as np
+    from audio_analysis import AudioCache, energy_envelope
+    from synth import write_tone_bursts
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="srtgen-bench-")
+    print(f"{'duración':>9} {'umbral':>7} {'completo (s)':>13} {'envolvente (ms)':>16} "
+          f"{'segmentos':>10} {'dif. máx (ms)':>14}")
+    mismatches = 0
+    for duration in args.durations:
+        path = os.path.join(workdir, f"bursts_{int(duration)}s.wav")
+        if not os.path.exists(path):
+            write_tone_bursts(path, duration)
+        start = time.perf_counter()
+        envelope = energy_envelope(path, cache=AudioCache(max_bytes=0))
+        print(f"{duration:>8.0f}s  envolvente calculada en {time.perf_counter() - start:.2f} s")
+        for top_db in args.thresholds:
+            start = time.perf_counter()
+            y, sr = librosa.load(path)
+            whole = [(s / sr, e / sr) for s, e in librosa.effects.split(y, top_db=top_db)]
+            full = time.perf_counter() - start
+            start = time.perf_counter()
+            fast = envelope.segments(top_db)
+            fast_ms = (time.perf_counter() - start) * 1000
+            if len(whole) != len(fast):
+                mismatches += 1
+                diff = float("nan")
+            else:
+                diff = float(np.max(np.abs(np.subtract(whole, fast)))) * 1000 if whole else 0.0
+            print(f"{duration:>8.0f}s {top_db:>7.0f} {full:>13.2f} {fast_ms:>16.2f} "
+                  f"{len(fast):>10} {diff:>14.3f}")
+    if mismatches:
+        print(f"ERROR: {mismatches} umbrales con distinto número de segmentos")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Coste de CPU por tick de reproducción: actualización anterior frente a UpdateScheduler.
+
+Uso:
+    python benchmarks/bench_ui_tick.py [--cues 1000 100000] [--ticks 400]
+
+Crea la ventana real (plataforma Qt "offscreen") con la tabla cargada y
+avanza el reloj de reproducción en tiempo virtual. La actualización
+anterior llamaba a time_slider.setValue con valueChanged conectado de vuelta
+a update_position, así que cada tick se hacía dos veces y volvía a
+formatear la duración; aquí se reproduce sobre los mismos widgets. Después
+comprueba que en pausa no hay ninguna pasada. Termina con código 1 si el
+planificador no reduce el coste por tick o hace pasadas en pausa.
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Separación entre ticks, como el temporizador de la aplicación
+TICK = 0.05
+
+
+def legacy_tick(window, position):
+    """update_position anterior: slider con valueChanged de vuelta y la duración formateada cada vez."""
+    window.time_slider.setValue(position)
+    current_time = position / 1000.0
+    window.waveform.set_position(current_time)
+    cur_h, cur_m, cur_s, cur_ms = window._format_time(current_time)
+    dur_h, dur_m, dur_s, dur_ms = window._format_time(window.duration)
+    window.time_label.setText(
+        f"{cur_h:02d}:{cur_m:02d}:{cur_s:02d},{cur_ms:03d} / "
+        f"{dur_h:02d}:{dur_m:02d}:{dur_s:02d},{dur_ms:03d}")
+    window.update_preview(current_time)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cues", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--ticks", type=int, default=400)
+    args = parser.parse_args()
+
+    import numpy as np
+    from PyQt6.QtWidgets import QApplication
+    import srtgen
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    problems = []
+    print(f"{'subtítulos':>11} {'anterior (µs)':>14} {'planificador (µs)':>18} {'escrituras':>11} {'evitadas':>9}")
+    for count in args.cues:
+        window = srtgen.AudioSync()
+        window.show()
+        # Subtítulos cada 0.3 s para que la vista previa cambie a menudo
+        times = 0.3 * np.arange(count)
+        window.cue_model.load([f"Línea {i}" for i in range(count)], times)
+        window.media_file = "bench"
+        window.duration = float(times[-1]) + 5.0
+        window._duration_text = window._clock_text(window.duration)
+        window.time_slider.setRange(0, int(window.duration * 1000))
+        app.processEvents()
+
+        # Anterior: valueChanged vuelve a entrar en la actualización con la posición del reproductor
+        positions = [int((k + 1) * TICK * 1000) for k in range(args.ticks)]
+        current = {"position": 0}
+        reentry = window.time_slider.valueChanged.connect(
+            lambda _: legacy_tick(window, current["position"]))
+        start = time.thread_time()
+        for position in positions:
+            current["position"] = position
+            legacy_tick(window, position)
+        legacy = (time.thread_time() - start) / len(positions)
+        window.time_slider.valueChanged.disconnect(reentry)
+        window.time_slider.setValue(0)
+
+        # Planificador: el reloj avanza en tiempo virtual y cada tick es una pasada
+        virtual = [0.0]
+        window.clock.timer = lambda: virtual[0]
+        window.clock.start(0.0)
+        window.updates.reset_stats()
+        for position in positions:
+            virtual[0] = position / 1000.0
+            window.clock.report(virtual[0])
+            window.updates._run()
+        stats = window.updates.stats
+        scheduled = stats["cpu"] / stats["passes"]
+        print(f"{count:>11} {legacy * 1e6:>14.0f} {scheduled * 1e6:>18.0f} "
+              f"{stats['writes']:>11} {stats['skipped']:>9}")
+        if scheduled >= legacy:
+            problems.append(f"{count}: el planificador no reduce el coste por tick")
+
+        # En pausa: una última pasada y ninguna más
+        window.clock.pause(virtual[0])
+        window.updates.set_playing(True)
+        window.updates.set_playing(False)
+        window.updates.reset_stats()
+        deadline = time.perf_counter() + 0.5
+        while time.perf_counter() < deadline:
+            app.processEvents()
+        if window.updates.stats["passes"] > 1:
+            problems.append(f"{count}: {window.updates.stats['passes']} pasadas en pausa")
+        print(f"{count:>11} en pausa 0.5 s: {window.updates.summary()}")
+        window.close()
+
+    for problem in problems:
+        print(f"ERROR: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
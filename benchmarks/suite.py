@@ -0,0 +1,354 @@
+"""Suite reproducible de benchmarks de todas las etapas, con historial y comparación.
+
+Uso:
+    python benchmarks/suite.py run [--lengths 60 600 1800] [--rates 22050 44100]
+                                   [--repeat 3] [--quick] [--compare]
+    python benchmarks/suite.py compare [BASE] [NUEVA] [--tolerance 0.15]
+
+run genera (o reutiliza) pistas sintéticas deterministas de ráfagas de tono
+con su archivo de letras para cada duración y frecuencia de muestreo, y mide
+cada etapa de la aplicación sin interfaz visible (plataforma Qt "offscreen"
+para las partes con widgets): decodificación, análisis de silencios,
+reumbralizado, ataques, alineación, picos de la forma de onda, llenado de la
+tabla, pasadas de la vista previa, exportación e importación. De cada etapa
+guarda la mediana y el mínimo de --repeat ejecuciones y el pico de memoria
+de Python (tracemalloc, que incluye los arrays de numpy) en una ejecución
+aparte, y añade la ejecución como una línea JSON a --history.
+
+compare compara dos ejecuciones del historial (por defecto las dos últimas;
+BASE y NUEVA son posiciones, p. ej. -2, o el inicio del identificador) y
+marca como regresión la etapa cuyo tiempo o memoria crece más de
+--tolerance (y más de --min-seconds o --min-mb, para ignorar el ruido).
+Termina con código 1 si hay alguna regresión.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+DEFAULT_HISTORY = os.path.join(ROOT, "benchmarks", "results", "history.jsonl")
+DEFAULT_WORKDIR = os.path.join(ROOT, "benchmarks", "results", "fixtures")
+# Pasadas de la vista previa medidas por ejecución (10 s de reproducción)
+PREVIEW_PASSES = 200
+# Umbrales probados en el reumbralizado
+THRESHOLDS = (10, 20, 30, 40, 50)
+
+
+class Fixture:
+    """Pista sintética, sus letras y los resultados intermedios que usan las etapas siguientes."""
+
+    def __init__(self, workdir, duration, sr):
+        from synth import write_fixture
+        from subtitle_io import read_lyrics
+
+        self.name = f"{int(duration)}s@{sr}"
+        self.duration = duration
+        self.workdir = workdir
+        self.audio, self.lyrics_path, _ = write_fixture(workdir, duration, sr)
+        self.lines = read_lyrics(self.lyrics_path)
+        self.envelope = None
+        self.segments = None
+        self.window = None
+        self.output = os.path.join(workdir, f"export_{int(duration)}s_{sr}hz")
+
+
+def _clear_caches():
+    from audio_analysis import audio_cache, envelope_cache
+
+    audio_cache.clear()
+    envelope_cache.clear()
+
+
+def stage_decode(fx):
+    from audio_analysis import decode_audio
+
+    decode_audio(fx.audio)
+
+
+def stage_analyze_silences(fx):
+    from audio_analysis import analyze_silences, energy_envelope
+
+    _clear_caches()
+    fx.segments = analyze_silences(fx.audio)
+    fx.envelope = energy_envelope(fx.audio)
+
+
+def stage_rethreshold(fx):
+    for top_db in THRESHOLDS:
+        fx.envelope.segments(top_db)
+
+
+def stage_onsets(fx):
+    fx.envelope.onsets()
+
+
+def stage_align(fx):
+    from alignment import suggest_times
+
+    suggest_times(fx.segments, fx.lines, fx.duration)
+
+
+def stage_peaks(fx):
+    from peaks import _cache_paths, load_peak_pyramid
+
+    _clear_caches()
+    for path in _cache_paths(fx.audio):
+        if os.path.exists(path):
+            os.remove(path)
+    load_peak_pyramid(fx.audio)
+
+
+# La QApplication debe vivir toda la ejecución o Qt destruye las ventanas
+_app = None
+
+
+def _window(fx):
+    """Crea la ventana de la pista la primera vez; se llama como preparación sin medir."""
+    global _app
+    from PyQt6.QtWidgets import QApplication
+    import srtgen
+
+    app = _app = _app or QApplication.instance() or QApplication(sys.argv)
+    if fx.window is None:
+        fx.window = srtgen.AudioSync()
+        fx.window.show()
+        app.processEvents()
+    return app, fx.window
+
+
+def stage_populate_table(fx):
+    app, window = _window(fx)
+    window.duration = fx.duration
+    # Sin segmentos: la alineación tiene su propia etapa y en la ventana va en segundo plano
+    window.silences = None
+    window.populate_table_with_lyrics(fx.lines)
+    app.processEvents()
+
+
+def stage_preview(fx):
+    app, window = _window(fx)
+    window.media_file = fx.audio
+    window._duration_text = window._clock_text(fx.duration)
+    virtual = [0.0]
+    window.clock.timer = lambda: virtual[0]
+    window.clock.start(0.0)
+    step = fx.duration / PREVIEW_PASSES
+    for k in range(1, PREVIEW_PASSES + 1):
+        virtual[0] = k * step
+        window.clock.report(virtual[0])
+        window.updates._run()
+    window.clock.pause(0.0)
+    window.media_file = None
+
+
+def stage_export(fx):
+    from exporters import FORMATS, export_subtitles
+
+    window = fx.window
+    export_subtitles(fx.output, list(FORMATS), window.cues.texts, window.cues.starts,
+                     window.cues.ends, fx.duration)
+
+
+def stage_import(fx):
+    from subtitle_io import read_subtitles
+
+    read_subtitles(fx.output + ".srt")
+
+
+# Etapas en orden: cada una puede usar lo que dejaron las anteriores. La
+# preparación, si la hay, se ejecuta antes de medir (p. ej. crear la ventana,
+# que cuesta mucho más que llenar la tabla y falsearía la primera repetición)
+STAGES = [
+    ("decode", stage_decode, None),
+    ("analyze_silences", stage_analyze_silences, None),
+    ("rethreshold", stage_rethreshold, None),
+    ("onsets", stage_onsets, None),
+    ("align", stage_align, None),
+    ("peaks", stage_peaks, None),
+    ("populate_table", stage_populate_table, _window),
+    ("preview", stage_preview, _window),
+    ("export", stage_export, None),
+    ("import", stage_import, None),
+]
+
+
+def measure(fn, fx, repeat):
+    """Devuelve (tiempos de cada repetición, pico de memoria en bytes de otra ejecución)."""
+    walls = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(fx)
+        walls.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn(fx)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return walls, peak
+
+
+def _git_state():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def _max_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo da en KB y macOS en bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run(args):
+    os.makedirs(args.workdir, exist_ok=True)
+    lengths, rates = ([30.0], [22050]) if args.quick else (args.lengths, args.rates)
+    commit, dirty = _git_state()
+    record = {
+        "id": datetime.datetime.now().strftime("%Y%m%d-%H%M%S"),
+        "commit": commit,
+        "dirty": dirty,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "config": {"lengths": lengths, "rates": rates, "repeat": args.repeat},
+        "results": {},
+    }
+    print(f"{'pista':>12} {'etapa':>17} {'mediana (s)':>12} {'mínimo (s)':>11} {'pico (MB)':>10}")
+    for duration in lengths:
+        for sr in rates:
+            fx = Fixture(args.workdir, duration, sr)
+            for name, fn, setup in STAGES:
+                if setup is not None:
+                    setup(fx)
+                walls, peak = measure(fn, fx, args.repeat)
+                result = {"wall_s": statistics.median(walls), "wall_min_s": min(walls),
+                          "peak_mb": peak / 1e6}
+                record["results"][f"{fx.name}/{name}"] = result
+                print(f"{fx.name:>12} {name:>17} {result['wall_s']:>12.4f} "
+                      f"{result['wall_min_s']:>11.4f} {result['peak_mb']:>10.1f}")
+            if fx.window is not None:
+                fx.window.close()
+    record["max_rss_mb"] = _max_rss_mb()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+    with open(args.history, "a", encoding="utf-8") as file:
+        file.write(json.dumps(record) + "\n")
+    print(f"Ejecución {record['id']} añadida a {args.history}")
+    if args.compare:
+        history = load_history(args.history)
+        if len(history) > 1:
+            return compare_runs(history[-2], history[-1], args)
+    return 0
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def find_run(history, ref):
+    """Ejecución por posición (-1 es la última) o por el inicio de su identificador."""
+    try:
+        return history[int(ref)]
+    except (ValueError, IndexError):
+        pass
+    for record in history:
+        if record["id"].startswith(ref):
+            return record
+    raise SystemExit(f"No se encuentra la ejecución {ref!r} en el historial")
+
+
+def compare_runs(base, new, args):
+    """Imprime la diferencia por etapa y devuelve 1 si alguna empeora más de lo tolerado."""
+    print(f"Base: {base['id']} ({base.get('commit')})  Nueva: {new['id']} ({new.get('commit')})")
+    if base.get("platform") != new.get("platform") or base.get("cpus") != new.get("cpus"):
+        print("Aviso: las ejecuciones son de máquinas distintas")
+    print(f"{'etapa':>30} {'base (s)':>10} {'nueva (s)':>10} {'Δ tiempo':>9} {'Δ memoria':>10}")
+    regressions = []
+    for key in sorted(set(base["results"]) & set(new["results"])):
+        old, cur = base["results"][key], new["results"][key]
+        # El mínimo es la medida menos ruidosa del tiempo
+        time_change = cur["wall_min_s"] / old["wall_min_s"] - 1 if old["wall_min_s"] else 0.0
+        mem_change = cur["peak_mb"] / old["peak_mb"] - 1 if old["peak_mb"] else 0.0
+        flags = []
+        if time_change > args.tolerance and cur["wall_min_s"] - old["wall_min_s"] > args.min_seconds:
+            flags.append("tiempo")
+        if mem_change > args.tolerance and cur["peak_mb"] - old["peak_mb"] > args.min_mb:
+            flags.append("memoria")
+        mark = f"  REGRESIÓN ({', '.join(flags)})" if flags else ""
+        print(f"{key:>30} {old['wall_min_s']:>10.4f} {cur['wall_min_s']:>10.4f} "
+              f"{time_change:>+9.0%} {mem_change:>+10.0%}{mark}")
+        if flags:
+            regressions.append(key)
+    missing = sorted(set(base["results"]) ^ set(new["results"]))
+    if missing:
+        print(f"Etapas que solo están en una de las ejecuciones: {', '.join(missing)}")
+    if regressions:
+        print(f"ERROR: {len(regressions)} regresiones")
+    return 1 if regressions else 0
+
+
+def compare(args):
+    history = load_history(args.history)
+    if len(history) < 2:
+        raise SystemExit("Hacen falta al menos dos ejecuciones en el historial")
+    return compare_runs(find_run(history, args.base), find_run(history, args.new), args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="archivo JSON Lines del historial")
+    commands = parser.add_subparsers(dest="command")
+
+    run_parser = commands.add_parser("run", help="mide todas las etapas y guarda la ejecución")
+    run_parser.add_argument("--lengths", type=float, nargs="+", default=[60.0, 600.0, 1800.0])
+    run_parser.add_argument("--rates", type=int, nargs="+", default=[22050, 44100])
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--quick", action="store_true", help="una sola pista corta")
+    run_parser.add_argument("--workdir", default=DEFAULT_WORKDIR, help="carpeta de las pistas generadas")
+    run_parser.add_argument("--compare", action="store_true", help="comparar con la ejecución anterior")
+
+    compare_parser = commands.add_parser("compare", help="compara dos ejecuciones del historial")
+    compare_parser.add_argument("base", nargs="?", default="-2")
+    compare_parser.add_argument("new", nargs="?", default="-1")
+
+    for sub in (run_parser, compare_parser):
+        sub.add_argument("--tolerance", type=float, default=0.15,
+                         help="aumento relativo tolerado (por defecto 0.15)")
+        sub.add_argument("--min-seconds", type=float, default=0.005,
+                         help="aumentos de tiempo menores se ignoran")
+        sub.add_argument("--min-mb", type=float, default=1.0,
+                         help="aumentos de memoria menores se ignoran")
+    args = parser.parse_args()
+    if args.command == "compare":
+        return compare(args)
+    if args.command is None:
+        args = parser.parse_args(["run", *sys.argv[1:]])
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Audio sintético determinista para los benchmarks: ráfagas de tono separadas por silencios."""
+import os
+
+import numpy as np
+import soundfile as sf
+
+# Segundos escritos por bloque, para no tener la pista entera en memoria
+BLOCK_SECONDS = 60
+
+
+def tone_burst_cues(duration, seed=0, burst=(0.8, 3.0), gap=(0.4, 1.5)):
+    """Devuelve los pares (inicio, fin) en segundos de las ráfagas de una pista."""
+    rng = np.random.default_rng(seed)
+    cues = []
+    t = gap[1]
+    while True:
+        length = rng.uniform(*burst)
+        if t + length > duration - gap[0]:
+            return cues
+        cues.append((t, t + length))
+        t += length + rng.uniform(*gap)
+
+
+def write_intervals(path, intervals, duration, sr=22050, seed=0, channels=1):
+    """Escribe por bloques una pista con un tono en cada intervalo (inicio, fin).
+
+    Cada intervalo tiene su propia frecuencia y amplitud; fuera de ellos solo
+    hay un ruido de fondo muy bajo. El formato se deduce de la extensión.
+    """
+    starts = np.array([c[0] for c in intervals])
+    ends = np.array([c[1] for c in intervals])
+    rng = np.random.default_rng(seed + 1)
+    freqs = rng.uniform(150.0, 900.0, len(intervals))
+    amps = rng.uniform(0.2, 0.8, len(intervals))
+    subtype = "PCM_16" if str(path).lower().endswith(".wav") else None
+    total = int(duration * sr)
+    block = BLOCK_SECONDS * sr
+    with sf.SoundFile(path, "w", sr, channels, subtype=subtype) as f:
+        for first in range(0, total, block):
+            t = np.arange(first, min(total, first + block)) / sr
+            k = np.searchsorted(starts, t, side="right") - 1
+            kc = np.clip(k, 0, None)
+            inside = (k >= 0) & (t < ends[kc])
+            y = np.where(inside, amps[kc] * np.sin(2 * np.pi * freqs[kc] * t), 0.0)
+            y += rng.normal(0.0, 1e-4, len(t))
+            y = y.astype(np.float32)
+            f.write(np.repeat(y[:, None], channels, axis=1) if channels > 1 else y)
+
+
+def write_tone_bursts(path, duration, sr=22050, seed=0, channels=1):
+    """Escribe una pista de ráfagas y devuelve sus intervalos (la referencia exacta)."""
+    cues = tone_burst_cues(duration, seed)
+    write_intervals(path, cues, duration, sr, seed, channels)
+    return cues
+
+
+def lyric_fixture(cues, seed=0, chars_per_second=15.0, breath_prob=0.15, join_prob=0.15):
+    """Genera letras para unas ráfagas y los intervalos que realmente suenan.
+
+    La longitud de cada línea es proporcional a la duración de su ráfaga (con
+    un ±15 % de ruido). Algunas ráfagas se cortan con una pausa breve
+    (respiración: más segmentos que líneas) y algunas se unen a la siguiente
+    rellenando el silencio (menos segmentos que líneas). Devuelve
+    (líneas, intervalos audibles); los inicios de cues siguen siendo la referencia.
+    """
+    rng = np.random.default_rng(seed + 2)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    lines = []
+    for start, end in cues:
+        length = max(3, int((end - start) * chars_per_second * rng.uniform(0.85, 1.15)))
+        text = "".join(rng.choice(letters, length))
+        lines.append(" ".join(text[i:i + 6] for i in range(0, length, 6)))
+    voiced = []
+    for i, (start, end) in enumerate(cues):
+        if voiced and voiced[-1][1] == start:
+            start = voiced.pop()[0]
+        if end - start > 1.2 and rng.random() < breath_prob:
+            middle = start + (end - start) * rng.uniform(0.4, 0.6)
+            voiced.append((start, middle - 0.15))
+            voiced.append((middle + 0.15, end))
+        else:
+            voiced.append((start, end))
+        if i + 1 < len(cues) and rng.random() < join_prob:
+            # Sin silencio hasta la siguiente línea
+            voiced[-1] = (voiced[-1][0], cues[i + 1][0])
+    return lines, voiced
+
+
+def write_fixture(workdir, duration, sr=22050, seed=0):
+    """Escribe (o reutiliza) una pista de ráfagas con su archivo de letras.
+
+    Los nombres dependen de duración, frecuencia y semilla, así que un mismo
+    directorio sirve a varias ejecuciones sin volver a generar nada.
+    Devuelve (ruta del audio, ruta de las letras, inicios reales).
+    """
+    cues = tone_burst_cues(duration, seed)
+    lines, voiced = lyric_fixture(cues, seed)
+    name = os.path.join(workdir, f"fixture_{int(duration)}s_{sr}hz_{seed}")
+    audio_path, lyrics_path = name + ".wav", name + ".txt"
+    if not os.path.exists(audio_path):
+        write_intervals(audio_path + ".tmp.wav", voiced, duration, sr, seed)
+        os.replace(audio_path + ".tmp.wav", audio_path)
+    if not os.path.exists(lyrics_path):
+        with open(lyrics_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+    return audio_path, lyrics_path, [start for start, _ in cues]
@@ -0,0 +1,150 @@
+"""Modelo Qt que expone un CueStore a la tabla de la interfaz."""
+import numpy as np
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+
+from cues import CueStore, parse_time
+from profiling import profiler
+from retiming import TimingDelta, TimingHistory
+
+TEXT_COLUMN = 0
+TIME_COLUMN = 1
+
+
+class CueTableModel(QAbstractTableModel):
+    """Vista de tabla sobre un CueStore: las celdas se generan al pintarse.
+
+    Las cargas masivas emiten un único reinicio del modelo en lugar de crear
+    un QTableWidgetItem por celda. Los cambios de tiempos hechos por el
+    usuario (edición de celdas, marcas y operaciones en bloque) se guardan en
+    history para deshacerlos; los tiempos sugeridos automáticamente no.
+
+    La tabla no muestra los fines: al cambiar el inicio de una fila que
+    tiene fin (p. ej. importada de un SRT) el fin se desplaza lo mismo, para
+    conservar la duración del subtítulo en lugar de dejarlo vacío o al revés.
+    """
+
+    HEADERS = ["Letra", "Tiempo"]
+
+    # Se emite al cambiar lo que se puede deshacer o rehacer
+    historyChanged = pyqtSignal()
+
+    def __init__(self, store=None, parent=None):
+        super().__init__(parent)
+        self.store = store if store is not None else CueStore()
+        self.history = TimingHistory()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        row = index.row()
+        if index.column() == TEXT_COLUMN:
+            return self.store.texts[row]
+        start = self.store.starts[row]
+        return "" if np.isnan(start) else f"{start:.3f}"
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return super().flags(index) | Qt.ItemFlag.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        if index.column() == TEXT_COLUMN:
+            self.store.set_text(index.row(), str(value))
+        else:
+            # Una celda vacía o "nan" deja la fila sin tiempo; negativos e infinitos no son tiempos
+            start = np.nan if str(value).strip() == "" else parse_time(value)
+            if start is None or start < 0 or np.isinf(start):
+                return False
+            row = index.row()
+            rows = slice(row, row + 1)
+            old_starts = self.store.starts[rows].copy()
+            old_ends = self.store.ends[rows].copy()
+            self.store.set_start(row, start)
+            new_starts = self.store.starts[rows].copy()
+            if np.isnan(old_ends[0]):
+                old_ends = new_ends = None
+            else:
+                new_ends = old_ends + (new_starts - old_starts)
+                self.store.set_end(row, new_ends[0])
+            self.history.push(TimingDelta("Editar tiempo", rows, old_starts, new_starts,
+                                          old_ends, new_ends))
+            self.historyChanged.emit()
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def load(self, texts, starts, ends=None):
+        """Carga masiva con un único reinicio del modelo."""
+        with profiler.span("table.load", rows=len(texts)):
+            self.beginResetModel()
+            self.store.set_cues(texts, starts, ends)
+            self.history.clear()
+            self.endResetModel()
+        self.historyChanged.emit()
+
+    def set_start(self, row, start):
+        self.setData(self.index(row, TIME_COLUMN), start)
+
+    def set_starts(self, rows, starts):
+        """Cambia varios inicios y notifica un único rango a la vista."""
+        rows = np.asarray(rows, dtype=np.intp)
+        if not len(rows):
+            return
+        self.store.set_starts(rows, starts)
+        self.dataChanged.emit(self.index(int(rows.min()), TIME_COLUMN),
+                              self.index(int(rows.max()), TIME_COLUMN))
+
+    def _emit_rows(self, rows):
+        if isinstance(rows, slice):
+            first, last = rows.start, rows.stop - 1
+        else:
+            first, last = int(rows.min()), int(rows.max())
+        self.dataChanged.emit(self.index(first, TIME_COLUMN), self.index(last, TIME_COLUMN))
+
+    def apply_times(self, label, starts, ends=None):
+        """Sustituye los tiempos por los arrays completos dados como un solo paso deshacible.
+
+        Solo se escriben y notifican las filas que cambian. Devuelve False si
+        no cambió ninguna.
+        """
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = None if ends is None else np.asarray(ends, dtype=np.float64)
+        delta = self.history.record(label, self.store.starts, starts, self.store.ends, ends)
+        if delta is None:
+            return False
+        self.store.set_times(delta.rows, delta.new_starts, delta.new_ends)
+        self._emit_rows(delta.rows)
+        self.historyChanged.emit()
+        return True
+
+    def undo(self):
+        """Deshace el último cambio de tiempos; devuelve su descripción o None."""
+        delta = self.history.undo()
+        if delta is None:
+            return None
+        self.store.set_times(delta.rows, delta.old_starts, delta.old_ends)
+        self._emit_rows(delta.rows)
+        self.historyChanged.emit()
+        return delta.label
+
+    def redo(self):
+        """Rehace el último cambio deshecho; devuelve su descripción o None."""
+        delta = self.history.redo()
+        if delta is None:
+            return None
+        self.store.set_times(delta.rows, delta.new_starts, delta.new_ends)
+        self._emit_rows(delta.rows)
+        self.historyChanged.emit()
+        return delta.label
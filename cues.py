@@ -0,0 +1,124 @@
+"""Estructuras de datos de los subtítulos, independientes de la interfaz."""
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+
+def parse_time(text):
+    """Convierte el texto de una celda de tiempo a segundos, o None si no es válido."""
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return None
+
+
+class CueIndex:
+    """Índice ordenado de tiempos de inicio para encontrar la línea activa con bisect.
+
+    Guarda en paralelo los inicios ordenados y la fila de cada uno. Ante empates
+    gana la fila más baja, igual que el recorrido lineal de la tabla.
+    """
+
+    def __init__(self):
+        self.starts = []
+        self.rows = []
+        self._row_start = {}
+
+    def __len__(self):
+        return len(self.starts)
+
+    def rebuild(self, times):
+        """Reconstruye el índice a partir de un iterable de (fila, inicio o None)."""
+        pairs = sorted((start, row) for row, start in times if start is not None)
+        self.starts = [start for start, _ in pairs]
+        self.rows = [row for _, row in pairs]
+        self._row_start = {row: start for start, row in pairs}
+
+    def update(self, row, start):
+        """Actualiza el inicio de una fila (None la retira del índice)."""
+        old = self._row_start.pop(row, None)
+        if old is not None:
+            i = bisect_left(self.starts, old)
+            while self.rows[i] != row:
+                i += 1
+            del self.starts[i]
+            del self.rows[i]
+        if start is not None:
+            i = bisect_left(self.starts, start)
+            while i < len(self.starts) and self.starts[i] == start and self.rows[i] < row:
+                i += 1
+            self.starts.insert(i, start)
+            self.rows.insert(i, row)
+            self._row_start[row] = start
+
+    def active_row(self, current_time):
+        """Fila con el mayor inicio <= current_time, o None si aún no empezó ninguna."""
+        i = bisect_right(self.starts, current_time) - 1
+        if i < 0:
+            return None
+        return self.rows[bisect_left(self.starts, self.starts[i])]
+
+    def rebuild_array(self, starts):
+        """Reconstruye el índice desde un array de inicios (NaN = sin tiempo)."""
+        starts = np.asarray(starts, dtype=np.float64)
+        order = np.argsort(starts, kind="stable")
+        order = order[~np.isnan(starts[order])]
+        self.starts = starts[order].tolist()
+        self.rows = order.tolist()
+        self._row_start = dict(zip(self.rows, self.starts))
+
+
+class CueStore:
+    """Subtítulos guardados en arrays paralelos en lugar de una celda por objeto.
+
+    starts y ends son arrays float64 (NaN = sin tiempo; un fin NaN significa
+    que la línea dura hasta el inicio de la siguiente) y texts una lista de
+    cadenas. El índice de inicios se mantiene sincronizado en cada cambio.
+    """
+
+    def __init__(self):
+        self.starts = np.empty(0, dtype=np.float64)
+        self.ends = np.empty(0, dtype=np.float64)
+        self.texts = []
+        self.index = CueIndex()
+
+    def __len__(self):
+        return len(self.texts)
+
+    def set_cues(self, texts, starts, ends=None):
+        """Sustituye todos los subtítulos de una vez."""
+        self.texts = list(texts)
+        self.starts = np.array(starts, dtype=np.float64)
+        if ends is None:
+            self.ends = np.full(len(self.texts), np.nan)
+        else:
+            self.ends = np.array(ends, dtype=np.float64)
+        self.index.rebuild_array(self.starts)
+
+    def set_start(self, row, start):
+        """Cambia el inicio de una fila (None o NaN lo deja sin tiempo)."""
+        start = np.nan if start is None else float(start)
+        self.starts[row] = start
+        self.index.update(row, None if np.isnan(start) else start)
+
+    def set_end(self, row, end):
+        """Cambia el fin de una fila (None o NaN: hasta el inicio de la siguiente)."""
+        self.ends[row] = np.nan if end is None else float(end)
+
+    def set_starts(self, rows, starts):
+        """Cambia varios inicios a la vez y reconstruye el índice una sola vez."""
+        self.starts[rows] = starts
+        self.index.rebuild_array(self.starts)
+
+    def set_times(self, rows, starts, ends=None):
+        """Cambia inicios y, si se indican, fines de varias filas con una sola reconstrucción del índice."""
+        self.starts[rows] = starts
+        if ends is not None:
+            self.ends[rows] = ends
+        self.index.rebuild_array(self.starts)
+
+    def set_text(self, row, text):
+        self.texts[row] = text
+
+    def active_row(self, current_time):
+        return self.index.active_row(current_time)
@@ -0,0 +1,172 @@
+"""Exportación de subtítulos a SRT, WebVTT, ASS y LRC con una sola canalización.
+
+Cada formato es un generador que recibe los subtítulos ya validados y
+ordenados (ver subtitle_io.cue_intervals) y produce el archivo en trozos de
+EXPORT_BATCH subtítulos: los tiempos de cada trozo se descomponen a la vez
+con numpy y el texto se une con un solo join, así que el archivo se escribe
+en una pasada con pocas llamadas a write sea cual sea su tamaño.
+
+Este módulo no importa PyQt.
+"""
+import os
+
+import numpy as np
+
+from profiling import profiler, traced
+from subtitle_io import cue_intervals
+
+# Subtítulos por trozo escrito
+EXPORT_BATCH = 4096
+# Búfer del archivo de salida
+WRITE_BUFFER = 1 << 20
+# Estilo usado si no se indica ninguno
+DEFAULT_STYLE = {"font": "Arial", "size": 12, "color": "#ffffff"}
+
+
+def _digits(fields, separators):
+    """Cadenas con los campos enteros en cifras fijas, construidas byte a byte con numpy.
+
+    fields es una lista de (array de enteros, cifras mínimas) y separators los
+    caracteres entre campos consecutivos. Un campo con valores más largos usa
+    las cifras necesarias en todas las filas.
+    """
+    count = len(fields[0][0])
+    if not count:
+        return []
+    columns = []
+    for k, (values, width) in enumerate(fields):
+        width = max(width, len(str(int(values.max()))))
+        for power in range(width - 1, -1, -1):
+            columns.append(values // 10 ** power % 10 + ord("0"))
+        if k < len(separators):
+            columns.append(np.full(count, ord(separators[k])))
+    chars = np.column_stack(columns).astype(np.uint8)
+    return chars.view(f"S{chars.shape[1]}").ravel().astype(str).tolist()
+
+
+def _clock(seconds, separator=",", scale=1000, hour_digits=2):
+    """Marcas "HH:MM:SS,mmm" (o con la fracción en 1/scale) de todos los tiempos a la vez."""
+    units = np.rint(np.asarray(seconds, dtype=np.float64) * scale).astype(np.int64)
+    hours, rem = np.divmod(units, 3600 * scale)
+    minutes, rem = np.divmod(rem, 60 * scale)
+    secs, frac = np.divmod(rem, scale)
+    return _digits([(hours, hour_digits), (minutes, 2), (secs, 2), (frac, len(str(scale)) - 1)],
+                   [":", ":", separator])
+
+
+def _batches(starts, ends, texts):
+    for first in range(0, len(texts), EXPORT_BATCH):
+        last = first + EXPORT_BATCH
+        yield first, starts[first:last], ends[first:last], texts[first:last]
+
+
+def _srt(starts, ends, texts, style):
+    """SRT estricto: sin cabeceras, que muchos lectores no admiten."""
+    for first, s, e, t in _batches(starts, ends, texts):
+        yield "".join([f"{i}\n{start} --> {end}\n{text}\n\n"
+                       for i, start, end, text in zip(range(first + 1, first + len(t) + 1),
+                                                      _clock(s), _clock(e), t)])
+
+
+def _vtt(starts, ends, texts, style):
+    yield ("WEBVTT\n\n"
+           "STYLE\n"
+           "::cue {\n"
+           f"  font-family: \"{style['font']}\";\n"
+           f"  font-size: {style['size']}pt;\n"
+           f"  color: {style['color']};\n"
+           "}\n\n")
+    for first, s, e, t in _batches(starts, ends, texts):
+        # "-->" no puede aparecer en el texto de un subtítulo WebVTT
+        lines = [text.replace("-->", "--&gt;") for text in t]
+        yield "".join([f"{start} --> {end}\n{text}\n\n"
+                       for start, end, text in zip(_clock(s, "."), _clock(e, "."), lines)])
+
+
+def _ass_color(color):
+    """"#rrggbb" a "&H00BBGGRR" (ASS guarda los colores en orden azul, verde, rojo)."""
+    value = color.lstrip("#")
+    if len(value) != 6:
+        value = DEFAULT_STYLE["color"].lstrip("#")
+    return f"&H00{value[4:6]}{value[2:4]}{value[0:2]}".upper()
+
+
+def _ass(starts, ends, texts, style):
+    yield ("[Script Info]\n"
+           "ScriptType: v4.00+\n"
+           "PlayResX: 384\n"
+           "PlayResY: 288\n"
+           "WrapStyle: 0\n"
+           "ScaledBorderAndShadow: yes\n\n"
+           "[V4+ Styles]\n"
+           "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, "
+           "BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, "
+           "BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n"
+           f"Style: Default,{style['font']},{style['size']},{_ass_color(style['color'])},"
+           "&H000000FF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,2,0,2,10,10,10,1\n\n"
+           "[Events]\n"
+           "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n")
+    for first, s, e, t in _batches(starts, ends, texts):
+        # ASS usa centésimas de segundo, una sola cifra para las horas y \N como salto
+        lines = [text.replace("\n", "\\N") for text in t]
+        yield "".join([f"Dialogue: 0,{start},{end},Default,,0,0,0,,{text}\n"
+                       for start, end, text in zip(_clock(s, ".", 100, 1), _clock(e, ".", 100, 1), lines)])
+
+
+def _lrc_stamps(seconds):
+    """Marcas mm:ss.xx de LRC; los minutos no se convierten en horas."""
+    units = np.rint(np.asarray(seconds, dtype=np.float64) * 100).astype(np.int64)
+    return _digits([(units // 6000, 2), (units // 100 % 60, 2), (units % 100, 2)], [":", "."])
+
+
+def _lrc(starts, ends, texts, style):
+    """LRC: solo inicios; una marca vacía borra el texto si hay silencio antes del siguiente."""
+    yield "[re:SRTGen]\n"
+    for first, s, e, t in _batches(starts, ends, texts):
+        following = starts[first + 1:first + 1 + len(s)]
+        # Tras el último subtítulo del archivo siempre se borra
+        clear = np.ones(len(s), dtype=bool)
+        clear[:len(following)] = following - e[:len(following)] > 0.01
+        parts = []
+        lines = [text.replace("\n", " ") for text in t]
+        for start, end, text, gap in zip(_lrc_stamps(s), _lrc_stamps(e), lines, clear.tolist()):
+            parts.append(f"[{start}]{text}\n")
+            if gap:
+                parts.append(f"[{end}]\n")
+        yield "".join(parts)
+
+
+# Formato: (extensión, generador, descripción)
+FORMATS = {
+    "srt": (".srt", _srt, "SubRip"),
+    "vtt": (".vtt", _vtt, "WebVTT"),
+    "ass": (".ass", _ass, "Advanced SubStation Alpha"),
+    "lrc": (".lrc", _lrc, "Letras LRC"),
+}
+
+
+def write_subtitles(output_file, fmt, starts, ends, texts, style=None):
+    """Escribe subtítulos ya validados y ordenados en uno de los FORMATS."""
+    generate = FORMATS[fmt][1]
+    style = {**DEFAULT_STYLE, **(style or {})}
+    with profiler.span(f"export.{fmt}", cues=len(texts)), \
+            open(output_file, "w", encoding="utf-8", newline="\n", buffering=WRITE_BUFFER) as file:
+        for chunk in generate(starts, ends, texts, style):
+            file.write(chunk)
+
+
+@traced("export")
+def export_subtitles(output_path, formats, texts, starts, ends, duration, style=None):
+    """Valida los subtítulos una sola vez y escribe un archivo por formato.
+
+    Cada archivo se llama como output_path con la extensión de su formato.
+    Lanza ValueError como cue_intervals. Devuelve las rutas escritas.
+    """
+    starts, ends, lines = cue_intervals(texts, starts, ends, duration)
+    base = os.path.splitext(output_path)[0]
+    paths = []
+    for fmt in formats:
+        path = base + FORMATS[fmt][0]
+        write_subtitles(path, fmt, starts, ends, lines, style)
+        paths.append(path)
+    return paths
@@ -0,0 +1,100 @@
+"""Decodificación de grabaciones largas en varios procesos.
+
+Decodificar (MP3, OGG, FLAC) y remuestrear es lo que cuesta en una grabación
+larga; la potencia por trama, en serie, es una fracción pequeña. Por eso cada
+proceso del pool abre el archivo, salta a su tramo y lo decodifica, mezcla a
+mono y remuestrea, y el proceso principal recibe los tramos en orden y calcula
+la envolvente (y, con tap, los picos) como si los hubiera leído por bloques.
+
+Cada tramo empieza y acaba en una muestra de origen que cae exactamente en
+una muestra de destino, y se remuestrea con un margen de MARGIN_SECONDS a cada
+lado que luego se descarta, así que las fronteras no dejan huella: sin
+remuestreo las muestras son idénticas a las de iter_mono_blocks y con
+remuestreo difieren en el orden de 1e-7. Solo hay en memoria unos pocos tramos
+a la vez, de modo que la memoria sigue acotada sea cual sea la duración.
+"""
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from math import gcd
+
+import numpy as np
+
+from audio_analysis import DEFAULT_SR, STREAM_BLOCK_SIZE, iter_mono_blocks
+
+# Segundos de audio (de origen) que decodifica cada proceso por tarea
+CHUNK_SECONDS = 60
+# Margen a cada lado del tramo para que el remuestreo no note la frontera
+MARGIN_SECONDS = 0.1
+# Tramos pendientes por proceso (limita la memoria de los ya decodificados)
+CHUNKS_PER_WORKER = 2
+
+
+def _aligned(seconds, samplerate, step):
+    """Número de muestras de origen de unos segundos, redondeado a múltiplo de step."""
+    return max(step, int(seconds * samplerate) // step * step)
+
+
+def _decode_chunk(file_path, sr, first, last, margin):
+    """Muestras mono a sr correspondientes a las muestras de origen [first, last)."""
+    import soundfile as sf
+    import soxr
+
+    info = sf.info(file_path)
+    if sr == info.samplerate:
+        blocks = sf.blocks(file_path, blocksize=STREAM_BLOCK_SIZE, start=first, stop=last,
+                           dtype="float32", always_2d=True)
+        return np.concatenate([block.mean(axis=1, dtype=np.float32) if block.shape[1] > 1 else block[:, 0]
+                               for block in blocks] or [np.empty(0, dtype=np.float32)])
+    lead = min(margin, first)
+    stop = min(last + margin, info.frames)
+    resampler = soxr.ResampleStream(info.samplerate, sr, 1, dtype="float32", quality="HQ")
+    out = []
+    read = first - lead
+    for block in sf.blocks(file_path, blocksize=STREAM_BLOCK_SIZE, start=first - lead, stop=stop,
+                           dtype="float32", always_2d=True):
+        mono = block.mean(axis=1, dtype=np.float32) if block.shape[1] > 1 else block[:, 0]
+        read += len(block)
+        out.append(resampler.resample_chunk(mono, last=read >= stop))
+    if read < stop or not out:
+        out.append(resampler.resample_chunk(np.empty(0, dtype=np.float32), last=True))
+    y = np.concatenate(out)
+    # lead y first son múltiplos exactos del paso de origen: la conversión es entera
+    skip = lead * sr // info.samplerate
+    if last >= info.frames:
+        return y[skip:]
+    return y[skip:skip + (last - first) * sr // info.samplerate]
+
+
+def iter_parallel_blocks(file_path, sr=DEFAULT_SR, workers=2, progress=None):
+    """Como iter_mono_blocks, pero decodificando tramos del archivo en varios procesos.
+
+    Los formatos que libsndfile no lee (y necesitan pydub) se leen en serie.
+    """
+    import soundfile as sf
+
+    try:
+        info = sf.info(file_path)
+    except RuntimeError:
+        yield from iter_mono_blocks(file_path, sr, progress=progress)
+        return
+    sr = sr or info.samplerate
+    # Paso de origen que corresponde a un número entero de muestras de destino
+    step = info.samplerate // gcd(info.samplerate, sr)
+    size = _aligned(CHUNK_SECONDS, info.samplerate, step)
+    margin = _aligned(MARGIN_SECONDS, info.samplerate, step)
+    bounds = [(first, min(first + size, info.frames)) for first in range(0, info.frames, size)]
+    # "spawn" evita hacer fork de un proceso con hilos (la interfaz Qt)
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        pending = deque()
+        queued = 0
+        for done in range(1, len(bounds) + 1):
+            while queued < len(bounds) and len(pending) < workers * CHUNKS_PER_WORKER:
+                pending.append(pool.submit(_decode_chunk, file_path, sr, *bounds[queued], margin))
+                queued += 1
+            yield pending.popleft().result()
+            if progress is not None:
+                progress(done / len(bounds))
+    finally:
+        pool.shutdown(cancel_futures=True)
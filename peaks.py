@@ -0,0 +1,206 @@
+"""Pirámide de picos (mínimo, máximo) para dibujar la forma de onda a cualquier zoom."""
+import hashlib
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+from audio_analysis import DEFAULT_SR, audio_cache, iter_mono_blocks
+from profiling import traced
+
+# Muestras por pico en el nivel más fino y reducción entre niveles
+PEAK_BLOCK = 256
+PEAK_FACTOR = 4
+# El nivel más grueso tiene como mucho este número de picos
+MIN_LEVEL_SIZE = 1024
+# Versión del formato guardado en disco
+_CACHE_VERSION = 1
+
+
+class PeakPyramid:
+    """Niveles de picos: en el nivel k cada pico resume block * factor**k muestras."""
+
+    def __init__(self, levels, sr, block=PEAK_BLOCK, factor=PEAK_FACTOR, signal=None):
+        self.levels = levels  # lista de (mínimos, máximos) float32
+        self.sr = sr
+        self.block = block
+        self.factor = factor
+        # Señal completa, si está en memoria, para zooms más finos que el nivel 0
+        self.signal = signal
+
+    def samples_per_peak(self, level):
+        return self.block * self.factor ** level
+
+    def level_for(self, samples_per_pixel):
+        """Nivel más grueso cuyos picos siguen siendo más finos que un píxel."""
+        level = 0
+        while (level + 1 < len(self.levels)
+               and self.samples_per_peak(level + 1) <= samples_per_pixel):
+            level += 1
+        return level
+
+    def columns(self, start, end, width):
+        """Mínimos y máximos por columna de píxel para el intervalo [start, end) en segundos.
+
+        Solo se tocan los picos del nivel adecuado que caen en el intervalo,
+        del orden de width valores, sea cual sea la duración de la pista.
+        """
+        if width <= 0 or end <= start:
+            return np.zeros(0, np.float32), np.zeros(0, np.float32)
+        samples_per_pixel = (end - start) * self.sr / width
+        # Varios picos por columna para que los bordes de columna no se desplacen un pico entero
+        if self.signal is not None and samples_per_pixel < self.block * self.factor:
+            mins = maxs = self.signal
+            per_peak = 1
+        else:
+            level = self.level_for(samples_per_pixel / self.factor)
+            mins, maxs = self.levels[level]
+            per_peak = self.samples_per_peak(level)
+        # Límites de cada columna en índices de pico
+        edges = ((start + (end - start) * np.arange(width + 1) / width) * self.sr / per_peak).astype(np.int64)
+        edges = np.clip(edges, 0, len(mins))
+        valid = edges[:-1] < len(mins)
+        col_min = np.zeros(width, np.float32)
+        col_max = np.zeros(width, np.float32)
+        if valid.any():
+            starts = edges[:-1][valid]
+            # Con inicios repetidos (más columnas que picos) reduceat devuelve el pico
+            # que cubre la columna
+            col_min[valid] = np.minimum.reduceat(mins, starts)
+            col_max[valid] = np.maximum.reduceat(maxs, starts)
+            # La última columna llega hasta su propio fin, no hasta el final del array
+            last = int(np.flatnonzero(valid)[-1])
+            stop = max(int(edges[last + 1]), int(starts[-1]) + 1)
+            col_min[last] = mins[starts[-1]:stop].min()
+            col_max[last] = maxs[starts[-1]:stop].max()
+        return col_min, col_max
+
+    def save(self, path, key):
+        """Guarda la pirámide de forma atómica: un archivo temporal que luego sustituye a path."""
+        arrays = {"key": np.array(key), "meta": np.array([self.sr, self.block, self.factor])}
+        for i, (mins, maxs) in enumerate(self.levels):
+            arrays[f"min{i}"] = mins
+            arrays[f"max{i}"] = maxs
+        fd, temp_path = tempfile.mkstemp(prefix=".peaks-", suffix=".tmp", dir=os.path.dirname(path) or ".")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                np.savez(file, **arrays)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path, key):
+        """Carga la pirámide si existe y corresponde a key; si no, devuelve None.
+
+        Un archivo dañado (p. ej. una escritura interrumpida) cuenta como ausente.
+        """
+        try:
+            with np.load(path) as data:
+                if data["key"].tolist() != list(key):
+                    return None
+                sr, block, factor = (int(v) for v in data["meta"])
+                count = sum(1 for name in data.files if name.startswith("min"))
+                levels = [(data[f"min{i}"], data[f"max{i}"]) for i in range(count)]
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+            return None
+        return cls(levels, sr, block, factor)
+
+
+def _reduce(mins, maxs, factor):
+    """Agrupa los picos de factor en factor (el último grupo puede ser incompleto)."""
+    starts = np.arange(0, len(mins), factor)
+    return np.minimum.reduceat(mins, starts), np.maximum.reduceat(maxs, starts)
+
+
+class PeakBuilder:
+    """Calcula la pirámide a medida que llegan bloques de señal mono consecutivos.
+
+    add() se puede pasar como tap a energy_envelope para que los picos salgan
+    de la misma lectura del archivo que la envolvente.
+    """
+
+    def __init__(self, sr=DEFAULT_SR, block=PEAK_BLOCK, factor=PEAK_FACTOR):
+        self.sr = sr
+        self.block = block
+        self.factor = factor
+        self.samples = 0
+        self._mins, self._maxs = [], []
+        self._carry = np.empty(0, dtype=np.float32)
+
+    def add(self, chunk):
+        self.samples += len(chunk)
+        chunk = np.concatenate((self._carry, chunk)) if len(self._carry) else chunk
+        whole = len(chunk) // self.block * self.block
+        if whole:
+            frames = chunk[:whole].reshape(-1, self.block)
+            self._mins.append(frames.min(axis=1))
+            self._maxs.append(frames.max(axis=1))
+        self._carry = chunk[whole:]
+
+    def build(self):
+        mins, maxs = list(self._mins), list(self._maxs)
+        if len(self._carry):
+            mins.append(self._carry.min(keepdims=True))
+            maxs.append(self._carry.max(keepdims=True))
+        level = (np.concatenate(mins).astype(np.float32) if mins else np.zeros(1, np.float32),
+                 np.concatenate(maxs).astype(np.float32) if maxs else np.zeros(1, np.float32))
+        levels = [level]
+        while len(levels[-1][0]) > MIN_LEVEL_SIZE:
+            levels.append(_reduce(*levels[-1], self.factor))
+        return PeakPyramid(levels, self.sr, self.block, self.factor)
+
+
+def build_peak_pyramid(blocks, sr=DEFAULT_SR, block=PEAK_BLOCK, factor=PEAK_FACTOR):
+    """Construye la pirámide a partir de bloques de señal mono consecutivos."""
+    builder = PeakBuilder(sr, block, factor)
+    for chunk in blocks:
+        builder.add(chunk)
+    return builder.build()
+
+
+def _cache_paths(file_path):
+    """Ruta junto al audio y, si no se puede escribir allí, otra en la caché del usuario."""
+    yield file_path + ".peaks.npz"
+    digest = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:16]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    yield os.path.join(base, "srtgen", f"{digest}.peaks.npz")
+
+
+@traced("peaks")
+def load_peak_pyramid(file_path, sr=DEFAULT_SR, cache=audio_cache, progress=None, builder=None):
+    """Devuelve la pirámide del archivo, usando la guardada en disco si sigue vigente.
+
+    Si hay que calcularla se usa builder cuando ya recibió la señal entera
+    (como tap de energy_envelope), si no la señal de la caché de audio y,
+    como último recurso, se lee el archivo por bloques. El resultado se
+    guarda junto al audio (o en ~/.cache/srtgen si esa carpeta es de solo
+    lectura).
+    """
+    stat = os.stat(file_path)
+    key = [_CACHE_VERSION, stat.st_size, stat.st_mtime_ns, sr, PEAK_BLOCK, PEAK_FACTOR]
+    paths = list(_cache_paths(file_path))
+    entry = cache.peek(file_path, sr)
+    for path in paths:
+        pyramid = PeakPyramid.load(path, key)
+        if pyramid is not None:
+            pyramid.signal = entry[0] if entry is not None else None
+            return pyramid
+
+    if builder is not None and builder.samples and builder.sr == sr:
+        pyramid = builder.build()
+    else:
+        blocks = [entry[0]] if entry is not None else iter_mono_blocks(file_path, sr, progress=progress)
+        pyramid = build_peak_pyramid(blocks, sr)
+    if entry is not None:
+        pyramid.signal = entry[0]
+    for path in paths:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            pyramid.save(path, key)
+            break
+        except OSError:
+            continue
+    return pyramid
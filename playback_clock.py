@@ -0,0 +1,92 @@
+"""Reloj de reproducción de alta resolución, independiente de la interfaz.
+
+QMediaPlayer.position() se actualiza a saltos (cada 10-100 ms según el
+backend) y con retrasos irregulares. PlaybackClock extrapola la posición con
+un temporizador monótono desde el último informe del reproductor, corrige
+poco a poco la deriva frente a los informes nuevos y resta la latencia de
+salida, para que lo que devuelve now() sea lo que se está oyendo.
+"""
+import time
+
+# Diferencia (s) a partir de la cual un informe se toma como salto y no como deriva
+RESYNC_THRESHOLD = 0.25
+# Fracción del error corregida en cada informe del reproductor
+DRIFT_GAIN = 0.2
+
+
+class PlaybackClock:
+    """Posición de reproducción interpolada entre los informes del reproductor.
+
+    report() recibe cada posición del backend; start(), pause() y seek()
+    marcan los cambios de estado. Tras start() o seek() el reloj no avanza
+    hasta que el reproductor informa de una posición nueva, porque el audio
+    tarda en arrancar. now() nunca retrocede durante la reproducción salvo
+    tras un seek o un salto mayor que RESYNC_THRESHOLD.
+    timer permite sustituir el reloj monótono (p. ej. en las mediciones).
+    """
+
+    def __init__(self, latency=0.0, rate=1.0, timer=time.perf_counter):
+        self.latency = latency
+        self.rate = rate
+        self.timer = timer
+        self.playing = False
+        self._waiting = False  # reproduciendo pero sin informes nuevos desde start/seek
+        self._anchor_position = 0.0  # posición estimada en _anchor_time
+        self._anchor_time = timer()
+        self._last_report = None
+        self._last_output = 0.0
+
+    def _estimate(self, now):
+        if not self.playing or self._waiting:
+            return self._anchor_position
+        return self._anchor_position + (now - self._anchor_time) * self.rate
+
+    def _reset(self, position):
+        self._waiting = self.playing
+        self._anchor_position = position
+        self._anchor_time = self.timer()
+        self._last_report = position
+        self._last_output = max(0.0, position - self.latency) if self.playing else position
+
+    def start(self, position):
+        self.playing = True
+        self._reset(position)
+
+    def pause(self, position):
+        self.playing = False
+        self._reset(position)
+
+    def seek(self, position):
+        self._reset(position)
+
+    def report(self, position):
+        """Incorpora una posición (segundos) informada por el reproductor."""
+        if not self.playing:
+            self._reset(position)
+            return
+        if position == self._last_report:
+            # El backend aún no ha avanzado: el informe no aporta nada nuevo
+            return
+        self._last_report = position
+        now = self.timer()
+        error = position - self._estimate(now)
+        if self._waiting:
+            self._waiting = False
+            self._anchor_position = position
+        elif abs(error) > RESYNC_THRESHOLD:
+            self._anchor_position = position
+            self._last_output = max(0.0, position - self.latency)
+        else:
+            self._anchor_position = self._estimate(now) + error * DRIFT_GAIN
+        self._anchor_time = now
+
+    def now(self):
+        """Posición que se está oyendo, en segundos."""
+        if not self.playing:
+            return self._last_output
+        position = max(0.0, self._estimate(self.timer()) - self.latency)
+        # Las correcciones de deriva no deben hacer retroceder la posición
+        if position < self._last_output:
+            return self._last_output
+        self._last_output = position
+        return position
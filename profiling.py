@@ -0,0 +1,209 @@
+"""Medición de tiempos por etapas y contadores, desactivada por defecto.
+
+Las etapas se marcan con `with profiler.span("nombre"):` o con el decorador
+@traced("nombre"), y los sucesos con profiler.count("nombre"). Mientras el
+perfilado está desactivado span() devuelve siempre el mismo contexto vacío,
+así que el coste es una comprobación de un atributo.
+
+Se activa con --profile[=ruta] en la línea de órdenes o con la variable de
+entorno SRTGEN_PROFILE (una ruta, o 1 para la ruta por defecto). Al salir se
+escribe la línea de tiempo en formato Chrome trace (chrome://tracing o
+https://ui.perfetto.dev) y se imprime un resumen por etapa en stderr. Nunca
+se sobrescribe un archivo que no sea una línea de tiempo anterior.
+
+Este módulo no importa PyQt.
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+
+# Variable de entorno que activa el perfilado
+PROFILE_ENV = "SRTGEN_PROFILE"
+# Archivo de la línea de tiempo si no se indica otro
+DEFAULT_TRACE = "srtgen-trace.json"
+# Sucesos guardados como máximo; los más antiguos se descartan
+MAX_EVENTS = 200_000
+# Comienzo de los archivos escritos por write_trace
+_TRACE_PREFIX = b'{"traceEvents"'
+
+_NULL_SPAN = nullcontext()
+
+
+def is_trace_file(path):
+    """True si path no existe, está vacío o es una línea de tiempo que se puede sobrescribir."""
+    try:
+        with open(path, "rb") as file:
+            head = file.read(len(_TRACE_PREFIX))
+    except FileNotFoundError:
+        return True
+    except OSError:
+        return False
+    return head in (b"", _TRACE_PREFIX)
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "args", "start")
+
+    def __init__(self, profiler, name, args):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._record(self.name, self.start, time.perf_counter(), self.args)
+        return False
+
+
+class Profiler:
+    """Acumula etapas (nombre, inicio, duración, hilo) y contadores.
+
+    Es seguro usarlo desde los hilos de las tareas en segundo plano. stats
+    guarda por etapa (veces, total, máximo, última duración) para el resumen
+    y el panel de la aplicación; events, la línea de tiempo completa.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_path = None
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self.events = []
+        self.stats = {}
+        self.counters = {}
+
+    def enable(self, trace_path=None):
+        """Activa el perfilado; al salir se escribe trace_path y el resumen.
+
+        Lanza ValueError si trace_path ya existe y no es una línea de tiempo.
+        """
+        trace_path = trace_path or DEFAULT_TRACE
+        if not is_trace_file(trace_path):
+            raise ValueError(f"{trace_path} ya existe y no es una línea de tiempo; no se sobrescribe")
+        if not self.enabled:
+            atexit.register(self.dump)
+        self.enabled = True
+        self.trace_path = trace_path
+
+    def span(self, name, **args):
+        """Contexto que mide una etapa; args se guardan en la línea de tiempo."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def count(self, name, value=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            total = self.counters.get(name, 0) + value
+            self.counters[name] = total
+            self._append({"name": name, "ph": "C", "ts": self._micros(time.perf_counter()),
+                          "pid": os.getpid(), "tid": threading.get_ident(), "args": {name: total}})
+
+    def _micros(self, seconds):
+        return round((seconds - self._origin) * 1e6, 1)
+
+    def _append(self, event):
+        self.events.append(event)
+        if len(self.events) > MAX_EVENTS:
+            del self.events[:len(self.events) - MAX_EVENTS]
+
+    def _record(self, name, start, end, args):
+        duration = end - start
+        with self._lock:
+            count, total, longest, _ = self.stats.get(name, (0, 0.0, 0.0, 0.0))
+            self.stats[name] = (count + 1, total + duration, max(longest, duration), duration)
+            event = {"name": name, "ph": "X", "ts": self._micros(start), "dur": round(duration * 1e6, 1),
+                     "pid": os.getpid(), "tid": threading.get_ident()}
+            if args:
+                event["args"] = {key: str(value) for key, value in args.items()}
+            self._append(event)
+
+    def reset(self):
+        with self._lock:
+            self.events = []
+            self.stats = {}
+            self.counters = {}
+
+    def write_trace(self, path):
+        """Escribe la línea de tiempo en el formato JSON de Chrome trace."""
+        with self._lock:
+            events = list(self.events)
+        names = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": thread.ident,
+                  "args": {"name": thread.name}} for thread in threading.enumerate()]
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": names + events, "displayTimeUnit": "ms"}, file)
+
+    def summary(self):
+        """Tabla de texto con las etapas ordenadas por tiempo total y los contadores."""
+        with self._lock:
+            stats = sorted(self.stats.items(), key=lambda item: -item[1][1])
+            counters = sorted(self.counters.items())
+        lines = [f"{'etapa':<28} {'veces':>7} {'total (ms)':>11} {'media (ms)':>11} {'máx (ms)':>10}"]
+        for name, (count, total, longest, _) in stats:
+            lines.append(f"{name:<28} {count:>7} {total * 1000:>11.1f} "
+                         f"{total / count * 1000:>11.3f} {longest * 1000:>10.1f}")
+        for name, value in counters:
+            lines.append(f"{name:<28} {value:>7}")
+        return "\n".join(lines)
+
+    def dump(self):
+        """Escribe la línea de tiempo y el resumen (se llama al salir si está activado)."""
+        if not self.enabled:
+            return
+        print(self.summary(), file=sys.stderr)
+        if not is_trace_file(self.trace_path):
+            print(f"{self.trace_path} no es una línea de tiempo: no se sobrescribe", file=sys.stderr)
+            return
+        self.write_trace(self.trace_path)
+        print(f"Línea de tiempo escrita en {self.trace_path}", file=sys.stderr)
+
+
+# Perfilador de la aplicación
+profiler = Profiler()
+
+
+def traced(name):
+    """Decorador que mide cada llamada a la función como la etapa name."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return fn(*args, **kwargs)
+            with profiler.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def enable_from_args(argv):
+    """Activa el perfilado si argv tiene --profile[=ruta] o existe SRTGEN_PROFILE.
+
+    Devuelve argv sin la opción, para pasar el resto a Qt o a argparse.
+    Termina el programa si la ruta es un archivo que no es una línea de tiempo.
+    """
+    rest, path, requested = [], None, False
+    for arg in argv:
+        if arg == "--profile":
+            requested = True
+        elif arg.startswith("--profile="):
+            requested, path = True, arg.split("=", 1)[1]
+        else:
+            rest.append(arg)
+    env = os.environ.get(PROFILE_ENV, "")
+    if not requested and env and env != "0":
+        requested, path = True, None if env == "1" else env
+    if requested:
+        try:
+            profiler.enable(path)
+        except ValueError as e:
+            raise SystemExit(f"--profile: {e}")
+    return rest
@@ -0,0 +1,149 @@
+"""Cambios de tiempos en bloque sobre arrays y su historia de deshacer/rehacer.
+
+Las operaciones reciben arrays de inicios o fines (NaN = sin tiempo, que se
+conserva) y devuelven arrays nuevos calculados con numpy de una vez. Ningún
+tiempo queda por debajo de cero.
+"""
+from collections import deque, namedtuple
+
+import numpy as np
+
+
+def shift(times, offset):
+    """Desplaza todos los tiempos offset segundos."""
+    return np.maximum(np.asarray(times, dtype=np.float64) + offset, 0.0)
+
+
+def scale(times, factor, anchor=0.0):
+    """Estira los tiempos por factor alrededor de anchor (p. ej. 25 / 23.976 para cambiar de fps)."""
+    times = np.asarray(times, dtype=np.float64)
+    return np.maximum(anchor + (times - anchor) * factor, 0.0)
+
+
+def sync_two_points(times, first, second):
+    """Transformación lineal que lleva first[0] a first[1] y second[0] a second[1].
+
+    first y second son pares (tiempo actual, tiempo correcto), por ejemplo
+    del primer y el último subtítulo. Lanza ValueError si los dos tiempos
+    actuales coinciden.
+    """
+    (old_a, new_a), (old_b, new_b) = first, second
+    if old_a == old_b:
+        raise ValueError("Los dos puntos de sincronización deben tener tiempos distintos")
+    factor = (new_b - new_a) / (old_b - old_a)
+    times = np.asarray(times, dtype=np.float64)
+    return np.maximum(new_a + (times - old_a) * factor, 0.0)
+
+
+def enforce_min_gap(starts, ends, gap):
+    """Devuelve los fines recortados para dejar al menos gap segundos hasta el siguiente inicio.
+
+    Los subtítulos se ordenan por inicio. Un fin vacío (que dura hasta el
+    siguiente inicio) pasa a ser explícito; ningún fin queda antes de su
+    inicio y el último subtítulo no cambia.
+    """
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.array(ends, dtype=np.float64)
+    timed = np.flatnonzero(~np.isnan(starts))
+    order = timed[np.argsort(starts[timed], kind="stable")]
+    if len(order) < 2:
+        return ends
+    current, following = order[:-1], starts[order[1:]]
+    limit = np.maximum(following - gap, starts[current])
+    ends[current] = np.fmin(ends[current], limit)
+    return ends
+
+
+# Paso de la historia: filas (slice o array de índices) con sus valores antes y
+# después; los fines son None si el paso no los cambió
+TimingDelta = namedtuple("TimingDelta", "label rows old_starts new_starts old_ends new_ends")
+
+
+def _changed(old, new):
+    return ~((old == new) | (np.isnan(old) & np.isnan(new)))
+
+
+def _compact_rows(rows):
+    """Convierte un array ordenado de filas en un slice si son consecutivas."""
+    if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+        return slice(int(rows[0]), int(rows[-1]) + 1)
+    return rows.astype(np.int32)
+
+
+class TimingHistory:
+    """Pila de deshacer/rehacer que guarda deltas compactos en lugar de copias de la tabla.
+
+    Cada paso solo contiene las filas que cambiaron (como rango si son
+    consecutivas) con sus tiempos anterior y nuevo, y los fines solo si el
+    paso los modificó. La historia se limita por memoria descartando los
+    pasos más antiguos.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._undo = deque()
+        self._redo = []
+        self._bytes = 0
+
+    @staticmethod
+    def _size(delta):
+        arrays = [delta.old_starts, delta.new_starts, delta.old_ends, delta.new_ends]
+        if not isinstance(delta.rows, slice):
+            arrays.append(delta.rows)
+        return sum(a.nbytes for a in arrays if a is not None)
+
+    def record(self, label, old_starts, new_starts, old_ends=None, new_ends=None):
+        """Guarda un cambio a partir de los arrays completos antes y después.
+
+        Devuelve el TimingDelta guardado, o None si nada cambió.
+        """
+        changed = _changed(old_starts, new_starts)
+        ends_changed = new_ends is not None and bool(_changed(old_ends, new_ends).any())
+        if ends_changed:
+            changed |= _changed(old_ends, new_ends)
+        rows = np.flatnonzero(changed)
+        if not len(rows):
+            return None
+        rows = _compact_rows(rows)
+        delta = TimingDelta(
+            label, rows, old_starts[rows].copy(), new_starts[rows].copy(),
+            old_ends[rows].copy() if ends_changed else None,
+            new_ends[rows].copy() if ends_changed else None)
+        self.push(delta)
+        return delta
+
+    def push(self, delta):
+        """Guarda un TimingDelta ya construido y vacía la pila de rehacer."""
+        self._undo.append(delta)
+        self._bytes += self._size(delta)
+        self._bytes -= sum(self._size(d) for d in self._redo)
+        self._redo.clear()
+        while self._bytes > self.max_bytes and len(self._undo) > 1:
+            self._bytes -= self._size(self._undo.popleft())
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo(self):
+        """Saca el último paso; el llamador restaura old_starts/old_ends en sus filas."""
+        if not self._undo:
+            return None
+        delta = self._undo.pop()
+        self._redo.append(delta)
+        return delta
+
+    def redo(self):
+        """Recupera el último paso deshecho; el llamador aplica new_starts/new_ends."""
+        if not self._redo:
+            return None
+        delta = self._redo.pop()
+        self._undo.append(delta)
+        return delta
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
@@ -1,41 +1,65 @@
 import sys
 import os
 import re
-import librosa
-from pydub import AudioSegment
-import soundfile as sf
+import multiprocessing
 import warnings
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QFileDialog, QTableWidget,
-    QTableWidgetItem, QMessageBox, QHeaderView, QSlider,
-    QFontComboBox, QSpinBox, QColorDialog, QFrame
+    QPushButton, QLabel, QFileDialog, QTableView,
+    QMessageBox, QHeaderView, QSlider,
+    QFontComboBox, QSpinBox, QDoubleSpinBox, QColorDialog, QFrame, QProgressBar,
+    QCheckBox
 )
 from PyQt6.QtCore import Qt, QTimer, QUrl
-from PyQt6.QtGui import QColor, QFont, QIcon
-from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
+from PyQt6.QtGui import QColor, QFont, QIcon, QKeySequence, QShortcut
 import qtawesome as qta
 
+import numpy as np
+
+from alignment import DEFAULT_DURATION
+from audio_analysis import nearest_onset, preload_in_background
+from cue_model import CueTableModel, TEXT_COLUMN
+from exporters import FORMATS, export_subtitles
+from playback_clock import PlaybackClock
+from profiling import enable_from_args, profiler, traced
+from ui_updates import UpdateScheduler
+import retiming
+from subtitle_io import cue_intervals, read_lyrics, read_subtitles
+from waveform import WaveformView
+from workers import Task, align_job, load_media_job
+
+# Etapas de la carga mostradas en el panel de perfilado, en orden
+PROFILE_LOAD_STAGES = ("load", "decode", "frame_power", "envelope", "segments", "onsets",
+                       "peaks", "align", "import", "table.load")
+
+# Espera (ms) tras el último cambio de umbral antes de volver a alinear
+ALIGN_DELAY = 150
+
 # Suprimir advertencias específicas de librosa
 warnings.filterwarnings("ignore", message="Could not update timestamps for skipped samples")
 
-def segundos_a_timestamp(segundos):
-    total_ms = int(segundos * 1000)
-    horas, rem = divmod(total_ms, 3600000)
-    minutos, rem = divmod(rem, 60000)
-    segundos, milisegundos = divmod(rem, 1000)
-    return f"{horas:02d}:{minutos:02d}:{segundos:02d},{milisegundos:03d}"
-
 class AudioSync(QWidget):
     def __init__(self):
         super().__init__()
         self.playing = False
         self.media_file = None
-        self.temp_wav_file = None  # Para almacenar el archivo WAV temporal
         self.duration = 0
-        self.media_player = QMediaPlayer()
-        self.audio_output = QAudioOutput()
-        self.media_player.setAudioOutput(self.audio_output)
+        self.envelope = None  # Envolvente de energía del audio cargado (ver audio_analysis)
+        self.silences = None  # Segmentos no silenciosos del audio cargado
+        self.onsets = None  # Tiempos de ataque ordenados, para ajustar las marcas
+        self.lyrics = []
+        self.suggested_times = []  # Tiempos sugeridos escritos en la tabla
+        self.load_task = None
+        self.align_task = None
+        self.cue_model = CueTableModel()  # Subtítulos e índice de inicios
+        self.cues = self.cue_model.store
+        self.preview_row = None  # Fila mostrada en la vista previa
+        self.sync_points = {}  # Punto de sincronización -> (tiempo actual, tiempo correcto)
+        # QtMultimedia se carga al abrir el primer audio (ver _ensure_media_player)
+        self.media_player = None
+        self.audio_output = None
+        # Posición interpolada entre los informes del reproductor (marcas y vista previa)
+        self.clock = PlaybackClock()
         
         self.is_dark_theme = False
         self.subtitle_font = QFont("Arial", 12)
@@ -43,9 +67,15 @@ class AudioSync(QWidget):
         
         self.init_theme()
         
-        self.position_timer = QTimer()
-        self.position_timer.timeout.connect(self.update_position)
-        self.position_timer.setInterval(50)
+        # Una sola pasada de slider, etiqueta y vista previa por fotograma; nada en pausa
+        self.updates = UpdateScheduler(self.update_position, parent=self)
+        self._duration_text = self._clock_text(0)
+
+        # La alineación va en segundo plano; los cambios seguidos de umbral se agrupan
+        self.align_timer = QTimer(self)
+        self.align_timer.setSingleShot(True)
+        self.align_timer.setInterval(ALIGN_DELAY)
+        self.align_timer.timeout.connect(self._start_alignment)
         
         self.initUI()
 
@@ -54,8 +84,8 @@ class AudioSync(QWidget):
             QWidget { background-color: #ffffff; color: #000000; }
             QPushButton { background-color: #f0f0f0; border: 1px solid #cccccc; padding: 5px; }
             QPushButton:hover { background-color: #e0e0e0; }
-            QTableWidget { border: 1px solid #cccccc; }
-            QTableWidget::item:selected {
+            QTableView { border: 1px solid #cccccc; }
+            QTableView::item:selected {
                 background-color: #4a90e2;  /* Fondo azul claro para selección en tema claro */
                 color: #ffffff;  /* Texto blanco para contraste */
                 border: 1px solid #4a90e2;
@@ -79,8 +109,8 @@ class AudioSync(QWidget):
             QWidget { background-color: #2b2b2b; color: #ffffff; }
             QPushButton { background-color: #3b3b3b; border: 1px solid #505050; padding: 5px; }
             QPushButton:hover { background-color: #454545; }
-            QTableWidget { border: 1px solid #505050; }
-            QTableWidget::item:selected {
+            QTableView { border: 1px solid #505050; }
+            QTableView::item:selected {
                 background-color: #4a90e2;  /* Fondo azul claro para selección en tema oscuro */
                 color: #ffffff;  /* Texto blanco para contraste */
                 border: 1px solid #4a90e2;
@@ -165,13 +195,23 @@ class AudioSync(QWidget):
         self.time_slider.setMinimumWidth(400)  # Establecer un ancho mínimo más amplio
         self.time_slider.sliderMoved.connect(self.seek_position)
         self.time_slider.setTracking(True)
-        self.time_slider.valueChanged.connect(self.update_position)
         layout.addWidget(self.time_slider)
 
+        # Forma de onda con las marcas de los subtítulos (rueda: zoom, clic: buscar)
+        self.waveform = WaveformView()
+        self.waveform.seekRequested.connect(self.seek_to)
+        layout.addWidget(self.waveform)
+
         # Añadir etiqueta de tiempo debajo del slider
         self.time_label = QLabel("00:00:00,000 / 00:00:00,000")
         layout.addWidget(self.time_label)
 
+        # Progreso del análisis en segundo plano
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar)
+
         # Controles de estilo de subtítulos
         style_layout = QHBoxLayout()
         style_frame = QFrame()
@@ -198,19 +238,165 @@ class AudioSync(QWidget):
 
         layout.addWidget(style_frame)
 
+        # Umbral de silencio: se vuelve a segmentar al instante desde la envolvente
+        silence_layout = QHBoxLayout()
+        silence_frame = QFrame()
+        silence_frame.setFrameStyle(QFrame.Box | QFrame.Raised)
+        silence_frame.setLayout(silence_layout)
+
+        silence_layout.addWidget(QLabel("Umbral de silencio:"))
+        self.threshold_slider = QSlider(Qt.Horizontal)
+        self.threshold_slider.setRange(5, 60)
+        self.threshold_slider.setValue(20)
+        self.threshold_slider.valueChanged.connect(self.update_silence_threshold)
+        silence_layout.addWidget(self.threshold_slider)
+        self.threshold_label = QLabel("20 dB")
+        silence_layout.addWidget(self.threshold_label)
+
+        silence_layout.addWidget(QLabel("Silencio mínimo (s):"))
+        self.min_gap_spin = QDoubleSpinBox()
+        self.min_gap_spin.setRange(0.0, 5.0)
+        self.min_gap_spin.setSingleStep(0.05)
+        self.min_gap_spin.setDecimals(2)
+        self.min_gap_spin.valueChanged.connect(self.update_silence_threshold)
+        silence_layout.addWidget(self.min_gap_spin)
+
+        layout.addWidget(silence_frame)
+
+        # Marcas con M: compensación del tiempo de reacción y ajuste al ataque más cercano
+        mark_layout = QHBoxLayout()
+        mark_frame = QFrame()
+        mark_frame.setFrameStyle(QFrame.Box | QFrame.Raised)
+        mark_frame.setLayout(mark_layout)
+
+        mark_layout.addWidget(QLabel("Tiempo de reacción (s):"))
+        self.reaction_spin = QDoubleSpinBox()
+        self.reaction_spin.setRange(0.0, 1.0)
+        self.reaction_spin.setSingleStep(0.01)
+        self.reaction_spin.setDecimals(3)
+        mark_layout.addWidget(self.reaction_spin)
+
+        self.snap_check = QCheckBox("Ajustar al ataque más cercano")
+        mark_layout.addWidget(self.snap_check)
+        mark_layout.addWidget(QLabel("Ventana (s):"))
+        self.snap_window_spin = QDoubleSpinBox()
+        self.snap_window_spin.setRange(0.01, 1.0)
+        self.snap_window_spin.setSingleStep(0.01)
+        self.snap_window_spin.setDecimals(3)
+        self.snap_window_spin.setValue(0.15)
+        mark_layout.addWidget(self.snap_window_spin)
+
+        mark_layout.addWidget(QLabel("Latencia de salida (s):"))
+        self.latency_spin = QDoubleSpinBox()
+        self.latency_spin.setRange(0.0, 1.0)
+        self.latency_spin.setSingleStep(0.01)
+        self.latency_spin.setDecimals(3)
+        self.latency_spin.valueChanged.connect(self.set_output_latency)
+        mark_layout.addWidget(self.latency_spin)
+
+        layout.addWidget(mark_frame)
+
+        # Cambios de tiempos en bloque, todos deshacibles
+        retime_layout = QHBoxLayout()
+        retime_frame = QFrame()
+        retime_frame.setFrameStyle(QFrame.Box | QFrame.Raised)
+        retime_frame.setLayout(retime_layout)
+
+        retime_layout.addWidget(QLabel("Desplazar (s):"))
+        self.shift_spin = QDoubleSpinBox()
+        self.shift_spin.setRange(-3600.0, 3600.0)
+        self.shift_spin.setSingleStep(0.1)
+        self.shift_spin.setDecimals(3)
+        retime_layout.addWidget(self.shift_spin)
+        shift_all_button = QPushButton("Todo")
+        shift_all_button.clicked.connect(self.shift_all)
+        retime_layout.addWidget(shift_all_button)
+        shift_from_button = QPushButton("Desde la fila")
+        shift_from_button.clicked.connect(self.shift_from_selected)
+        retime_layout.addWidget(shift_from_button)
+
+        retime_layout.addWidget(QLabel("Escala:"))
+        self.scale_spin = QDoubleSpinBox()
+        self.scale_spin.setRange(0.5, 2.0)
+        self.scale_spin.setSingleStep(0.001)
+        self.scale_spin.setDecimals(5)
+        self.scale_spin.setValue(1.0)
+        retime_layout.addWidget(self.scale_spin)
+        scale_button = QPushButton("Escalar")
+        scale_button.clicked.connect(self.scale_all)
+        retime_layout.addWidget(scale_button)
+
+        # Sincronización por dos puntos: cada botón toma la fila seleccionada y la posición actual
+        self.sync_buttons = {}
+        for name in ("A", "B"):
+            button = QPushButton(f"Punto {name}")
+            button.clicked.connect(lambda _, name=name: self.set_sync_point(name))
+            self.sync_buttons[name] = button
+            retime_layout.addWidget(button)
+        sync_button = QPushButton("Sincronizar")
+        sync_button.clicked.connect(self.sync_two_points)
+        retime_layout.addWidget(sync_button)
+
+        retime_layout.addWidget(QLabel("Separación mínima (s):"))
+        self.gap_spin = QDoubleSpinBox()
+        self.gap_spin.setRange(0.0, 2.0)
+        self.gap_spin.setSingleStep(0.01)
+        self.gap_spin.setDecimals(3)
+        self.gap_spin.setValue(0.1)
+        retime_layout.addWidget(self.gap_spin)
+        gap_button = QPushButton("Aplicar")
+        gap_button.clicked.connect(self.enforce_min_gap)
+        retime_layout.addWidget(gap_button)
+
+        self.undo_button = QPushButton("Ctrl+Z")
+        self.undo_button.setIcon(qta.icon('fa5s.undo', color='black'))
+        self.undo_button.clicked.connect(self.undo_timing)
+        retime_layout.addWidget(self.undo_button)
+        self.redo_button = QPushButton("Ctrl+Y")
+        self.redo_button.setIcon(qta.icon('fa5s.redo', color='black'))
+        self.redo_button.clicked.connect(self.redo_timing)
+        retime_layout.addWidget(self.redo_button)
+        self.cue_model.historyChanged.connect(self._on_history_changed)
+        self._on_history_changed()
+
+        layout.addWidget(retime_frame)
+
+        QShortcut(QKeySequence("Ctrl+Z"), self, self.undo_timing)
+        QShortcut(QKeySequence("Ctrl+Y"), self, self.redo_timing)
+        QShortcut(QKeySequence("Ctrl+Shift+Z"), self, self.redo_timing)
+
         self.preview_label = QLabel("Vista previa de la letra")
         self.update_preview_style()
         self.preview_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(self.preview_label)
 
-        self.table = QTableWidget(0, 2)
-        self.table.setHorizontalHeaderLabels(["Letra", "Tiempo"])
+        self.table = QTableView()
+        self.table.setModel(self.cue_model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.setEditTriggers(QTableWidget.DoubleClicked)
+        self.table.setEditTriggers(QTableView.DoubleClicked)
         # Asegurar que las celdas seleccionadas sean visibles
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionMode(QTableView.SingleSelection)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        # Las filas tienen altura fija: la vista no necesita medir cada una
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.cue_model.dataChanged.connect(self._on_cues_changed)
+        self.cue_model.modelReset.connect(self._on_cues_changed)
         layout.addWidget(self.table)
+        # Las flechas ajustan el tiempo solo con el foco en la tabla (tienen prioridad
+        # sobre su navegación): los deslizadores y el editor de celdas las conservan
+        for key, adjustment in ((Qt.Key.Key_Left, -0.1), (Qt.Key.Key_Right, 0.1)):
+            shortcut = QShortcut(QKeySequence(key), self.table, lambda adjustment=adjustment: self.adjust_time(adjustment))
+            shortcut.setContext(Qt.ShortcutContext.WidgetShortcut)
+
+        # Formatos que se escriben con una sola exportación
+        export_layout = QHBoxLayout()
+        self.format_checks = {}
+        for fmt, (extension, _, description) in FORMATS.items():
+            check = QCheckBox(f"{description} ({extension})")
+            check.setChecked(fmt == "srt")
+            self.format_checks[fmt] = check
+            export_layout.addWidget(check)
+        layout.addLayout(export_layout)
 
         self.generate_button = QPushButton("Ctrl+S")
         self.generate_button.setIcon(qta.icon('fa5s.save', color='black'))
@@ -218,6 +404,15 @@ class AudioSync(QWidget):
         self.generate_button.setShortcut("Ctrl+S")
         layout.addWidget(self.generate_button)
 
+        # Panel de perfilado: coste del tick y desglose de la última carga (solo con --profile)
+        self.profile_label = QLabel("Perfilado activo")
+        self.profile_label.setVisible(profiler.enabled)
+        layout.addWidget(self.profile_label)
+        if profiler.enabled:
+            self.profile_timer = QTimer(self)
+            self.profile_timer.timeout.connect(self.update_profile_panel)
+            self.profile_timer.start(500)
+
         self.setLayout(layout)
         self.setWindowTitle("SRTGen")
         # Establecer el ícono en la barra superior
@@ -227,7 +422,8 @@ class AudioSync(QWidget):
     def set_volume(self, value):
         """Ajusta el volumen del audio (0-100 a 0.0-1.0 para QAudioOutput)."""
         volume = value / 100.0  # Convertir de 0-100 a 0.0-1.0
-        self.audio_output.setVolume(volume)
+        if self.audio_output is not None:
+            self.audio_output.setVolume(volume)
 
     def update_font(self, font):
         self.subtitle_font = font
@@ -251,109 +447,246 @@ class AudioSync(QWidget):
             f"QLabel {{ background-color: #000000; color: {self.subtitle_color.name()}; padding: 10px; }}"
         )
 
-    def convert_to_wav(self, file_path):
-        """Convierte un archivo MP3 a WAV temporalmente usando pydub."""
-        if file_path.lower().endswith('.mp3'):
-            temp_wav = os.path.splitext(file_path)[0] + "_temp.wav"
-            try:
-                audio = AudioSegment.from_mp3(file_path)
-                audio.export(temp_wav, format="wav")
-                return temp_wav
-            except Exception as e:
-                QMessageBox.warning(self, "Advertencia", f"No se pudo convertir a WAV: {str(e)}. Usando archivo original.")
-                return file_path
-        return file_path
-
-    def cleanup_temp_file(self):
-        """Elimina el archivo WAV temporal si existe."""
-        if self.temp_wav_file and os.path.exists(self.temp_wav_file):
-            try:
-                os.remove(self.temp_wav_file)
-            except Exception:
-                pass
-            self.temp_wav_file = None
-
     def load_media(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self, "Seleccionar archivo de audio", "",
-            "Audio Files (*.mp3 *.wav);;All Files (*)")
+            "Audio Files (*.mp3 *.wav *.flac *.ogg *.m4a);;All Files (*)")
         if file_path:
-            try:
-                # Limpiar archivo temporal anterior
-                self.cleanup_temp_file()
-                
-                # Convertir a WAV si es necesario
-                processed_file = self.convert_to_wav(file_path)
-                self.temp_wav_file = processed_file if processed_file != file_path else None
-                
-                self.media_player.setSource(QUrl.fromLocalFile(file_path))  # Reproducir el original
-                self.media_file = processed_file  # Usar WAV para análisis
-                
-                # Cargar y procesar la duración sin backend específico
-                y, sr = librosa.load(self.media_file, offset=0.0, duration=None, mono=True)
-                self.duration = librosa.get_duration(y=y, sr=sr)
-                self.time_slider.setRange(0, int(self.duration * 1000))
-                
-                self.media_player.mediaStatusChanged.connect(self._handle_media_status)
-                self.position_timer.start()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error al cargar el audio:\n{str(e)}")
-                self.cleanup_temp_file()
+            # Cancelar el análisis del archivo anterior
+            self.cancel_load_task()
+            self.cancel_alignment()
+            self.envelope = None
+            self.silences = None
+            self.onsets = None
+            self.waveform.clear()
+
+            self._ensure_media_player().setSource(QUrl.fromLocalFile(file_path))
+            self.media_file = file_path
+            self.clock.pause(0.0)
+
+            # Duración y análisis de silencios en segundo plano
+            task = Task(load_media_job, file_path)
+            task.signals.result.connect(lambda stage, value: self._on_load_result(task, stage, value))
+            task.signals.progress.connect(lambda stage, fraction: self._on_load_progress(task, fraction))
+            task.signals.failed.connect(lambda message: self._on_load_failed(task, message))
+            task.signals.finished.connect(lambda: self._on_load_finished(task))
+            self.load_task = task
+            self.progress_bar.setValue(0)
+            self.progress_bar.show()
+            task.start()
+
+            self.updates.request()
+
+    def _ensure_media_player(self):
+        """Crea el reproductor la primera vez que se necesita; QtMultimedia es lento de cargar."""
+        if self.media_player is None:
+            from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
+
+            self.media_player = QMediaPlayer()
+            self.audio_output = QAudioOutput()
+            self.audio_output.setVolume(self.volume_slider.value() / 100.0)
+            self.media_player.setAudioOutput(self.audio_output)
+            self.media_player.mediaStatusChanged.connect(self._handle_media_status)
+            self.media_player.positionChanged.connect(lambda ms: self.clock.report(ms / 1000.0))
+            self.media_player.playbackStateChanged.connect(self._handle_playback_state)
+        return self.media_player
+
+    def cancel_load_task(self):
+        if self.load_task is not None:
+            self.load_task.cancel()
+            self.load_task = None
+            self.progress_bar.hide()
+
+    def _on_load_result(self, task, stage, value):
+        if task is not self.load_task:
+            return
+        if stage == "duration":
+            self.duration = value
+            self._duration_text = self._clock_text(self.duration)
+            self.time_slider.setRange(0, int(self.duration * 1000))
+            self.waveform.set_duration(self.duration)
+            self.update_time_display(self.clock.now())
+        elif stage == "warning":
+            QMessageBox.warning(self, "Advertencia", value)
+        elif stage == "envelope":
+            self.envelope = value
+            self.update_silence_threshold()
+        elif stage == "onsets":
+            self.onsets = value
+        elif stage == "peaks":
+            self.waveform.set_peaks(value, self.duration)
+
+    @traced("rethreshold")
+    def update_silence_threshold(self, *args):
+        """Vuelve a segmentar con los controles actuales sin volver a analizar el audio."""
+        top_db = self.threshold_slider.value()
+        self.threshold_label.setText(f"{top_db} dB")
+        if self.envelope is None:
+            return
+        self.silences = self.envelope.segments(top_db, self.min_gap_spin.value())
+        self.waveform.set_segments(self.silences)
+        self.apply_suggested_times()
+
+    def _on_load_progress(self, task, fraction):
+        if task is self.load_task:
+            self.progress_bar.setValue(int(fraction * 100))
+
+    def _on_load_failed(self, task, message):
+        if task is self.load_task:
+            QMessageBox.critical(self, "Error", f"Error al cargar el audio:\n{message}")
+
+    def _on_load_finished(self, task):
+        if task is self.load_task:
+            self.load_task = None
+            self.progress_bar.hide()
 
     def seek_position(self):
         """Busca a una posición específica en el audio usando el slider de tiempo."""
         if self.media_file:
             pos = self.time_slider.value()
             self.media_player.setPosition(pos)
-            self.update_position()
+            self.clock.seek(pos / 1000.0)
+            self.updates.request()
+
+    def seek_to(self, seconds):
+        """Busca a una posición en segundos (clic en la forma de onda)."""
+        if self.media_file:
+            self.media_player.setPosition(int(seconds * 1000))
+            self.clock.seek(int(seconds * 1000) / 1000.0)
+            self.updates.request()
 
     def _handle_media_status(self, status):
+        from PyQt6.QtMultimedia import QMediaPlayer
+
         if status == QMediaPlayer.MediaStatus.LoadedMedia:
             self.update_time_display(0)
 
+    def _handle_playback_state(self, state):
+        from PyQt6.QtMultimedia import QMediaPlayer
+
+        # Al llegar al final el reproductor se detiene solo: el reloj y las pasadas también
+        if state == QMediaPlayer.PlaybackState.StoppedState and self.playing:
+            self.clock.pause(self.media_player.position() / 1000.0)
+            self.playing = False
+            icon_color = 'white' if self.is_dark_theme else 'black'
+            self.play_button.setIcon(qta.icon('fa5s.play', color=icon_color))
+            self.updates.set_playing(False)
+
+    def set_output_latency(self, value):
+        self.clock.latency = value
+
     def load_lyrics(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self, "Seleccionar archivo de letras", "",
-            "Text Files (*.txt);;All Files (*)")
+            "Letras y subtítulos (*.txt *.srt *.vtt);;Text Files (*.txt);;"
+            "Subtítulos (*.srt *.vtt);;All Files (*)")
         if file_path:
             try:
-                with open(file_path, "r", encoding="utf-8") as file:
-                    lyrics = [line.strip() for line in file if line.strip()]
-                self.populate_table_with_lyrics(lyrics)
+                if os.path.splitext(file_path)[1].lower() in (".srt", ".vtt"):
+                    self.import_subtitles(file_path)
+                else:
+                    self.populate_table_with_lyrics(read_lyrics(file_path))
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Error al cargar las letras:\n{str(e)}")
 
+    @traced("import_subtitles")
+    def import_subtitles(self, file_path):
+        """Carga un SRT o WebVTT existente con sus tiempos para volver a sincronizarlo."""
+        imported = read_subtitles(file_path)
+        self.cancel_alignment()
+        self.lyrics = imported.texts
+        # Los tiempos importados no son sugerencias: el análisis no los sustituye
+        self.suggested_times = np.full(len(imported.texts), np.nan)
+        self.cue_model.load(imported.texts, imported.starts, imported.ends)
+        if imported.style:
+            self.apply_style(imported.style)
+        if imported.errors:
+            shown = "\n".join(f"Línea {line}: {message}" for line, message in imported.errors[:10])
+            more = len(imported.errors) - 10
+            if more > 0:
+                shown += f"\n... y {more} más"
+            QMessageBox.warning(self, "Advertencia",
+                                f"Se omitieron {len(imported.errors)} bloques mal formados:\n{shown}")
+
+    def apply_style(self, style):
+        """Aplica un diccionario de estilo con las claves "font", "size" y "color"."""
+        if "font" in style:
+            self.font_combo.setCurrentFont(QFont(style["font"]))
+        if "size" in style:
+            self.size_spin.setValue(style["size"])
+        color = QColor(style.get("color", ""))
+        if color.isValid():
+            self.subtitle_color = color
+            self.color_button.setStyleSheet(f"background-color: {color.name()};")
+        self.update_preview_style()
+
+    @traced("populate_table")
     def populate_table_with_lyrics(self, lyrics):
-        self.table.setRowCount(len(lyrics))
-        total_duration = self.duration if self.duration > 0 else 210
-        
-        if self.media_file:
-            try:
-                segments = self.analyze_silences(self.media_file)
-                for i, (start, _) in enumerate(segments[:len(lyrics)]):
-                    self.table.setItem(i, 0, QTableWidgetItem(lyrics[i]))
-                    self.table.setItem(i, 1, QTableWidgetItem(f"{start:.3f}"))
-                if len(lyrics) > len(segments):
-                    last_time = segments[-1][1] if segments else 0
-                    remaining = len(lyrics) - len(segments)
-                    interval = (total_duration - last_time) / (remaining + 1)
-                    for i in range(len(segments), len(lyrics)):
-                        time = last_time + interval * (i - len(segments) + 1)
-                        self.table.setItem(i, 0, QTableWidgetItem(lyrics[i]))
-                        self.table.setItem(i, 1, QTableWidgetItem(f"{time:.3f}"))
-                return
-            except Exception as e:
-                QMessageBox.warning(self, "Advertencia", f"No se pudo analizar silencios: {str(e)}")
+        """Llena la tabla al instante con tiempos provisionales repartidos uniformemente.
 
+        Si el análisis de silencios ya terminó (o cuando termine) los tiempos se
+        sustituyen en su sitio por los sugeridos a partir de los segmentos.
+        """
+        self.lyrics = lyrics
+        total_duration = self.duration if self.duration > 0 else DEFAULT_DURATION
         interval = total_duration / (len(lyrics) + 1)
-        for i, line in enumerate(lyrics):
-            self.table.setItem(i, 0, QTableWidgetItem(line))
-            self.table.setItem(i, 1, QTableWidgetItem(f"{interval * (i + 1):.3f}"))
+        self.suggested_times = interval * np.arange(1, len(lyrics) + 1)
+        self.cue_model.load(lyrics, self.suggested_times)
+        if self.silences is not None:
+            self.apply_suggested_times()
 
-    def analyze_silences(self, file_path):
-        y, sr = librosa.load(file_path, offset=0.0, duration=None, mono=True)
-        silences = librosa.effects.split(y, top_db=20)
-        return [(start / sr, end / sr) for start, end in silences]
+    def apply_suggested_times(self):
+        """Programa la alineación de los tiempos sugeridos con los segmentos actuales.
+
+        Descarta la alineación en curso y espera ALIGN_DELAY ms, así que
+        arrastrar el control de umbral solo vuelve a segmentar; la alineación
+        se hace una vez, en segundo plano, con los últimos valores.
+        """
+        self.cancel_alignment()
+        if self.lyrics and self.silences is not None:
+            self.align_timer.start()
+
+    def cancel_alignment(self):
+        self.align_timer.stop()
+        if self.align_task is not None:
+            self.align_task.cancel()
+            self.align_task = None
+
+    def _start_alignment(self):
+        if not self.lyrics or self.silences is None:
+            return
+        total_duration = self.duration if self.duration > 0 else DEFAULT_DURATION
+        task = Task(align_job, self.silences, self.lyrics, total_duration)
+        task.signals.result.connect(lambda stage, value: self._on_align_result(task, value))
+        task.signals.failed.connect(lambda message: self._on_align_failed(task, message))
+        task.signals.finished.connect(lambda: self._on_align_finished(task))
+        self.align_task = task
+        task.start()
+
+    def _on_align_result(self, task, times):
+        """Actualiza en su sitio los tiempos sugeridos que el usuario no ha modificado."""
+        if task is not self.align_task:
+            return
+        times = np.array(times)
+        count = min(len(times), len(self.cues))
+        # Solo las filas cuyo tiempo sigue siendo el sugerido anteriormente
+        rows = np.flatnonzero(self.cues.starts[:count] == self.suggested_times[:count])
+        self.suggested_times[rows] = times[rows]
+        self.cue_model.set_starts(rows, times[rows])
+
+    def _on_align_failed(self, task, message):
+        if task is self.align_task:
+            QMessageBox.warning(self, "Advertencia", f"No se pudieron sugerir tiempos:\n{message}")
+
+    def _on_align_finished(self, task):
+        if task is self.align_task:
+            self.align_task = None
+
+    def _on_cues_changed(self, *args):
+        # Forzar que la vista previa se vuelva a pintar en el próximo tick
+        self.preview_row = None
+        self.waveform.set_cues(self.cues.starts)
+        self.updates.request()
 
     def toggle_playback(self):
         if not self.media_file:
@@ -361,34 +694,40 @@ class AudioSync(QWidget):
             return
         if not self.playing:
             self.media_player.play()
+            self.clock.start(self.media_player.position() / 1000.0)
             self.playing = True
             icon_color = 'white' if self.is_dark_theme else 'black'
             self.play_button.setIcon(qta.icon('fa5s.pause', color=icon_color))
-            self.position_timer.start()
+            self.updates.set_playing(True)
         else:
             self.media_player.pause()
+            self.clock.pause(self.media_player.position() / 1000.0)
             self.playing = False
             icon_color = 'white' if self.is_dark_theme else 'black'
             self.play_button.setIcon(qta.icon('fa5s.play', color=icon_color))
-            self.position_timer.stop()
+            self.updates.set_playing(False)
 
     def update_position(self):
+        """Pasada del planificador: cada widget solo se toca si su valor cambia."""
         if self.media_file:
-            position = self.media_player.position()
+            current_time = self.clock.now()
             # Solo actualizar el slider si no se está manipulando manualmente
             if not self.time_slider.isSliderDown():  # Verificar si el usuario no está deslizando
-                self.time_slider.setValue(position)
-            current_time = position / 1000.0
+                self.updates.write("slider", int(current_time * 1000), self.time_slider.setValue)
+            else:
+                self.updates.forget("slider")
+            self.waveform.set_position(current_time)
             self.update_time_display(current_time)
             self.update_preview(current_time)
 
     def update_time_display(self, current):
-        cur_h, cur_m, cur_s, cur_ms = self._format_time(current)
-        dur_h, dur_m, dur_s, dur_ms = self._format_time(self.duration)
-        self.time_label.setText(
-            f"{cur_h:02d}:{cur_m:02d}:{cur_s:02d},{cur_ms:03d} / "
-            f"{dur_h:02d}:{dur_m:02d}:{dur_s:02d},{dur_ms:03d}"
-        )
+        # La duración se formatea una sola vez al conocerse (ver _on_load_result)
+        self.updates.write("time_label", f"{self._clock_text(current)} / {self._duration_text}",
+                           self.time_label.setText)
+
+    def _clock_text(self, seconds):
+        hours, minutes, secs, ms = self._format_time(seconds)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d},{ms:03d}"
 
     def _format_time(self, seconds):
         total_ms = int(seconds * 1000)
@@ -398,18 +737,14 @@ class AudioSync(QWidget):
         return hours, minutes, secs, ms
 
     def update_preview(self, current_time):
-        current_line = ""
-        max_time = -1
-        for row in range(self.table.rowCount()):
-            try:
-                time_item = self.table.item(row, 1)
-                if time_item:
-                    t = float(time_item.text())
-                    if t > max_time and t <= current_time:
-                        max_time = t
-                        current_line = self.table.item(row, 0).text()
-            except (ValueError, AttributeError):
-                continue
+        """Muestra la línea activa; la etiqueta solo se toca cuando cambia la línea."""
+        row = self.cues.active_row(current_time)
+        if row is None:
+            row = -1
+        if row == self.preview_row:
+            return
+        self.preview_row = row
+        current_line = self.cues.texts[row] if row >= 0 else ""
         self.preview_label.setText(current_line or "Vista previa de la letra")
 
     def mark_current_time(self):
@@ -417,90 +752,181 @@ class AudioSync(QWidget):
             QMessageBox.warning(self, "Error", "Carga un archivo de audio primero")
             return
         
-        current_time = self.media_player.position() / 1000.0
-        selected_row = self.table.currentRow()
+        current_time = self.marked_time(self.clock.now())
+        selected_row = self.table.currentIndex().row()
         
         if selected_row >= 0:
-            self.table.setItem(selected_row, 1, QTableWidgetItem(f"{current_time:.3f}"))
+            self.cue_model.set_start(selected_row, round(current_time, 3))
             next_row = selected_row + 1
-            if next_row < self.table.rowCount():
-                self.table.setCurrentCell(next_row, 0)
+            if next_row < len(self.cues):
+                self.table.setCurrentIndex(self.cue_model.index(next_row, TEXT_COLUMN))
             else:
                 QMessageBox.information(self, "Información", "Has llegado al final de la lista.")
 
-    # def adjust_time(self, adjustment):
-    #     selected_row = self.table.currentRow()
-    #     if selected_row >= 0 and self.table.item(selected_row, 1):
-    #         try:
-    #             current_time = float(self.table.item(selected_row, 1).text())
-    #             new_time = max(0, min(self.duration, current_time + adjustment))
-    #             self.table.setItem(selected_row, 1, QTableWidgetItem(f"{new_time:.3f}"))
-    #         except (ValueError, AttributeError):
-    #             QMessageBox.warning(self, "Error", "Tiempo inválido en la línea seleccionada")
+    def marked_time(self, position):
+        """Tiempo a guardar para una marca hecha en position (segundos).
+
+        Resta el tiempo de reacción y, si está activado y el análisis ya
+        terminó, lo lleva al ataque más cercano dentro de la ventana.
+        """
+        marked = max(0.0, position - self.reaction_spin.value())
+        if self.snap_check.isChecked() and self.onsets is not None:
+            onset = nearest_onset(self.onsets, marked, self.snap_window_spin.value())
+            if onset is not None:
+                marked = onset
+        return marked
+
+    def adjust_time(self, adjustment):
+        selected_row = self.table.currentIndex().row()
+        if selected_row < 0:
+            return
+        current_time = self.cues.starts[selected_row]
+        if np.isnan(current_time):
+            QMessageBox.warning(self, "Error", "Tiempo inválido en la línea seleccionada")
+            return
+        new_time = max(0, current_time + adjustment)
+        if self.duration > 0:
+            new_time = min(self.duration, new_time)
+        self.cue_model.set_start(selected_row, round(new_time, 3))
+
+    def _apply_retiming(self, label, starts, ends):
+        """Aplica tiempos calculados en bloque sin pasar de la duración del audio."""
+        if self.duration > 0:
+            starts = np.minimum(starts, self.duration)
+            ends = np.minimum(ends, self.duration)
+        self.cue_model.apply_times(label, starts, ends)
+
+    def shift_all(self):
+        offset = self.shift_spin.value()
+        self._apply_retiming("Desplazar todo", retiming.shift(self.cues.starts, offset),
+                             retiming.shift(self.cues.ends, offset))
+
+    def shift_from_selected(self):
+        """Desplaza la fila seleccionada y todas las siguientes."""
+        row = self.table.currentIndex().row()
+        if row < 0:
+            QMessageBox.warning(self, "Error", "Selecciona la primera fila a desplazar")
+            return
+        offset = self.shift_spin.value()
+        starts, ends = self.cues.starts.copy(), self.cues.ends.copy()
+        starts[row:] = retiming.shift(starts[row:], offset)
+        ends[row:] = retiming.shift(ends[row:], offset)
+        self._apply_retiming("Desplazar desde la fila", starts, ends)
+
+    def scale_all(self):
+        factor = self.scale_spin.value()
+        self._apply_retiming("Escalar", retiming.scale(self.cues.starts, factor),
+                             retiming.scale(self.cues.ends, factor))
+
+    def set_sync_point(self, name):
+        """Asocia el tiempo de la fila seleccionada con la posición actual de reproducción."""
+        if not self.media_file:
+            QMessageBox.warning(self, "Error", "Carga un archivo de audio primero")
+            return
+        row = self.table.currentIndex().row()
+        if row < 0 or np.isnan(self.cues.starts[row]):
+            QMessageBox.warning(self, "Error", "Selecciona una fila con tiempo")
+            return
+        point = (float(self.cues.starts[row]), round(self.clock.now(), 3))
+        self.sync_points[name] = point
+        self.sync_buttons[name].setText(f"{name}: {point[0]:.3f} → {point[1]:.3f}")
+
+    def sync_two_points(self):
+        if len(self.sync_points) < 2:
+            QMessageBox.warning(self, "Error", "Fija primero los puntos A y B")
+            return
+        first, second = self.sync_points["A"], self.sync_points["B"]
+        try:
+            starts = retiming.sync_two_points(self.cues.starts, first, second)
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", str(e))
+            return
+        self._apply_retiming("Sincronizar dos puntos", starts,
+                             retiming.sync_two_points(self.cues.ends, first, second))
+        self.sync_points.clear()
+        for name, button in self.sync_buttons.items():
+            button.setText(f"Punto {name}")
+
+    def enforce_min_gap(self):
+        ends = retiming.enforce_min_gap(self.cues.starts, self.cues.ends, self.gap_spin.value())
+        self._apply_retiming("Separación mínima", self.cues.starts, ends)
+
+    def undo_timing(self):
+        self.cue_model.undo()
+
+    def redo_timing(self):
+        self.cue_model.redo()
+
+    def _on_history_changed(self):
+        self.undo_button.setEnabled(self.cue_model.history.can_undo())
+        self.redo_button.setEnabled(self.cue_model.history.can_redo())
 
     def generate_srt(self):
-        if not self.table.rowCount():
-            QMessageBox.warning(self, "Error", "No hay letras para generar SRT")
+        """Exporta los subtítulos a todos los formatos marcados de una vez."""
+        if not len(self.cues):
+            QMessageBox.warning(self, "Error", "No hay letras para generar subtítulos")
             return
-            
-        timestamps = []
-        for row in range(self.table.rowCount()):
-            line_item = self.table.item(row, 0)
-            time_item = self.table.item(row, 1)
-            if not line_item or not time_item:
-                continue
-            line = line_item.text().strip()
-            if not line:
-                continue
-            try:
-                time_in_seconds = float(time_item.text())
-                if time_in_seconds < 0 or time_in_seconds > self.duration:
-                    QMessageBox.warning(self, "Error", f"Tiempo inválido en la línea {row + 1}")
-                    return
-                timestamps.append((time_in_seconds, line))
-            except ValueError:
-                QMessageBox.warning(self, "Error", f"Tiempo inválido en la línea {row + 1}")
-                return
-        
-        if not timestamps:
-            QMessageBox.warning(self, "Error", "No hay datos válidos para generar SRT")
+        formats = [fmt for fmt, check in self.format_checks.items() if check.isChecked()]
+        if not formats:
+            QMessageBox.warning(self, "Error", "Marca al menos un formato de exportación")
             return
-            
-        timestamps.sort()
+
+        # Los errores se muestran antes de pedir la ruta; export_subtitles valida de nuevo al escribir
+        try:
+            _, _, lines = cue_intervals(self.cues.texts, self.cues.starts, self.cues.ends, self.duration)
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", str(e))
+            return
+
+        if not lines:
+            QMessageBox.warning(self, "Error", "No hay datos válidos para generar subtítulos")
+            return
+
         base_name = os.path.splitext(os.path.basename(self.media_file or "output"))[0]
+        extension = FORMATS[formats[0]][0]
         output_file, _ = QFileDialog.getSaveFileName(
-            self, "Guardar archivo SRT", f"{base_name}.srt",
-            "SubRip Subtitle (*.srt)")
+            self, "Guardar subtítulos", f"{base_name}{extension}",
+            ";;".join(f"{FORMATS[fmt][2]} (*{FORMATS[fmt][0]})" for fmt in formats))
         if output_file:
             try:
-                with open(output_file, "w", encoding="utf-8") as file:
-                    # Agregar metadatos de estilo al inicio del SRT
-                    file.write(f"## Subtitle Style\n")
-                    file.write(f"# Font: {self.subtitle_font.family()}\n")
-                    file.write(f"# Size: {self.subtitle_font.pointSize()}\n")
-                    file.write(f"# Color: {self.subtitle_color.name()}\n\n")
-                    
-                    # Generar entradas SRT
-                    for i, (start_time, line) in enumerate(timestamps, 1):
-                        end_time = (timestamps[i][0] - 0.001 if i < len(timestamps) 
-                                  else min(self.duration, start_time + 5.0))
-                        file.write(f"{i}\n"
-                                 f"{segundos_a_timestamp(start_time)} --> "
-                                 f"{segundos_a_timestamp(end_time)}\n"
-                                 f"{line}\n\n")
-                QMessageBox.information(self, "Éxito", f"Archivo SRT guardado como:\n{output_file}")
+                style = {
+                    "font": self.subtitle_font.family(),
+                    "size": self.subtitle_font.pointSize(),
+                    "color": self.subtitle_color.name(),
+                }
+                # Solo la escritura: el diálogo de guardar no cuenta en el perfilado
+                with profiler.span("generate_srt", formats=",".join(formats)):
+                    paths = export_subtitles(output_file, formats, self.cues.texts, self.cues.starts,
+                                             self.cues.ends, self.duration, style)
+                QMessageBox.information(self, "Éxito", "Subtítulos guardados como:\n" + "\n".join(paths))
             except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error al guardar SRT:\n{str(e)}")
-            finally:
-                self.cleanup_temp_file()  # Limpiar archivo temporal al guardar
+                QMessageBox.critical(self, "Error", f"Error al guardar los subtítulos:\n{str(e)}")
+
+    def update_profile_panel(self):
+        stats = profiler.stats
+        parts = []
+        tick = stats.get("ui.pass")
+        if tick:
+            count, total, longest, _ = tick
+            parts.append(f"Tick: {total / count * 1e6:.0f} µs de media, {longest * 1e6:.0f} µs máx.")
+        load = [f"{name} {stats[name][3] * 1000:.0f} ms" for name in PROFILE_LOAD_STAGES if name in stats]
+        if load:
+            parts.append("Última carga: " + " · ".join(load))
+        self.profile_label.setText("   |   ".join(parts) or "Perfilado activo")
 
     def closeEvent(self, event):
-        """Sobrescribe el cierre para limpiar archivos temporales."""
-        self.cleanup_temp_file()
+        """Sobrescribe el cierre para cancelar el análisis en curso."""
+        self.cancel_load_task()
+        self.cancel_alignment()
         super().closeEvent(event)
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    # En el ejecutable de PyInstaller los procesos del análisis en paralelo
+    # vuelven a entrar aquí: freeze_support los desvía antes de abrir otra ventana
+    multiprocessing.freeze_support()
+    app = QApplication(enable_from_args(sys.argv))
     window = AudioSync()
     window.show()
+    # Precargar las bibliotecas de audio cuando la ventana ya está pintada
+    QTimer.singleShot(0, preload_in_background)
     sys.exit(app.exec())
\ No newline at end of file
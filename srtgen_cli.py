@@ -0,0 +1,155 @@
+"""Generación de subtítulos sin interfaz gráfica, para servidores y procesos por lotes.
+
+Uso:
+    python srtgen_cli.py AUDIO LETRAS [-o SALIDA.srt] [--formats srt vtt ass lrc]
+    python srtgen_cli.py --manifest LOTE.tsv [--jobs N]
+
+El manifiesto tiene una pareja por línea separada por tabuladores:
+audio, letras y opcionalmente la ruta de salida. Las rutas relativas se
+resuelven respecto al manifiesto y las líneas que empiezan por "#" se ignoran.
+
+Este módulo no importa PyQt.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from alignment import suggest_times
+from audio_analysis import FRAME_LENGTH, HOP_LENGTH, analyze_silences, audio_duration
+from exporters import FORMATS, export_subtitles
+from profiling import DEFAULT_TRACE, PROFILE_ENV, enable_from_args, profiler, traced
+from subtitle_io import read_lyrics
+
+
+def default_output(audio_path):
+    return os.path.splitext(audio_path)[0] + ".srt"
+
+
+@traced("generate")
+def generate(audio_path, lyrics_path, output_path=None, top_db=20, min_gap=0.0,
+             frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH, workers=1, formats=("srt",)):
+    """Alinea las letras con el audio y escribe un archivo por formato; devuelve las rutas.
+
+    top_db, min_gap, frame_length, hop_length y workers se pasan a analyze_silences.
+    """
+    output_path = output_path or default_output(audio_path)
+    lyrics = read_lyrics(lyrics_path)
+    if not lyrics:
+        raise ValueError(f"{lyrics_path}: no hay letras para generar SRT")
+    duration = audio_duration(audio_path)
+    segments = analyze_silences(audio_path, top_db=top_db, min_gap=min_gap,
+                                frame_length=frame_length, hop_length=hop_length,
+                                workers=workers)
+    starts = suggest_times(segments, lyrics, duration)
+    return export_subtitles(output_path, formats, lyrics, starts, None, duration)
+
+
+def read_manifest(manifest_path):
+    """Devuelve las tareas (audio, letras, salida o None) del manifiesto."""
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    jobs = []
+    with open(manifest_path, "r", encoding="utf-8") as file:
+        for number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split("\t")
+            if len(fields) not in (2, 3):
+                raise ValueError(f"{manifest_path}:{number}: se esperaban 2 o 3 campos separados por tabuladores")
+            paths = [os.path.join(base, field.strip()) for field in fields]
+            jobs.append((paths[0], paths[1], paths[2] if len(paths) == 3 else None))
+    return jobs
+
+
+def run_batch(jobs, workers=1, options=None):
+    """Procesa las tareas, en paralelo si workers > 1; devuelve el número de fallos.
+
+    options es un diccionario con los parámetros opcionales de generate().
+    """
+    options = options or {}
+    failures = 0
+    if workers <= 1:
+        results = ((job, _safe_generate(*job, options)) for job in jobs)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        futures = [(job, pool.submit(_safe_generate, *job, options)) for job in jobs]
+        results = ((job, future.result()) for job, future in futures)
+    for (audio_path, _, _), (output_paths, error) in results:
+        if error:
+            failures += 1
+            print(f"Error en {audio_path}: {error}", file=sys.stderr)
+        else:
+            print("\n".join(output_paths))
+    if workers > 1:
+        pool.shutdown()
+    return failures
+
+
+def _safe_generate(audio_path, lyrics_path, output_path, options):
+    try:
+        return generate(audio_path, lyrics_path, output_path, **options), None
+    except Exception as e:
+        return None, str(e)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="srtgen", description="Genera subtítulos a partir de audio y letras.")
+    parser.add_argument("audio", nargs="?", help="archivo de audio")
+    parser.add_argument("lyrics", nargs="?", help="archivo de letras (una línea por subtítulo)")
+    parser.add_argument("-o", "--output",
+                        help="archivo de salida (por defecto, junto al audio); cada formato pone su extensión")
+    parser.add_argument("-f", "--formats", nargs="+", choices=list(FORMATS), default=["srt"],
+                        help="formatos a escribir (por defecto solo srt)")
+    parser.add_argument("--manifest", help="archivo con una pareja audio/letras por línea")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="procesos en paralelo (por defecto 1): archivos del lote, o tramos "
+                             "que se decodifican a la vez en una grabación larga")
+    parser.add_argument("--top-db", type=float, default=20,
+                        help="umbral de silencio en dB por debajo del pico (por defecto 20)")
+    parser.add_argument("--min-gap", type=float, default=0.0,
+                        help="silencios más cortos que estos segundos no separan segmentos")
+    parser.add_argument("--frame-length", type=int, default=FRAME_LENGTH,
+                        help=f"muestras por trama de energía (por defecto {FRAME_LENGTH})")
+    parser.add_argument("--hop-length", type=int, default=HOP_LENGTH,
+                        help=f"muestras entre tramas consecutivas (por defecto {HOP_LENGTH})")
+    # --profile no lleva valor: con nargs="?" se tragaría AUDIO como ruta de la línea de tiempo
+    parser.add_argument("--profile", action="store_true",
+                        help=f"mide cada etapa y escribe la línea de tiempo (Chrome trace); también con {PROFILE_ENV}")
+    parser.add_argument("--profile-output", metavar="RUTA",
+                        help=f"archivo de la línea de tiempo (por defecto {DEFAULT_TRACE}); implica --profile. "
+                             "Solo se sobrescribe si es una línea de tiempo anterior")
+    args = parser.parse_args(argv)
+
+    if args.manifest:
+        if args.audio or args.lyrics or args.output:
+            parser.error("--manifest no admite AUDIO, LETRAS ni --output")
+        jobs = read_manifest(args.manifest)
+        workers = max(1, min(args.jobs, len(jobs)))
+    elif args.audio and args.lyrics:
+        jobs = [(args.audio, args.lyrics, args.output)]
+        workers = 1
+    else:
+        parser.error("indica AUDIO y LETRAS, o --manifest")
+    # Solo con los argumentos ya validados: un error no debe dejar escrita la línea de tiempo
+    if args.profile or args.profile_output:
+        try:
+            profiler.enable(args.profile_output)
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        enable_from_args([])
+    options = {"top_db": args.top_db, "min_gap": args.min_gap,
+               "frame_length": args.frame_length, "hop_length": args.hop_length,
+               # Un solo archivo: los procesos se usan para analizarlo por tramos
+               "workers": max(1, args.jobs) if workers == 1 else 1,
+               "formats": args.formats}
+    return 1 if run_batch(jobs, workers, options) else 0
+
+
+if __name__ == "__main__":
+    # Necesario para los procesos de ProcessPoolExecutor en un ejecutable congelado
+    multiprocessing.freeze_support()
+    sys.exit(main())
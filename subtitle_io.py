@@ -0,0 +1,200 @@
+"""Lectura de letras y subtítulos y preparación de los tiempos a exportar, sin dependencias de la interfaz."""
+import re
+from collections import namedtuple
+
+import numpy as np
+
+from profiling import traced
+
+# Duración máxima de la última línea, que no tiene siguiente inicio
+LAST_CUE_DURATION = 5.0
+
+# Separador entre bloques: una o más líneas en blanco
+_BLANK_LINES = re.compile(r"(\n(?:[^\S\n]*\n)+)")
+# Línea de tiempos de SRT (00:01:02,345) o WebVTT (01:02.345, con ajustes opcionales)
+_TIMING = re.compile(
+    r"[^\S\n]*(?:(\d+):)?(\d{1,2}):(\d{2})[,.](\d{3})[^\S\n]+-->[^\S\n]+"
+    r"(?:(\d+):)?(\d{1,2}):(\d{2})[,.](\d{3})(?:[^\S\n].*)?$")
+# Forma habitual "HH:MM:SS,mmm --> HH:MM:SS,mmm", que se convierte por posiciones
+_TIMING_WIDTH = 29
+_TIMING_DIGITS = [0, 1, 3, 4, 6, 7, 9, 10, 11, 17, 18, 20, 21, 23, 24, 26, 27, 28]
+_TIMING_LITERALS = {2: ":", 5: ":", 12: " ", 13: "-", 14: "-", 15: ">", 16: " ", 19: ":", 22: ":"}
+# Cabecera de estilo que escribían las versiones anteriores en los SRT
+_STYLE_HEADER = "## Subtitle Style"
+_STYLE_FIELD = re.compile(r"^# (Font|Size|Color): ?(.*?)[^\S\n]*$", re.M)
+# Propiedades del bloque STYLE "::cue { ... }" de WebVTT
+_CSS_FIELD = re.compile(r"(font-family|font-size|color)\s*:\s*\"?([^\";}]*?)\"?\s*(?:;|})")
+# Bloques de WebVTT que no son subtítulos
+_VTT_BLOCKS = ("WEBVTT", "NOTE", "STYLE", "REGION")
+
+# Resultado de read_subtitles; errors son pares (número de línea, mensaje)
+ImportedSubtitles = namedtuple("ImportedSubtitles", "texts starts ends style errors")
+
+
+def read_lyrics(file_path):
+    """Lee un archivo de texto con una línea por subtítulo, ignorando las vacías."""
+    with open(file_path, "r", encoding="utf-8") as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+@traced("import")
+def read_subtitles(file_path):
+    """Importa un archivo SRT o WebVTT con sus tiempos de inicio y fin.
+
+    El archivo se lee de una vez y se parte en bloques por las líneas en
+    blanco; las líneas de tiempos con la forma habitual se convierten todas a
+    la vez con numpy por posiciones y el resto con una expresión regular
+    precompilada. El estilo (la antigua cabecera "## Subtitle Style" de los
+    SRT o el bloque STYLE ::cue de WebVTT) se devuelve como diccionario en
+    style. Los bloques mal formados no detienen la importación: se omiten y
+    se anotan en errors con su número de línea.
+    """
+    with open(file_path, "r", encoding="utf-8-sig") as file:
+        buffer = file.read()
+    if "\r" in buffer:
+        buffer = buffer.replace("\r\n", "\n").replace("\r", "\n")
+    parts = _BLANK_LINES.split(buffer)
+    blocks = parts[0::2]
+
+    timings, texts, rows, problems = [], [], [], []
+    style = None
+    for i, block in enumerate(blocks):
+        # Los tiempos van en la primera línea o tras el número/identificador
+        head, _, rest = block.partition("\n")
+        if "-->" in head:
+            timing, text, before = head, rest, 0
+        else:
+            timing, _, text = rest.partition("\n")
+            before = 1
+            if "-->" not in timing:
+                body = block.strip()
+                if not body:
+                    continue
+                if body.startswith(_STYLE_HEADER) and style is None:
+                    style = _parse_style(body)
+                elif body.startswith("STYLE") and "::cue" in body and style is None:
+                    style = _parse_css_style(body)
+                elif not body.startswith(_VTT_BLOCKS):
+                    problems.append((i, 0, "bloque sin línea de tiempos"))
+                continue
+        if "-->" in text:
+            # Una flecha en el texto es válida; solo una línea de tiempos indica dos subtítulos pegados
+            merged = [j for j, line in enumerate(text.split("\n")) if "-->" in line and _TIMING.match(line)]
+            if merged:
+                problems.append((i, before + 1 + merged[0], "falta la línea en blanco entre dos subtítulos"))
+                continue
+        timings.append(timing)
+        texts.append(text)
+        rows.append((i, before))
+
+    fields, parsed = _parse_timings(timings)
+    for k in np.flatnonzero(~parsed):
+        problems.append((*rows[k], "línea de tiempos no válida"))
+    out_of_range = parsed & ((fields[:, [1, 2, 5, 6]] > 59).any(axis=1))
+    seconds = fields[:, [0, 4]] * 3600 + fields[:, [1, 5]] * 60 + fields[:, [2, 6]] + fields[:, [3, 7]] / 1000
+    reversed_ = parsed & ~out_of_range & (seconds[:, 1] < seconds[:, 0])
+    for k in np.flatnonzero(out_of_range):
+        problems.append((*rows[k], "tiempo fuera de rango"))
+    for k in np.flatnonzero(reversed_):
+        problems.append((*rows[k], "el fin es anterior al inicio"))
+    valid = parsed & ~out_of_range & ~reversed_
+    texts = [text.strip() for text, ok in zip(texts, valid.tolist()) if ok]
+    errors = _line_numbers(parts, problems)
+    return ImportedSubtitles(texts, seconds[valid, 0], seconds[valid, 1], style, errors)
+
+
+def _parse_timings(timings):
+    """Convierte las líneas de tiempos en una matriz (n, 8) de h, m, s, ms de inicio y fin.
+
+    Devuelve también qué líneas se pudieron leer. Los tiempos de WebVTT sin
+    horas quedan con hora 0; el rango de minutos y segundos se valida fuera.
+    """
+    count = len(timings)
+    fields = np.zeros((count, 8), dtype=np.int64)
+    parsed = np.zeros(count, dtype=bool)
+    if not count:
+        return fields, parsed
+    lengths = np.fromiter(map(len, timings), dtype=np.int64, count=count)
+    chars = np.array(timings, dtype=f"U{_TIMING_WIDTH}").view(np.uint32).reshape(count, _TIMING_WIDTH)
+    fast = lengths == _TIMING_WIDTH
+    for column, literal in _TIMING_LITERALS.items():
+        fast &= chars[:, column] == ord(literal)
+    fast &= np.isin(chars[:, 8], [ord(","), ord(".")]) & np.isin(chars[:, 25], [ord(","), ord(".")])
+    digits = chars[:, _TIMING_DIGITS].astype(np.int64) - ord("0")
+    fast &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+    d = digits[fast]
+    fields[fast] = np.column_stack((
+        d[:, 0] * 10 + d[:, 1], d[:, 2] * 10 + d[:, 3], d[:, 4] * 10 + d[:, 5],
+        d[:, 6] * 100 + d[:, 7] * 10 + d[:, 8],
+        d[:, 9] * 10 + d[:, 10], d[:, 11] * 10 + d[:, 12], d[:, 13] * 10 + d[:, 14],
+        d[:, 15] * 100 + d[:, 16] * 10 + d[:, 17]))
+    parsed |= fast
+    # Resto de formas (WebVTT sin horas, ajustes de posición...): una a una
+    for k in np.flatnonzero(~fast):
+        match = _TIMING.match(timings[k])
+        if match is not None:
+            fields[k] = [int(value or 0) for value in match.groups()]
+            parsed[k] = True
+    return fields, parsed
+
+
+def _line_numbers(parts, problems):
+    """Convierte (bloque, línea dentro del bloque, mensaje) en (número de línea, mensaje)."""
+    if not problems:
+        return []
+    starts = np.cumsum([1] + [part.count("\n") for part in parts])[0::2]
+    return [(int(starts[block]) + line, message) for block, line, message in sorted(problems)]
+
+
+def _parse_css_style(body):
+    fields = dict(_CSS_FIELD.findall(body))
+    style = {}
+    if fields.get("font-family"):
+        style["font"] = fields["font-family"]
+    size = fields.get("font-size", "")
+    if size.endswith("pt") and size[:-2].isdigit():
+        style["size"] = int(size[:-2])
+    if fields.get("color"):
+        style["color"] = fields["color"]
+    return style
+
+
+def _parse_style(body):
+    fields = dict(_STYLE_FIELD.findall(body))
+    style = {}
+    if fields.get("Font"):
+        style["font"] = fields["Font"]
+    if fields.get("Size", "").isdigit():
+        style["size"] = int(fields["Size"])
+    if fields.get("Color"):
+        style["color"] = fields["Color"]
+    return style
+
+
+@traced("cue_intervals")
+def cue_intervals(texts, starts, ends, duration):
+    """Devuelve (inicios, fines, líneas) ordenados por inicio, omitiendo las líneas vacías.
+
+    Un fin vacío (NaN) dura hasta el siguiente inicio; el de la última línea,
+    como mucho LAST_CUE_DURATION segundos. Ningún fin pasa de duration.
+    Lanza ValueError si alguna línea con texto tiene un inicio vacío o fuera
+    del rango [0, duration].
+    """
+    lines = [line.strip() for line in texts]
+    has_text = np.array([bool(line) for line in lines], dtype=bool)
+    starts = np.asarray(starts, dtype=np.float64)
+    # Comparaciones con NaN dan False: los tiempos vacíos también son inválidos
+    invalid = has_text & ~((starts >= 0) & (starts <= duration))
+    if invalid.any():
+        raise ValueError(f"Tiempo inválido en la línea {int(np.argmax(invalid)) + 1}")
+    rows = np.flatnonzero(has_text)
+    rows = rows[np.argsort(starts[rows], kind="stable")]
+    cue_starts = starts[rows]
+    if not len(rows):
+        return cue_starts, cue_starts.copy(), []
+    following = np.append(cue_starts[1:] - 0.001,
+                          min(duration, cue_starts[-1] + LAST_CUE_DURATION))
+    cue_ends = following if ends is None else np.asarray(ends, dtype=np.float64)[rows]
+    cue_ends = np.where(np.isnan(cue_ends), following, cue_ends)
+    cue_ends = np.clip(cue_ends, cue_starts, duration)
+    return cue_starts, cue_ends, [lines[row] for row in rows]
@@ -0,0 +1,10 @@
+"""Los módulos de la aplicación están en la raíz del repositorio, sin paquete.
+
+benchmarks/ también se añade para compartir los generadores de benchmarks/synth.py.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+sys.path.insert(0, ROOT)
@@ -0,0 +1,102 @@
+"""Precisión de align_lines sobre segmentos sintéticos."""
+import numpy as np
+import pytest
+
+from alignment import BAND_WIDTH, align_lines, suggest_times
+from synth import lyric_fixture, tone_burst_cues, write_tone_bursts
+
+
+def make_fixture(count, seed=0, breath_prob=0.15, join_prob=0.15):
+    """Líneas, segmentos detectados y los inicios reales de las primeras count ráfagas.
+
+    Usa las mismas ráfagas y letras que los benchmarks (benchmarks/synth.py).
+    """
+    cues = tone_burst_cues(4.0 * count, seed)[:count]
+    assert len(cues) == count
+    lines, segments = lyric_fixture(cues, seed, breath_prob=breath_prob, join_prob=join_prob)
+    return lines, segments, np.array([start for start, _ in cues])
+
+
+def test_one_segment_per_line_is_exact():
+    lines, segments, truth = make_fixture(50, breath_prob=0.0, join_prob=0.0)
+    starts, ends = align_lines(segments, lines, segments[-1][1] + 2)
+    np.testing.assert_allclose(starts, truth)
+    np.testing.assert_allclose(ends, [end for _, end in segments])
+
+
+def test_breath_merges_segments():
+    lines = ["a" * 30, "b" * 15]
+    segments = [(1.0, 1.9), (2.1, 3.0), (4.0, 5.0)]
+    starts, ends = align_lines(segments, lines, 6.0)
+    np.testing.assert_allclose(starts, [1.0, 4.0])
+    np.testing.assert_allclose(ends, [3.0, 5.0])
+
+
+def test_lines_split_one_segment_by_length():
+    lines = ["a" * 15, "b" * 30, "c" * 15]
+    segments = [(1.0, 2.0), (3.0, 6.0)]
+    starts, ends = align_lines(segments, lines, 7.0)
+    np.testing.assert_allclose(starts, [1.0, 3.0, 5.0])
+    np.testing.assert_allclose(ends, [2.0, 5.0, 6.0])
+
+
+def first_segment_starts(segments, count):
+    """Asignación anterior a align_lines: el inicio del segmento i para la línea i."""
+    return np.array([start for start, _ in segments[:count]])
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_mismatched_segments_stay_accurate(seed):
+    lines, segments, truth = make_fixture(300, seed)
+    assert len(segments) != len(lines)
+    starts, ends = align_lines(segments, lines, segments[-1][1] + 2)
+    errors = np.abs(starts - truth)
+    # El mismo límite que benchmarks/bench_alignment.py sobre audio real
+    assert errors.mean() < 0.25
+    assert np.median(errors) < 0.01
+    count = min(len(lines), len(segments))
+    naive = np.abs(first_segment_starts(segments, count) - truth[:count])
+    assert errors.mean() < naive.mean() / 4
+    assert np.all(np.diff(starts) > 0)
+    assert np.all(ends >= starts)
+
+
+def test_band_covers_long_transcripts():
+    # Muchas más líneas que el semiancho de la banda
+    lines, segments, truth = make_fixture(4 * BAND_WIDTH, seed=7)
+    starts, _ = align_lines(segments, lines, segments[-1][1] + 2)
+    errors = np.abs(starts - truth)
+    assert errors.mean() < 0.25
+    assert np.median(errors) < 0.01
+
+
+def test_without_segments_lines_are_spread_evenly():
+    starts, ends = align_lines([], ["a", "b", "c"], 8.0)
+    np.testing.assert_allclose(starts, [2.0, 4.0, 6.0])
+    np.testing.assert_allclose(ends, [4.0, 6.0, 8.0])
+
+
+def test_without_lines():
+    starts, ends = align_lines([(0.0, 1.0)], [])
+    assert len(starts) == len(ends) == 0
+
+
+def test_suggest_times_returns_starts():
+    lines, segments, truth = make_fixture(20, breath_prob=0.0, join_prob=0.0)
+    assert suggest_times(segments, lines, 60.0) == pytest.approx(truth.tolist())
+
+
+def test_suggest_times_on_detected_silences(tmp_path):
+    # De punta a punta: audio sintético, detección de silencios y alineación
+    from audio_analysis import AudioCache, analyze_silences
+
+    path = str(tmp_path / "bursts.wav")
+    cues = write_tone_bursts(path, 60)
+    lines, _ = lyric_fixture(cues)
+    segments = analyze_silences(path, cache=AudioCache())
+    starts = suggest_times(segments, lines, 60.0)
+    errors = np.abs(np.array(starts) - [start for start, _ in cues])
+    # Un salto de análisis (512 muestras a 22050 Hz) son 23 ms; la trama de
+    # 2048 muestras adelanta cada inicio detectado uno o dos saltos
+    assert errors.mean() < 0.05
+    assert errors.max() < 0.1
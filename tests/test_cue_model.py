@@ -0,0 +1,62 @@
+"""CueTableModel: los cambios de inicio de una fila mueven su fin y se deshacen juntos."""
+import numpy as np
+import pytest
+
+pytest.importorskip("PyQt6.QtCore")
+
+from cue_model import TIME_COLUMN, CueTableModel  # noqa: E402
+from subtitle_io import cue_intervals  # noqa: E402
+
+
+@pytest.fixture
+def model():
+    model = CueTableModel()
+    model.load(["uno", "dos", "tres"], [10.0, 20.0, 30.0], [12.0, np.nan, 33.0])
+    return model
+
+
+def test_start_edit_moves_imported_end(model):
+    model.set_start(0, 15.0)
+    assert model.store.starts[0] == 15.0
+    assert model.store.ends[0] == 17.0
+    starts, ends, _ = cue_intervals(model.store.texts, model.store.starts, model.store.ends, 60.0)
+    np.testing.assert_allclose(starts, [15.0, 20.0, 30.0])
+    np.testing.assert_allclose(ends, [17.0, 29.999, 33.0])
+
+
+def test_start_edit_keeps_open_end(model):
+    model.set_start(1, 22.5)
+    assert np.isnan(model.store.ends[1])
+
+
+def test_start_edit_undo_restores_start_and_end(model):
+    model.setData(model.index(2, TIME_COLUMN), "31.5")
+    assert model.store.ends[2] == 34.5
+    assert model.undo() == "Editar tiempo"
+    assert model.store.starts[2] == 30.0
+    assert model.store.ends[2] == 33.0
+    model.redo()
+    assert model.store.starts[2] == 31.5
+    assert model.store.ends[2] == 34.5
+
+
+def test_invalid_time_is_rejected(model):
+    assert not model.setData(model.index(0, TIME_COLUMN), "abc")
+    assert not model.history.can_undo()
+
+
+@pytest.mark.parametrize("text", ["-5", "-0.001", "inf", "-inf", "1e400"])
+def test_negative_and_infinite_times_are_rejected(model, text):
+    assert not model.setData(model.index(0, TIME_COLUMN), text)
+    assert model.store.starts[0] == 10.0
+    assert model.store.active_row(10.5) == 0
+    assert not model.history.can_undo()
+
+
+@pytest.mark.parametrize("text", ["", "  ", "nan"])
+def test_empty_or_nan_clears_the_time(model, text):
+    assert model.setData(model.index(1, TIME_COLUMN), text)
+    assert np.isnan(model.store.starts[1])
+    assert model.store.active_row(25.0) == 0
+    model.undo()
+    assert model.store.starts[1] == 20.0
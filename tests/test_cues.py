@@ -0,0 +1,90 @@
+"""CueIndex y CueStore: empates, filas sin tiempo y coherencia con el recorrido lineal."""
+import random
+
+import numpy as np
+import pytest
+
+from cues import CueIndex, CueStore, parse_time
+
+
+def linear_active_row(starts, current_time):
+    """Recorrido lineal de la tabla: el mayor inicio <= current_time, la fila más baja en empates."""
+    best = None
+    for row, start in enumerate(starts):
+        if start is None or np.isnan(start) or start > current_time:
+            continue
+        if best is None or start > starts[best]:
+            best = row
+    return best
+
+
+def test_ties_resolve_to_lowest_row():
+    index = CueIndex()
+    index.rebuild([(0, 1.0), (1, 2.0), (2, 2.0), (3, 2.0), (4, 3.0)])
+    assert index.active_row(2.0) == 1
+    assert index.active_row(2.5) == 1
+    index.update(1, None)
+    assert index.active_row(2.5) == 2
+    index.update(1, 2.0)
+    assert index.active_row(2.5) == 1
+
+
+def test_update_inserts_tie_in_row_order():
+    index = CueIndex()
+    index.rebuild([(0, 1.0), (2, 1.0), (4, 1.0)])
+    index.update(3, 1.0)
+    index.update(1, 1.0)
+    assert index.rows == [0, 1, 2, 3, 4]
+    assert index.active_row(1.0) == 0
+
+
+def test_rows_without_time_are_ignored():
+    index = CueIndex()
+    index.rebuild([(0, None), (1, 1.0), (2, None), (3, 2.0)])
+    assert len(index) == 2
+    assert index.active_row(0.5) is None
+    assert index.active_row(1.5) == 1
+    index.update(0, None)
+    assert len(index) == 2
+
+
+def test_rebuild_array_skips_nan():
+    index = CueIndex()
+    index.rebuild_array([np.nan, 2.0, 1.0, np.nan, 2.0])
+    assert index.starts == [1.0, 2.0, 2.0]
+    assert index.rows == [2, 1, 4]
+    assert index.active_row(0.0) is None
+    assert index.active_row(2.0) == 1
+
+
+def test_matches_linear_scan_after_random_edits():
+    rng = random.Random(0)
+    starts = [rng.choice([None, rng.randint(0, 20) / 2]) for _ in range(60)]
+    index = CueIndex()
+    index.rebuild(enumerate(starts))
+    for _ in range(500):
+        row = rng.randrange(len(starts))
+        starts[row] = rng.choice([None, rng.randint(0, 20) / 2])
+        index.update(row, starts[row])
+        current_time = rng.uniform(-1, 11)
+        assert index.active_row(current_time) == linear_active_row(starts, current_time)
+
+
+def test_store_keeps_index_in_sync():
+    store = CueStore()
+    store.set_cues(["a", "b", "c"], [1.0, np.nan, 3.0])
+    assert store.active_row(2.0) == 0
+    store.set_start(1, 2.0)
+    assert store.active_row(2.5) == 1
+    store.set_start(1, None)
+    assert np.isnan(store.starts[1])
+    assert store.active_row(2.5) == 0
+    store.set_times([0, 2], [5.0, np.nan], [6.0, np.nan])
+    assert store.active_row(4.0) is None
+    assert store.active_row(5.5) == 0
+    np.testing.assert_array_equal(store.ends, [6.0, np.nan, np.nan])
+
+
+@pytest.mark.parametrize("text, expected", [("1.5", 1.5), (" 2 ", 2.0), ("", None), ("abc", None), (None, None)])
+def test_parse_time(text, expected):
+    assert parse_time(text) == expected
@@ -0,0 +1,49 @@
+"""Decodificación por tramos en varios procesos frente a la lectura en serie."""
+import numpy as np
+import pytest
+
+import audio_analysis
+import parallel_analysis
+from audio_analysis import AudioCache, energy_envelope, envelope_cache, iter_mono_blocks
+from parallel_analysis import iter_parallel_blocks
+from synth import write_tone_bursts
+
+
+@pytest.fixture(autouse=True)
+def short_chunks(monkeypatch):
+    # Tramos de 3 s para tener varias fronteras en una pista corta
+    monkeypatch.setattr(parallel_analysis, "CHUNK_SECONDS", 3)
+
+
+def decode_both(path):
+    serial = np.concatenate(list(iter_mono_blocks(path)))
+    parallel = np.concatenate(list(iter_parallel_blocks(path, workers=2)))
+    return serial, parallel
+
+
+def test_same_rate_is_identical(tmp_path):
+    path = str(tmp_path / "mono.wav")
+    write_tone_bursts(path, 10.3)
+    serial, parallel = decode_both(path)
+    np.testing.assert_array_equal(parallel, serial)
+
+
+def test_resampled_stereo_matches(tmp_path):
+    path = str(tmp_path / "stereo.flac")
+    write_tone_bursts(path, 10.3, sr=48000, channels=2)
+    serial, parallel = decode_both(path)
+    assert len(parallel) == len(serial)
+    np.testing.assert_allclose(parallel, serial, atol=1e-5)
+
+
+def test_envelope_segments_match(tmp_path, monkeypatch):
+    path = str(tmp_path / "bursts.wav")
+    write_tone_bursts(path, 30, sr=44100)
+    envelope_cache.clear()
+    serial = energy_envelope(path, cache=AudioCache(max_bytes=0))
+    envelope_cache.clear()
+    monkeypatch.setattr(audio_analysis, "PARALLEL_MIN_SECONDS", 10)
+    parallel = energy_envelope(path, workers=2, cache=AudioCache(max_bytes=0))
+    envelope_cache.clear()
+    assert parallel.total_samples == serial.total_samples
+    assert parallel.segments() == serial.segments()
@@ -0,0 +1,59 @@
+"""Pirámide de picos: columnas por zoom y archivo de caché en disco."""
+import os
+
+import numpy as np
+import pytest
+
+from peaks import PEAK_BLOCK, PeakBuilder, PeakPyramid, build_peak_pyramid
+
+KEY = [1, 1000, 123, 22050, PEAK_BLOCK, 4]
+
+
+def sine(seconds=30, freq=440.0, sr=22050):
+    return np.sin(2 * np.pi * freq * np.arange(sr * seconds) / sr).astype(np.float32)
+
+
+@pytest.fixture
+def pyramid():
+    return build_peak_pyramid(np.array_split(sine(), 7))
+
+
+def test_builder_matches_single_block(pyramid):
+    signal = sine()
+    builder = PeakBuilder()
+    builder.add(signal)
+    whole = builder.build()
+    assert len(whole.levels) == len(pyramid.levels) > 1
+    for (a_min, a_max), (b_min, b_max) in zip(whole.levels, pyramid.levels):
+        np.testing.assert_array_equal(a_min, b_min)
+        np.testing.assert_array_equal(a_max, b_max)
+
+
+def test_save_and_load(tmp_path, pyramid):
+    path = str(tmp_path / "a.wav.peaks.npz")
+    pyramid.save(path, KEY)
+    loaded = PeakPyramid.load(path, KEY)
+    assert loaded is not None
+    np.testing.assert_array_equal(loaded.levels[-1][1], pyramid.levels[-1][1])
+    assert PeakPyramid.load(path, KEY[:-1] + [8]) is None
+    # Sin archivos temporales olvidados
+    assert os.listdir(tmp_path) == ["a.wav.peaks.npz"]
+
+
+@pytest.mark.parametrize("content", [b"", b"PK\x03\x04", b"basura"])
+def test_damaged_cache_is_a_miss(tmp_path, pyramid, content):
+    path = str(tmp_path / "a.wav.peaks.npz")
+    pyramid.save(path, KEY)
+    if content == b"PK\x03\x04":
+        # Escritura interrumpida: el principio de un archivo válido
+        with open(path, "rb") as file:
+            content = file.read()[:len(content) + 200]
+    with open(path, "wb") as file:
+        file.write(content)
+    assert PeakPyramid.load(path, KEY) is None
+
+
+def test_columns_cover_the_range(pyramid):
+    col_min, col_max = pyramid.columns(0.0, 30.0, 300)
+    assert len(col_min) == 300
+    assert np.all(col_max > 0.99) and np.all(col_min < -0.99)
@@ -0,0 +1,122 @@
+"""Operaciones de retiming en bloque y la historia de deshacer/rehacer."""
+import numpy as np
+import pytest
+
+import retiming
+from retiming import TimingDelta, TimingHistory
+
+NAN = np.nan
+
+
+def apply(times, rows, values):
+    times = times.copy()
+    times[rows] = values
+    return times
+
+
+def test_shift_keeps_nan_and_clamps_at_zero():
+    np.testing.assert_array_equal(retiming.shift([1.0, NAN, 0.2], -0.5), [0.5, NAN, 0.0])
+
+
+def test_scale_around_anchor():
+    np.testing.assert_allclose(retiming.scale([10.0, 20.0, NAN], 1.5, anchor=10.0), [10.0, 25.0, NAN])
+
+
+def test_sync_two_points_maps_both_points():
+    result = retiming.sync_two_points([1.0, 5.0, 9.0], (1.0, 2.0), (9.0, 18.0))
+    np.testing.assert_allclose(result, [2.0, 10.0, 18.0])
+    with pytest.raises(ValueError):
+        retiming.sync_two_points([1.0], (3.0, 1.0), (3.0, 2.0))
+
+
+def test_enforce_min_gap_orders_by_start():
+    starts = np.array([5.0, 1.0, NAN, 3.0])
+    ends = np.array([9.0, NAN, 4.0, 4.99])
+    result = retiming.enforce_min_gap(starts, ends, 0.1)
+    # Fila 1 (1 s) va antes que la 3 (3 s), y esta antes que la 0 (5 s); la última no cambia
+    np.testing.assert_allclose(result, [9.0, 2.9, 4.0, 4.9])
+
+
+def test_record_stores_only_changed_rows():
+    history = TimingHistory()
+    old = np.array([1.0, 2.0, NAN, 4.0, 5.0])
+    new = apply(old, [1, 2, 3], [2.5, 3.0, 4.5])
+    delta = history.record("Desplazar", old, new)
+    assert delta.rows == slice(1, 4)
+    np.testing.assert_array_equal(delta.old_starts, [2.0, NAN, 4.0])
+    np.testing.assert_array_equal(delta.new_starts, [2.5, 3.0, 4.5])
+    assert delta.old_ends is None and delta.new_ends is None
+
+
+def test_record_scattered_rows_and_ends():
+    history = TimingHistory()
+    starts = np.array([1.0, 2.0, 3.0, 4.0])
+    ends = np.array([NAN, 2.5, NAN, 4.5])
+    new_ends = apply(ends, [3], [4.25])
+    delta = history.record("Separación", starts, apply(starts, [0], [0.5]), ends, new_ends)
+    np.testing.assert_array_equal(delta.rows, [0, 3])
+    np.testing.assert_array_equal(delta.old_ends, [NAN, 4.5])
+    np.testing.assert_array_equal(delta.new_ends, [NAN, 4.25])
+
+
+def test_record_without_changes_returns_none():
+    history = TimingHistory()
+    times = np.array([1.0, NAN])
+    assert history.record("Nada", times, times.copy(), times, times.copy()) is None
+    assert not history.can_undo()
+
+
+def test_undo_redo_restores_arrays():
+    history = TimingHistory()
+    starts = np.array([1.0, 2.0, 3.0])
+    states = [starts]
+    for label, rows, values in [("a", [0], [1.5]), ("b", [1, 2], [2.5, 3.5]), ("c", [0, 2], [0.0, 9.0])]:
+        new = apply(states[-1], rows, values)
+        history.record(label, states[-1], new)
+        states.append(new)
+    current = states[-1].copy()
+    for expected in reversed(states[:-1]):
+        delta = history.undo()
+        current[delta.rows] = delta.old_starts
+        np.testing.assert_array_equal(current, expected)
+    assert history.undo() is None
+    for expected in states[1:]:
+        delta = history.redo()
+        current[delta.rows] = delta.new_starts
+        np.testing.assert_array_equal(current, expected)
+    assert history.redo() is None
+
+
+def test_new_change_clears_redo():
+    history = TimingHistory()
+    history.record("a", np.array([1.0]), np.array([2.0]))
+    history.undo()
+    assert history.can_redo()
+    history.record("b", np.array([1.0]), np.array([3.0]))
+    assert not history.can_redo()
+    assert history.undo().label == "b"
+    assert not history.can_undo()
+
+
+def test_memory_limit_drops_oldest_but_keeps_last():
+    row = np.zeros(1000)
+    delta_bytes = 2 * row.nbytes
+    history = TimingHistory(max_bytes=3 * delta_bytes)
+    for k in range(5):
+        history.push(TimingDelta(str(k), slice(0, 1000), row, row + k + 1, None, None))
+    labels = []
+    while history.can_undo():
+        labels.append(history.undo().label)
+    assert labels == ["4", "3", "2"]
+    # Un paso mayor que el límite se conserva para poder deshacerlo
+    history = TimingHistory(max_bytes=1)
+    history.push(TimingDelta("grande", slice(0, 1000), row, row + 1, None, None))
+    assert history.can_undo()
+
+
+def test_clear():
+    history = TimingHistory()
+    history.record("a", np.array([1.0]), np.array([2.0]))
+    history.undo()
+    history.clear()
+    assert not history.can_undo() and not history.can_redo()
@@ -0,0 +1,141 @@
+"""Exportación a cada formato y vuelta a leer: textos, tiempos y estilo."""
+import re
+
+import numpy as np
+import pytest
+
+from exporters import FORMATS, export_subtitles
+from subtitle_io import LAST_CUE_DURATION, cue_intervals, read_subtitles
+
+STYLE = {"font": "DejaVu Sans", "size": 18, "color": "#ffcc00"}
+DURATION = 60.0
+
+
+@pytest.fixture
+def cues():
+    """Subtítulos desordenados, con saltos de línea, una línea vacía y fines vacíos."""
+    texts = ["Segunda línea con ñ", "Primera\ncon dos líneas", "", "Tercera --> flecha", "Última"]
+    starts = np.array([4.25, 1.0, 2.0, 7.5, 12.125])
+    ends = np.array([6.5, np.nan, np.nan, 9.004, np.nan])
+    return texts, starts, ends
+
+
+@pytest.fixture
+def expected(cues):
+    texts, starts, ends = cues
+    return cue_intervals(texts, starts, ends, DURATION)
+
+
+@pytest.fixture
+def exported(tmp_path, cues):
+    texts, starts, ends = cues
+    paths = export_subtitles(str(tmp_path / "salida.srt"), list(FORMATS), texts, starts, ends,
+                             DURATION, STYLE)
+    return {path.rsplit(".", 1)[1]: path for path in paths}
+
+
+def read(path):
+    with open(path, encoding="utf-8") as file:
+        return file.read()
+
+
+def test_cue_intervals_sorts_and_fills_ends(expected):
+    starts, ends, lines = expected
+    np.testing.assert_allclose(starts, [1.0, 4.25, 7.5, 12.125])
+    np.testing.assert_allclose(ends, [4.249, 6.5, 9.004, 12.125 + LAST_CUE_DURATION])
+    assert lines == ["Primera\ncon dos líneas", "Segunda línea con ñ", "Tercera --> flecha", "Última"]
+
+
+def test_cue_intervals_clips_to_duration():
+    starts, ends, _ = cue_intervals(["a", "b"], [1.0, 9.0], [20.0, np.nan], 10.0)
+    np.testing.assert_allclose(ends, [10.0, 10.0])
+
+
+@pytest.mark.parametrize("start", [np.nan, -1.0, 61.0])
+def test_cue_intervals_rejects_invalid_start(start):
+    with pytest.raises(ValueError, match="línea 2"):
+        cue_intervals(["a", "b"], [1.0, start], None, DURATION)
+
+
+def test_srt_round_trip(exported, expected):
+    starts, ends, lines = expected
+    imported = read_subtitles(exported["srt"])
+    assert imported.errors == []
+    assert imported.texts == lines
+    np.testing.assert_allclose(imported.starts, starts, atol=5e-4)
+    np.testing.assert_allclose(imported.ends, ends, atol=5e-4)
+    # SRT estricto: sin cabecera de estilo
+    assert imported.style is None
+
+
+def test_vtt_round_trip(exported, expected):
+    starts, ends, lines = expected
+    imported = read_subtitles(exported["vtt"])
+    assert imported.errors == []
+    # "-->" se escapa en el texto de WebVTT
+    assert imported.texts == [line.replace("-->", "--&gt;") for line in lines]
+    np.testing.assert_allclose(imported.starts, starts, atol=5e-4)
+    np.testing.assert_allclose(imported.ends, ends, atol=5e-4)
+    assert imported.style == STYLE
+
+
+def test_ass_round_trip(exported, expected):
+    starts, ends, lines = expected
+    content = read(exported["ass"])
+    events = re.findall(r"^Dialogue: 0,(\d+):(\d\d):(\d\d)\.(\d\d),(\d+):(\d\d):(\d\d)\.(\d\d),Default,,0,0,0,,(.*)$",
+                        content, re.M)
+    times = np.array([[int(h) * 3600 + int(m) * 60 + int(s) + int(cs) / 100
+                       for h, m, s, cs in (fields[0:4], fields[4:8])] for fields in events])
+    np.testing.assert_allclose(times[:, 0], starts, atol=5e-3)
+    np.testing.assert_allclose(times[:, 1], ends, atol=5e-3)
+    assert [fields[8].replace("\\N", "\n") for fields in events] == lines
+    assert "Style: Default,DejaVu Sans,18,&H0000CCFF," in content
+
+
+def test_lrc_round_trip(exported, expected):
+    starts, ends, lines = expected
+    stamps = re.findall(r"^\[(\d+):(\d\d)\.(\d\d)\](.*)$", read(exported["lrc"]), re.M)
+    parsed = [(int(m) * 60 + int(s) + int(cs) / 100, text) for m, s, cs, text in stamps]
+    timed = [(time, text) for time, text in parsed if text]
+    np.testing.assert_allclose([time for time, _ in timed], starts, atol=5e-3)
+    assert [text for _, text in timed] == [line.replace("\n", " ") for line in lines]
+    # Una marca vacía tras cada subtítulo seguido de silencio, y tras el último
+    cleared = [time for time, text in parsed if not text]
+    np.testing.assert_allclose(cleared, ends[1:], atol=5e-3)
+
+
+def test_long_files_keep_order_across_batches(tmp_path):
+    count = 10000
+    starts = np.round(np.arange(count) * 0.5 + 0.25, 3)
+    texts = [f"Línea {i}" for i in range(count)]
+    path, = export_subtitles(str(tmp_path / "largo.srt"), ["srt"], texts, starts, None, count)
+    imported = read_subtitles(path)
+    assert imported.texts == texts
+    np.testing.assert_allclose(imported.starts, starts, atol=5e-4)
+    np.testing.assert_allclose(imported.ends[:-1], starts[1:] - 0.001, atol=5e-4)
+
+
+def test_import_reports_malformed_blocks(tmp_path):
+    path = tmp_path / "roto.srt"
+    path.write_text("1\n00:00:01,000 --> 00:00:02,000\nBien\n\n"
+                    "2\n00:00:03,000 -> 00:00:04,000\nSin flecha\n\n"
+                    "3\n00:00:05,000 --> 00:00:04,000\nAl revés\n\n"
+                    "4\n00:00:06,000 --> 00:00:07,000\nPegado\n5\n00:00:08,000 --> 00:00:09,000\nOtro\n\n"
+                    "6\n00:00:10,000 --> 00:00:11,500\nTambién bien\n", encoding="utf-8")
+    imported = read_subtitles(str(path))
+    assert imported.texts == ["Bien", "También bien"]
+    np.testing.assert_allclose(imported.starts, [1.0, 10.0])
+    np.testing.assert_allclose(imported.ends, [2.0, 11.5])
+    assert [line for line, _ in imported.errors] == [5, 10, 17]
+
+
+def test_import_vtt_short_times_and_crlf(tmp_path):
+    path = tmp_path / "corto.vtt"
+    path.write_bytes("WEBVTT\r\n\r\nNOTE comentario\r\n\r\n"
+                     "01:02.500 --> 01:04.000 align:start\r\nHola\r\n\r\n"
+                     "intro\r\n1:01:02.000 --> 1:01:03.250\r\nAdiós\r\n".encode("utf-8"))
+    imported = read_subtitles(str(path))
+    assert imported.errors == []
+    assert imported.texts == ["Hola", "Adiós"]
+    np.testing.assert_allclose(imported.starts, [62.5, 3662.0])
+    np.testing.assert_allclose(imported.ends, [64.0, 3663.25])
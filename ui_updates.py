@@ -0,0 +1,99 @@
+"""Planificador que agrupa las actualizaciones de la interfaz ligadas a la reproducción."""
+import time
+
+from PyQt6.QtCore import QObject, QTimer
+
+from profiling import profiler
+
+# Intervalo entre pasadas mientras se reproduce (ms)
+FRAME_INTERVAL = 50
+
+_MISSING = object()
+
+
+class UpdateScheduler(QObject):
+    """Reúne slider, etiqueta de tiempo y vista previa en una sola pasada por fotograma.
+
+    Mientras se reproduce hay una pasada cada interval ms; en pausa el
+    temporizador se detiene y solo request() programa una pasada, una sola
+    aunque se pida varias veces antes de que llegue. Las pasadas no se
+    anidan: lo que se pida durante una pasada queda para la siguiente.
+    write() solo llama al setter de un widget si el valor mostrado cambia.
+
+    stats acumula pasadas, peticiones agrupadas, escrituras hechas y
+    evitadas y el tiempo de CPU de las pasadas, para medir el coste por tick.
+    """
+
+    def __init__(self, callback, interval=FRAME_INTERVAL, parent=None):
+        super().__init__(parent)
+        self._callback = callback
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._run)
+        self._pending = False
+        self._running = False
+        self._shown = {}
+        self.reset_stats()
+
+    @property
+    def playing(self):
+        return self._timer.isActive()
+
+    def reset_stats(self):
+        self.stats = {"passes": 0, "coalesced": 0, "reentrant": 0,
+                      "writes": 0, "skipped": 0, "cpu": 0.0, "max_cpu": 0.0}
+
+    def set_playing(self, playing):
+        """Pasadas periódicas durante la reproducción; en pausa, una última y nada más."""
+        if playing:
+            self._timer.start()
+        else:
+            self._timer.stop()
+            self.request()
+
+    def request(self):
+        """Pide una pasada lo antes posible; las peticiones repetidas se agrupan."""
+        if self._pending or self._timer.isActive():
+            self.stats["coalesced"] += 1
+            return
+        self._pending = True
+        QTimer.singleShot(0, self._run)
+
+    def _run(self):
+        self._pending = False
+        if self._running:
+            # Un processEvents dentro de la pasada no debe empezar otra
+            self.stats["reentrant"] += 1
+            self.request()
+            return
+        self._running = True
+        start = time.thread_time()
+        try:
+            with profiler.span("ui.pass"):
+                self._callback()
+        finally:
+            self._running = False
+            cost = time.thread_time() - start
+            self.stats["passes"] += 1
+            self.stats["cpu"] += cost
+            self.stats["max_cpu"] = max(self.stats["max_cpu"], cost)
+
+    def write(self, key, value, setter):
+        """Llama a setter(value) solo si value no es lo que ya muestra el widget key."""
+        if self._shown.get(key, _MISSING) == value:
+            self.stats["skipped"] += 1
+            return
+        self._shown[key] = value
+        setter(value)
+        self.stats["writes"] += 1
+
+    def forget(self, key):
+        """Olvida el último valor escrito, p. ej. si el widget cambió por otra vía."""
+        self._shown.pop(key, None)
+
+    def summary(self):
+        passes = max(1, self.stats["passes"])
+        return (f"{self.stats['passes']} pasadas, {self.stats['cpu'] / passes * 1e6:.0f} µs de CPU "
+                f"por pasada (máx. {self.stats['max_cpu'] * 1e6:.0f} µs), "
+                f"{self.stats['writes']} escrituras, {self.stats['skipped']} evitadas, "
+                f"{self.stats['coalesced']} peticiones agrupadas")
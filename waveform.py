@@ -0,0 +1,165 @@
+"""Vista general de la forma de onda con marcas de subtítulos, zoom y búsqueda por clic."""
+import numpy as np
+from PyQt6.QtCore import QLineF, QRect, QRectF, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter, QPen, QPixmap
+from PyQt6.QtWidgets import QWidget
+
+# Duración mínima visible al hacer zoom (segundos)
+MIN_VIEW_SPAN = 0.5
+
+
+class WaveformView(QWidget):
+    """Dibuja la envolvente a partir de una PeakPyramid.
+
+    El fondo (envolvente, segmentos y marcas) se pinta en un QPixmap que solo
+    se regenera al cambiar el tamaño, el zoom o los datos; mover el cursor de
+    reproducción solo repinta las dos franjas de un par de píxeles afectadas.
+    """
+
+    seekRequested = pyqtSignal(float)  # segundos
+
+    BACKGROUND = QColor("#000000")
+    ENVELOPE = QColor("#4a90e2")
+    SEGMENT = QColor("#1c2b3f")
+    MARKER = QColor("#f5a623")
+    PLAYHEAD = QColor("#e24a4a")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(60)
+        self.pyramid = None
+        self.duration = 0.0
+        self.view_start = 0.0
+        self.view_span = 0.0
+        self.position = 0.0
+        self.cue_starts = np.empty(0)
+        self.segments = []
+        self._background = None
+        self._playhead_x = None
+
+    # Datos
+
+    def set_peaks(self, pyramid, duration):
+        self.pyramid = pyramid
+        self.duration = duration
+        self.view_start = 0.0
+        self.view_span = duration
+        self.invalidate()
+
+    def set_duration(self, duration):
+        self.duration = duration
+        if not self.view_span:
+            self.view_span = duration
+        self.invalidate()
+
+    def set_cues(self, starts):
+        self.cue_starts = np.asarray(starts, dtype=np.float64)
+        self.invalidate()
+
+    def set_segments(self, segments):
+        self.segments = segments or []
+        self.invalidate()
+
+    def clear(self):
+        self.pyramid = None
+        self.segments = []
+        self.set_duration(0.0)
+        self.view_span = 0.0
+
+    def invalidate(self):
+        self._background = None
+        self.update()
+
+    # Conversión entre tiempo y píxeles
+
+    def time_to_x(self, seconds):
+        if self.view_span <= 0:
+            return 0
+        return int((seconds - self.view_start) / self.view_span * self.width())
+
+    def x_to_time(self, x):
+        return self.view_start + x / max(1, self.width()) * self.view_span
+
+    # Cursor de reproducción
+
+    def set_position(self, seconds):
+        """Mueve el cursor; si sale de la zona visible con zoom, desplaza la vista."""
+        self.position = seconds
+        if self.view_span and self.view_span < self.duration and not (
+                self.view_start <= seconds < self.view_start + self.view_span):
+            self.view_start = min(max(0.0, seconds - self.view_span * 0.1),
+                                  self.duration - self.view_span)
+            self.invalidate()
+            return
+        x = self.time_to_x(seconds)
+        if x == self._playhead_x:
+            return
+        if self._playhead_x is not None:
+            self.update(QRect(self._playhead_x - 1, 0, 3, self.height()))
+        self.update(QRect(x - 1, 0, 3, self.height()))
+        self._playhead_x = x
+
+    # Pintado
+
+    def _render_background(self):
+        width, height = self.width(), self.height()
+        pixmap = QPixmap(max(1, width), max(1, height))
+        pixmap.fill(self.BACKGROUND)
+        if self.view_span <= 0:
+            return pixmap
+        painter = QPainter(pixmap)
+        end = self.view_start + self.view_span
+        for seg_start, seg_end in self.segments:
+            if seg_end >= self.view_start and seg_start <= end:
+                x0, x1 = self.time_to_x(seg_start), self.time_to_x(seg_end)
+                painter.fillRect(QRectF(x0, 0, max(1, x1 - x0), height), self.SEGMENT)
+        if self.pyramid is not None:
+            col_min, col_max = self.pyramid.columns(self.view_start, end, width)
+            mid = height / 2
+            top = mid - np.clip(col_max, -1, 1) * mid
+            bottom = mid - np.clip(col_min, -1, 1) * mid
+            painter.setPen(QPen(self.ENVELOPE, 1))
+            painter.drawLines([QLineF(x, t, x, b) for x, (t, b) in enumerate(zip(top.tolist(), bottom.tolist()))])
+        if len(self.cue_starts):
+            visible = self.cue_starts[(self.cue_starts >= self.view_start) & (self.cue_starts <= end)]
+            xs = ((visible - self.view_start) / self.view_span * width).astype(int)
+            painter.setPen(QPen(self.MARKER, 1))
+            painter.drawLines([QLineF(x, 0, x, height) for x in np.unique(xs).tolist()])
+        painter.end()
+        return pixmap
+
+    def paintEvent(self, event):
+        if self._background is None or self._background.size() != self.size():
+            self._background = self._render_background()
+        painter = QPainter(self)
+        rect = event.rect()
+        painter.drawPixmap(rect, self._background, rect)
+        if self.view_span > 0:
+            x = self.time_to_x(self.position)
+            self._playhead_x = x
+            if rect.left() - 1 <= x <= rect.right() + 1:
+                painter.setPen(QPen(self.PLAYHEAD, 1))
+                painter.drawLine(x, 0, x, self.height())
+        painter.end()
+
+    def resizeEvent(self, event):
+        self._background = None
+        super().resizeEvent(event)
+
+    # Interacción
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton and self.view_span > 0:
+            self.seekRequested.emit(max(0.0, min(self.duration, self.x_to_time(event.position().x()))))
+
+    def wheelEvent(self, event):
+        """La rueda hace zoom alrededor del puntero."""
+        if self.duration <= 0:
+            return
+        anchor = self.x_to_time(event.position().x())
+        factor = 0.8 if event.angleDelta().y() > 0 else 1.25
+        span = min(self.duration, max(MIN_VIEW_SPAN, self.view_span * factor))
+        ratio = (anchor - self.view_start) / self.view_span if self.view_span else 0
+        self.view_start = min(max(0.0, anchor - ratio * span), self.duration - span)
+        self.view_span = span
+        self.invalidate()
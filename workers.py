@@ -0,0 +1,107 @@
+"""Tareas en segundo plano para que el bucle de eventos de Qt nunca se bloquee."""
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from alignment import suggest_times
+from audio_analysis import audio_duration, energy_envelope
+from peaks import PeakBuilder, load_peak_pyramid
+from profiling import traced
+
+
+class Cancelled(Exception):
+    """La tarea se canceló antes de terminar."""
+
+
+class TaskSignals(QObject):
+    progress = pyqtSignal(str, float)  # etapa, fracción completada (0-1)
+    result = pyqtSignal(str, object)   # etapa, resultado parcial
+    failed = pyqtSignal(str)
+    finished = pyqtSignal()
+
+
+class Task(QRunnable):
+    """Ejecuta fn(task, *args) en el QThreadPool global.
+
+    La función informa de su avance con report() y progress(), que lanzan
+    Cancelled en cuanto se llama a cancel(); así una tarea obsoleta deja de
+    trabajar en el siguiente punto de control y nunca entrega resultados.
+    """
+
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = TaskSignals()
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise Cancelled()
+
+    def progress(self, stage, fraction):
+        self.check()
+        self.signals.progress.emit(stage, fraction)
+
+    def report(self, stage, value):
+        self.check()
+        self.signals.result.emit(stage, value)
+
+    def start(self):
+        QThreadPool.globalInstance().start(self)
+        return self
+
+    def run(self):
+        try:
+            self.fn(self, *self.args)
+        except Cancelled:
+            pass
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.failed.emit(str(e))
+        finally:
+            self.signals.finished.emit()
+
+
+@traced("load")
+def load_media_job(task, file_path, workers=1):
+    """Prepara un archivo de audio: duración, envolvente de energía y picos.
+
+    Etapas entregadas con report(): "duration", "warning", "envelope",
+    "onsets" y "peaks". Los segmentos se obtienen de la envolvente con
+    EnergyEnvelope.segments, así que cambiar el umbral no lanza otra tarea;
+    los ataques (para ajustar las marcas) también salen de ella. Si la
+    envolvente se calcula leyendo el archivo por bloques, los picos se
+    construyen con esos mismos bloques. workers se pasa a energy_envelope.
+    """
+    task.report("duration", audio_duration(file_path))
+    task.progress("silences", 0.0)
+    builder = PeakBuilder()
+    try:
+        envelope = energy_envelope(
+            file_path, workers=workers, tap=builder.add,
+            progress=lambda fraction: task.progress("silences", fraction))
+    except Cancelled:
+        raise
+    except Exception as e:
+        builder = None
+        task.report("warning", f"No se pudo analizar silencios: {str(e)}")
+    else:
+        task.report("envelope", envelope)
+        task.report("onsets", envelope.onsets())
+
+    task.progress("peaks", 0.0)
+    task.report("peaks", load_peak_pyramid(
+        file_path, builder=builder, progress=lambda fraction: task.progress("peaks", fraction)))
+
+
+def align_job(task, segments, lines, total_duration):
+    """Calcula los inicios sugeridos (ver alignment.suggest_times) y los entrega como "times"."""
+    task.report("times", suggest_times(segments, lines, total_duration))